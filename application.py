@@ -3,12 +3,14 @@ Main Application Entry Point
 Refactored MoYun Reading Platform Application
 """
 import os
+import click
 from flask import Flask
 
 # Import refactored core modules
 from core import (
     config_manager,
     FileSystemManager, 
+    AssetType,
     EmailService,
     ExternalAPIService
 )
@@ -29,7 +31,8 @@ from core.handlers import (
     register_group_routes,
     register_search_routes,
     register_message_routes,
-    configure_security_middleware
+    configure_security_middleware,
+    configure_asset_caching
 )
 
 
@@ -44,6 +47,7 @@ class MoYunApplication:
         self._initialize_services()
         self._register_routes()
         self._configure_security()
+        self._register_cli_commands()
     
     def _create_flask_app(self) -> Flask:
         """Create and configure Flask application"""
@@ -137,8 +141,31 @@ class MoYunApplication:
         )
     
     def _configure_security(self) -> None:
-        """Configure security middleware"""
+        """Configure security middleware and asset cache headers"""
         configure_security_middleware(self.app)
+        configure_asset_caching(self.app, self.file_manager)
+    
+    def _register_cli_commands(self) -> None:
+        """Register maintenance commands on the Flask CLI"""
+        
+        @self.app.cli.command("migrate-asset-layout")
+        @click.option("--asset-type", type=click.Choice([asset_type.value for asset_type in AssetType]),
+                      default=None, help="Only migrate this asset directory")
+        @click.option("--dry-run", is_flag=True, help="Only count the files to migrate")
+        def migrate_asset_layout_command(asset_type, dry_run) -> None:
+            """Move flat asset files into hashed shard directories"""
+            migrated = self.file_manager.migrate_to_sharded_layout(
+                AssetType(asset_type) if asset_type else None, dry_run
+            )
+            click.echo(f"{'Would migrate' if dry_run else 'Migrated'} {migrated} file(s)")
+        
+        @self.app.cli.command("backfill-asset-variants")
+        @click.option("--asset-type", type=click.Choice([asset_type.value for asset_type in AssetType]),
+                      default=None, help="Only backfill this asset directory")
+        def backfill_asset_variants_command(asset_type) -> None:
+            """Generate missing thumbnails and WebP/AVIF variants of existing assets"""
+            generated = self.file_manager.backfill_variants(AssetType(asset_type) if asset_type else None)
+            click.echo(f"Generated variants of {generated} asset(s)")
     
     def run(self, debug: bool = True, host: str = "0.0.0.0") -> None:
         """Run the application"""
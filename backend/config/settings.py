@@ -96,10 +96,22 @@ class ConfigManager:
         """获取数据库配置"""
         return self.get_config('Database')
     
+    def get_database_pool_config(self) -> Dict[str, Any]:
+        """获取数据库连接池配置（可选配置节，未配置时返回空字典）"""
+        return self._config_data.get('DatabasePool') or {}
+    
     def get_redis_config(self) -> Dict[str, Any]:
         """获取Redis配置"""
         return self.get_config('Redis')
     
+    def get_cache_config(self) -> Dict[str, Any]:
+        """获取缓存配置（可选配置节，未配置时返回空字典）"""
+        return self._config_data.get('Cache') or {}
+    
+    def get_search_config(self) -> Dict[str, Any]:
+        """获取搜索配置（可选配置节，未配置时返回空字典）"""
+        return self._config_data.get('Search') or {}
+    
     def get_flask_config(self) -> Dict[str, Any]:
         """获取Flask配置"""
         return self.get_config('Flask')
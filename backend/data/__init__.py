@@ -6,10 +6,14 @@ Contains all data layer components including models, database management, and ca
 from .models import database, User, Book, Journal, JournalComment, JournalLike, Group, GroupDiscussion, GroupDiscussionReply, GroupUser, Chat, Error
 from .database_manager import DatabaseManager
 from .cache_manager import RedisCacheManager
+from .entity_cache import EntityCache
+from .search_index import SearchIndex
+from .search_service import SearchService
+from .typeahead import TypeaheadIndex
 from .utilities import (
     UserData, BookData, JournalData, JournalCommentData, JournalLikeData,
     GroupData, GroupDiscussionData, GroupDiscussionReplyData, GroupUserData, 
-    ChatData, ErrorData, UnreadMessagesData,
+    ChatData, ErrorData, UnreadMessagesData, PageData,
     extract_user_data, extract_book_data, extract_journal_data,
     extract_journal_comment_data, extract_journal_like_data,
     extract_group_data, extract_group_discussion_data,
@@ -22,6 +26,10 @@ __all__ = [
     'database',
     'DatabaseManager',
     'RedisCacheManager',
+    'EntityCache',
+    'SearchIndex',
+    'SearchService',
+    'TypeaheadIndex',
     
     # Models
     'User',
@@ -49,6 +57,7 @@ __all__ = [
     'ChatData',
     'ErrorData',
     'UnreadMessagesData',
+    'PageData',
     
     # Utility functions
     'extract_user_data',
@@ -2,7 +2,15 @@
 Cache Manager Module
 Modern Redis cache management with improved error handling and type safety
 """
-from typing import Union, List, Optional, Dict, Any
+import json
+import math
+import os
+import random
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Union, List, Optional, Dict, Any, Tuple, Callable, Set
 import redis
 
 from core.config.settings import config_manager
@@ -13,13 +21,172 @@ class CacheError(Exception):
     pass
 
 
+class LocalLRUCache:
+    """
+    Bounded in-process LRU cache with per-entry TTL
+    
+    Used as an L1 tier in front of Redis so hot keys are served from memory.
+    """
+    
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 30):
+        """
+        Initialize local cache
+        
+        Args:
+            max_entries: Maximum number of entries; the least recently used entry is evicted beyond it
+            ttl_seconds: Upper bound on how long an entry is served, regardless of its Redis TTL
+        """
+        self._max_entries = max(1, int(max_entries))
+        self._ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: str) -> Optional[str]:
+        """Get a value, None if missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+    
+    def set(self, key: str, value: str, expire_seconds: Optional[int] = None) -> None:
+        """Store a value, evicting least recently used entries when full"""
+        ttl = min(self._ttl_seconds, expire_seconds) if expire_seconds else self._ttl_seconds
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+    
+    def delete(self, key: str) -> None:
+        """Drop a value"""
+        with self._lock:
+            self._entries.pop(key, None)
+    
+    def clear(self) -> None:
+        """Drop all values"""
+        with self._lock:
+            self._entries.clear()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker guarding calls to an unreliable dependency
+    
+    After ``failure_threshold`` consecutive failures the circuit opens and calls are skipped for
+    ``cool_down_seconds``. The first call after the cool-down is let through as a trial: success
+    closes the circuit again, failure re-opens it for another cool-down.
+    """
+    
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+    
+    def __init__(self, failure_threshold: int = 3, cool_down_seconds: float = 30):
+        """
+        Initialize circuit breaker
+        
+        Args:
+            failure_threshold: Consecutive failures that open the circuit
+            cool_down_seconds: Seconds calls are skipped once the circuit is open
+        """
+        self._failure_threshold = max(1, int(failure_threshold))
+        self._cool_down_seconds = cool_down_seconds
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+    
+    @property
+    def state(self) -> str:
+        """Current state: closed, open or half_open"""
+        return self._state
+    
+    def allow_request(self) -> bool:
+        """Whether a call should be attempted now"""
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self._cool_down_seconds:
+                # Let a single trial call through
+                self._state = self.HALF_OPEN
+                return True
+            return False
+    
+    def record_success(self) -> bool:
+        """
+        Record a successful call
+        
+        Returns:
+            True if this closed a previously open circuit
+        """
+        with self._lock:
+            recovered = self._state != self.CLOSED
+            self._state = self.CLOSED
+            self._failures = 0
+            return recovered
+    
+    def record_failure(self) -> bool:
+        """
+        Record a failed call
+        
+        Returns:
+            True if this opened the circuit
+        """
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or (
+                    self._state == self.CLOSED and self._failures >= self._failure_threshold):
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+                return True
+            return False
+    
+    def trip(self) -> None:
+        """Open the circuit immediately"""
+        with self._lock:
+            self._state = self.OPEN
+            self._opened_at = time.monotonic()
+
+
 class RedisCacheManager:
-    """Modern Redis cache manager with improved error handling and type safety"""
+    """
+    Modern Redis cache manager with improved error handling and type safety
+    
+    Redis calls go through a circuit breaker. While Redis is unreachable the manager serves
+    reads and writes from a bounded in-process fallback store instead of failing or blocking,
+    and the application keeps running without Redis.
+    """
+    
+    INVALIDATION_CHANNEL = "MoYun:cache:invalidate"  # Pub/sub channel keeping local caches coherent
+    LISTENER_RETRY_SECONDS = 5  # Wait before retrying a listener that failed to subscribe
+    MAX_PENDING_DELETES = 10000  # Failed deletes remembered for replay once Redis is reachable again
+    LOCK_PREFIX = "MoYun:lock:"  # Prefix of recomputation lock keys
+    
+    # Releases a lock only if it is still held by the caller's token
+    _RELEASE_LOCK_SCRIPT = """
+    if redis.call('get', KEYS[1]) == ARGV[1] then
+        return redis.call('del', KEYS[1])
+    end
+    return 0
+    """
     
     def __init__(self):
         """Initialize Redis connection with configuration"""
         try:
             redis_config = config_manager.get_redis_config()
+            cache_config = config_manager.get_cache_config()
+            local_config = cache_config.get("LocalCache") or {}
+            breaker_config = cache_config.get("CircuitBreaker") or {}
+            socket_timeout = redis_config.get('socket_timeout', 0.5)
             
             self._redis_client = redis.StrictRedis(
                 host=redis_config['host'],
@@ -27,50 +194,540 @@ class RedisCacheManager:
                 db=redis_config['database'],
                 password=redis_config.get('password'),
                 decode_responses=False,
-                socket_timeout=5,
-                socket_connect_timeout=5,
-                retry_on_timeout=True
+                socket_timeout=socket_timeout,
+                socket_connect_timeout=socket_timeout,
+                # Retrying would double the wait on a dead server; the circuit breaker handles it
+                retry_on_timeout=False
             )
             
-            # Test connection
-            self._redis_client.ping()
+            # Degradation when Redis is unavailable
+            self._breaker = CircuitBreaker(
+                failure_threshold=breaker_config.get("FailureThreshold", 3),
+                cool_down_seconds=breaker_config.get("CoolDown", 30)
+            )
+            self._fallback_cache = LocalLRUCache(
+                max_entries=breaker_config.get("FallbackMaxEntries", 4096),
+                ttl_seconds=breaker_config.get("FallbackTTL", 60)
+            )
+            
+            # Keys whose deletion did not reach Redis, deleted on the next successful call
+            self._pending_deletes: Set[str] = set()
+            self._pending_deletes_lock = threading.Lock()
+            
+            # Stampede protection settings
+            self._stale_grace_seconds = cache_config.get("StaleGrace", 60)
+            self._early_expiration_beta = cache_config.get("EarlyExpirationBeta", 1.0)
+            self._inflight: Dict[str, threading.Event] = {}
+            self._inflight_lock = threading.Lock()
+            self._release_lock = self._redis_client.register_script(self._RELEASE_LOCK_SCRIPT)
+            
+            # Optional in-process L1 tier
+            self._local_cache: Optional[LocalLRUCache] = None
+            self._instance_id = uuid.uuid4().hex
+            self._listener_pid: Optional[int] = None
+            self._listener_retry_at = 0.0
+            self._pubsub = None
+            self._subscriptions: Dict[str, Callable[[str], None]] = {}
+            self._listener_lock = threading.Lock()
+            if local_config.get("Enabled", False):
+                self._local_cache = LocalLRUCache(
+                    max_entries=local_config.get("MaxEntries", 1024),
+                    ttl_seconds=local_config.get("TTL", 30)
+                )
             
         except Exception as e:
             raise CacheError(f"Failed to initialize Redis connection: {e}")
+        
+        # Test connection; an unreachable Redis degrades the cache instead of failing startup
+        try:
+            self._redis_client.ping()
+        except Exception as e:
+            print(f"Redis unavailable, serving cache from local fallback: {e}")
+            self._breaker.trip()
     
-    def set_cache(self, key: str, value: str, expire_seconds: Optional[int] = None) -> bool:
-        """Set cache value"""
+    def _call_redis(self, operation: str, func: Callable[[], Any], fallback: Callable[[], Any]) -> Any:
+        """
+        Run a Redis call through the circuit breaker
+        
+        Args:
+            operation: Operation name used in log messages
+            func: Function performing the Redis call
+            fallback: Function serving the call from the local fallback store
+            
+        Returns:
+            Result of func, or of fallback when the circuit is open or the call fails
+        """
+        if not self._breaker.allow_request():
+            return fallback()
+        
         try:
-            self._redis_client.set(key, value)
-            if expire_seconds:
-                self._redis_client.expire(key, expire_seconds)
-            return True
+            result = func()
         except Exception as e:
-            print(f"Redis set error: {e}")
-            return False
+            if self._breaker.record_failure():
+                print(f"Redis {operation} error, bypassing Redis for a cool-down: {e}")
+            return fallback()
+        
+        if self._breaker.record_success():
+            print("Redis connection recovered")
+            # Other workers kept writing to Redis while this one used its fallback store
+            self._fallback_cache.clear()
+            if self._local_cache is not None:
+                self._local_cache.clear()
+            self.ensure_listener()
+        if self._pending_deletes:
+            self._replay_deletes()
+        return result
+    
+    def subscribe(self, channel: str, handler: Callable[[str], None]) -> None:
+        """
+        Receive messages that other processes publish on a channel
+        
+        Args:
+            channel: Pub/sub channel
+            handler: Called with each message, from the listener thread
+            
+        The listener itself starts lazily in each process (see ensure_listener), so subscribing
+        from a pre-fork master also covers the forked workers.
+        """
+        self._subscriptions[channel] = handler
+        if self._pubsub is not None and self._listener_pid == os.getpid():
+            try:
+                self._pubsub.subscribe(**{channel: self._dispatch(handler)})
+            except Exception as e:
+                print(f"Redis subscribe error: {e}")
+    
+    def publish(self, channel: str, message: str) -> bool:
+        """
+        Publish a message to the other processes subscribed to a channel
+        
+        Args:
+            channel: Pub/sub channel
+            message: Message text
+            
+        Returns:
+            True if the message was sent
+        """
+        self.ensure_listener()
+        return bool(self._call_redis(
+            "publish",
+            lambda: self._redis_client.publish(channel, f"{self._instance_id}:{message}") is not None,
+            lambda: False
+        ))
+    
+    def _dispatch(self, handler: Callable[[str], None]) -> Callable[[Dict[str, Any]], None]:
+        """Wrap a message handler so it skips this process' own messages"""
+        def on_message(message: Dict[str, Any]) -> None:
+            data = message.get("data")
+            if isinstance(data, bytes):
+                data = data.decode("utf-8")
+            if not isinstance(data, str):
+                return
+            
+            sender, _, payload = data.partition(":")
+            if sender != self._instance_id:
+                try:
+                    handler(payload)
+                except Exception as e:
+                    print(f"Redis message handler error: {e}")
+        return on_message
+    
+    def ensure_listener(self) -> None:
+        """
+        Subscribe this process to invalidation broadcasts and registered channels
+        
+        Started lazily and per process id, so pre-forking servers such as uWSGI get a
+        listener thread in every worker rather than only in the master. Called on every cache
+        read, on publish, and when the circuit closes again; a listener that stopped on error,
+        or could not start while Redis was down, is thus restarted by the next call. Callers
+        relying on subscriptions without reading the cache (e.g. search) should call it too.
+        """
+        if self._local_cache is None and not self._subscriptions:
+            return
+        if self._listener_pid == os.getpid() or self._breaker.state != CircuitBreaker.CLOSED:
+            return
+        if time.monotonic() < self._listener_retry_at:
+            return
+        
+        with self._listener_lock:
+            if self._listener_pid == os.getpid():
+                return
+            
+            channels = {channel: self._dispatch(handler) for channel, handler in self._subscriptions.items()}
+            if self._local_cache is not None:
+                # Entries copied from the parent process may have missed broadcasts
+                self._local_cache.clear()
+                channels[self.INVALIDATION_CHANNEL] = self._dispatch(self._handle_invalidation)
+            
+            try:
+                pubsub = self._redis_client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(**channels)
+                pubsub.run_in_thread(sleep_time=1, daemon=True,
+                                     exception_handler=self._handle_listener_error)
+                self._pubsub = pubsub
+                self._listener_pid = os.getpid()
+            except Exception as e:
+                print(f"Redis subscribe error: {e}")
+                self._listener_retry_at = time.monotonic() + self.LISTENER_RETRY_SECONDS
+    
+    def _handle_invalidation(self, key: str) -> None:
+        """Drop a key from the local cache when another process changed it"""
+        if self._local_cache is not None:
+            self._local_cache.delete(key)
+    
+    def _handle_listener_error(self, error: Exception, pubsub, worker_thread) -> None:
+        """Stop the listener on error and fall back to an empty local cache until it restarts"""
+        print(f"Redis subscribe error: {error}")
+        worker_thread.stop()
+        pubsub.close()
+        self._pubsub = None
+        self._listener_pid = None
+        if self._local_cache is not None:
+            self._local_cache.clear()
+    
+    def _queue_invalidation(self, pipeline, keys: List[str]) -> None:
+        """Queue broadcasts telling other processes to drop keys from their local caches"""
+        if self._local_cache is None:
+            return
+        for key in keys:
+            pipeline.publish(self.INVALIDATION_CHANNEL, f"{self._instance_id}:{key}")
+    
+    def set_cache(self, key: str, value: str, expire_seconds: Optional[int] = None) -> bool:
+        """Set cache value, atomically with its expiry"""
+        return self.set_many({key: value}, expire_seconds)
+    
+    def set_many(self, mapping: Dict[str, str], expire_seconds: Optional[int] = None) -> bool:
+        """
+        Set several cache values in one round trip
+        
+        Args:
+            mapping: Key to value mapping
+            expire_seconds: Expiry applied to every key, set atomically with the value
+            
+        Returns:
+            True if all values were written
+        """
+        if not mapping:
+            return True
+        
+        def write() -> bool:
+            pipeline = self._redis_client.pipeline(transaction=False)
+            for key, value in mapping.items():
+                pipeline.set(key, value, ex=expire_seconds or None)
+            self._queue_invalidation(pipeline, list(mapping))
+            pipeline.execute()
+            
+            if self._local_cache is not None:
+                for key, value in mapping.items():
+                    self._local_cache.set(key, value, expire_seconds)
+            return True
+        
+        def write_fallback() -> bool:
+            for key, value in mapping.items():
+                self._fallback_cache.set(key, value, expire_seconds)
+            return True
+        
+        return self._call_redis("set", write, write_fallback)
     
     def get_cache(self, key: str) -> Optional[str]:
-        """Get cache value"""
+        """Get cache value, from the local cache first when enabled"""
+        return self.get_many([key])[key]
+    
+    def get_many(self, keys: List[str]) -> Dict[str, Optional[str]]:
+        """
+        Get several cache values in one round trip
+        
+        Args:
+            keys: Cache keys
+            
+        Returns:
+            Key to value mapping, None for missing keys
+        """
+        result: Dict[str, Optional[str]] = {key: None for key in keys}
+        pending = list(result)
+        self.ensure_listener()
+        
+        if self._local_cache is not None:
+            pending = []
+            for key in result:
+                result[key] = self._local_cache.get(key)
+                if result[key] is None:
+                    pending.append(key)
+        
+        if not pending:
+            return result
+        
+        def read() -> List[Optional[str]]:
+            values = [value.decode('utf-8') if value else None for value in self._redis_client.mget(pending)]
+            if self._local_cache is not None:
+                for key, value in zip(pending, values):
+                    if value is not None:
+                        self._local_cache.set(key, value)
+            return values
+        
+        def read_fallback() -> List[Optional[str]]:
+            return [self._fallback_cache.get(key) for key in pending]
+        
+        for key, value in zip(pending, self._call_redis("get", read, read_fallback)):
+            result[key] = value
+        return result
+    
+    def set_json_cache(self, key: str, value: Any, expire_seconds: Optional[int] = None) -> bool:
+        """Serialize value as JSON and cache it"""
         try:
-            result = self._redis_client.get(key)
-            return result.decode('utf-8') if result else None
-        except Exception as e:
-            print(f"Redis get error: {e}")
-            return None
+            payload = json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+        except (TypeError, ValueError) as e:
+            print(f"Redis serialize error: {e}")
+            return False
+        return self.set_cache(key, payload, expire_seconds)
+    
+    def get_json_cache(self, key: str) -> Optional[Any]:
+        """Get a cached JSON value, None on miss or if the value cannot be parsed"""
+        return self.get_json_many([key])[key]
+    
+    def set_json_many(self, mapping: Dict[str, Any], expire_seconds: Optional[int] = None) -> bool:
+        """Serialize values as JSON and cache them in one round trip"""
+        try:
+            payloads = {
+                key: json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+                for key, value in mapping.items()
+            }
+        except (TypeError, ValueError) as e:
+            print(f"Redis serialize error: {e}")
+            return False
+        return self.set_many(payloads, expire_seconds)
+    
+    def get_json_many(self, keys: List[str]) -> Dict[str, Optional[Any]]:
+        """Get several cached JSON values in one round trip, None for misses and unparsable values"""
+        result: Dict[str, Optional[Any]] = {}
+        invalid = []
+        for key, payload in self.get_many(keys).items():
+            result[key] = None
+            if payload is None:
+                continue
+            try:
+                result[key] = json.loads(payload)
+            except ValueError:
+                invalid.append(key)
+        
+        # Drop values written in an older, non-JSON format
+        self.delete_many(invalid)
+        return result
     
     def delete_cache(self, key: str) -> bool:
         """Delete cache value"""
-        try:
-            self._redis_client.delete(key)
+        return self.delete_many([key])
+    
+    def delete_many(self, keys: List[str]) -> bool:
+        """
+        Delete several cache values in one round trip
+        
+        Args:
+            keys: Cache keys
+            
+        Returns:
+            True if the keys were deleted, False if they could not be deleted from Redis yet
+            
+        Keys that could not be deleted (circuit open or call failed) are remembered and deleted
+        on the next successful Redis call, so Redis never keeps serving a value the application
+        already invalidated.
+        """
+        if not keys:
             return True
-        except Exception as e:
-            print(f"Redis delete error: {e}")
+        
+        for key in keys:
+            self._fallback_cache.delete(key)
+            if self._local_cache is not None:
+                self._local_cache.delete(key)
+        
+        def delete() -> bool:
+            pipeline = self._redis_client.pipeline(transaction=False)
+            pipeline.delete(*keys)
+            self._queue_invalidation(pipeline, list(keys))
+            pipeline.execute()
+            return True
+        
+        def delete_later() -> bool:
+            with self._pending_deletes_lock:
+                if len(self._pending_deletes) + len(keys) <= self.MAX_PENDING_DELETES:
+                    self._pending_deletes.update(keys)
+                else:
+                    print(f"Redis delete backlog full, {len(keys)} key(s) stay cached until they expire")
             return False
+        
+        return self._call_redis("delete", delete, delete_later)
+    
+    def _replay_deletes(self) -> None:
+        """Delete the keys whose deletion failed while Redis was unavailable"""
+        with self._pending_deletes_lock:
+            keys, self._pending_deletes = list(self._pending_deletes), set()
+        if keys:
+            print(f"Replaying {len(keys)} Redis delete(s)")
+            # Failing again puts the keys back
+            self.delete_many(keys)
+
+    def increment(self, key: str, amount: int = 1) -> Optional[int]:
+        """
+        Atomically add to a counter shared by every process
+
+        Args:
+            key: Counter key, created at 0 when missing
+            amount: Value to add; 0 reads the counter
+
+        Returns:
+            The new value, or None if Redis is unavailable (counters have no local fallback)
+        """
+        return self._call_redis("increment", lambda: int(self._redis_client.incrby(key, amount)), lambda: None)
+
+    # Computed values with stampede protection
+    #
+    # Computed values are stored as an envelope {"value", "delta", "expires_at"}: "delta" is how long
+    # the last recomputation took and "expires_at" the logical expiry. The Redis key itself lives
+    # StaleGrace seconds longer, so a stale copy can be served while one worker recomputes.
+    
+    def set_computed(self, key: str, value: Any, expire_seconds: int, delta: float = 0.0) -> bool:
+        """
+        Cache a computed value with its logical expiry
+        
+        Args:
+            key: Cache key
+            value: JSON-serializable value
+            expire_seconds: Seconds until the value should be recomputed
+            delta: Seconds the computation took, used for early expiration
+            
+        Returns:
+            True if the value was written
+        """
+        return self.set_computed_many({key: value}, expire_seconds, delta)
+    
+    def set_computed_many(self, mapping: Dict[str, Any], expire_seconds: int, delta: float = 0.0) -> bool:
+        """Cache several computed values in one round trip"""
+        expires_at = time.time() + expire_seconds
+        envelopes = {
+            key: {"value": value, "delta": delta, "expires_at": expires_at}
+            for key, value in mapping.items()
+        }
+        return self.set_json_many(envelopes, expire_seconds + self._stale_grace_seconds)
+    
+    def get_computed_many(self, keys: List[str]) -> Dict[str, Optional[Any]]:
+        """
+        Get several computed values in one round trip
+        
+        Args:
+            keys: Cache keys
+            
+        Returns:
+            Key to value mapping, None for missing or logically expired values
+        """
+        now = time.time()
+        result = {}
+        for key, envelope in self.get_json_many(keys).items():
+            envelope = self._unwrap(envelope)
+            result[key] = envelope["value"] if envelope and envelope["expires_at"] > now else None
+        return result
+    
+    @staticmethod
+    def _unwrap(envelope: Any) -> Optional[Dict[str, Any]]:
+        """Validate a computed-value envelope, None for values in any other format"""
+        if isinstance(envelope, dict) and "value" in envelope and "expires_at" in envelope:
+            return envelope
+        return None
+    
+    def _should_recompute(self, envelope: Dict[str, Any], now: float) -> bool:
+        """
+        Decide whether to recompute a value
+        
+        Expired values are always recomputed. Fresh values are recomputed early with a probability
+        that grows as expiry approaches and with the cost of the computation ("XFetch"), so hot keys
+        are usually refreshed by a single request before they expire.
+        """
+        delta = float(envelope.get("delta") or 0.0)
+        early = -delta * self._early_expiration_beta * math.log(1.0 - random.random())
+        return now + early >= envelope["expires_at"]
+    
+    def get_or_compute(self, key: str, compute: Callable[[], Any], expire_seconds: int,
+                       lock_timeout: int = 10, wait_timeout: float = 2.0) -> Any:
+        """
+        Get a computed value, recomputing it on a single worker when it expires
+        
+        Args:
+            key: Cache key
+            compute: Function producing the value; None results are returned but not cached
+            expire_seconds: Seconds until the value should be recomputed
+            lock_timeout: Seconds after which a recomputation lock is considered abandoned
+            wait_timeout: Seconds to wait for another worker's recomputation when no stale copy exists
+            
+        Returns:
+            The cached, stale or freshly computed value
+        """
+        envelope = self._unwrap(self.get_json_cache(key))
+        if envelope is not None and not self._should_recompute(envelope, time.time()):
+            return envelope["value"]
+        stale = envelope["value"] if envelope is not None else None
+        
+        # Single flight within this process
+        with self._inflight_lock:
+            event = self._inflight.get(key)
+            is_leader = event is None
+            if is_leader:
+                event = self._inflight[key] = threading.Event()
+        
+        if not is_leader:
+            if stale is not None:
+                return stale
+            event.wait(wait_timeout)
+            envelope = self._unwrap(self.get_json_cache(key))
+            return envelope["value"] if envelope is not None else compute()
+        
+        try:
+            return self._compute_with_lock(key, compute, expire_seconds, stale, lock_timeout, wait_timeout)
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+            event.set()
+    
+    def _compute_with_lock(self, key: str, compute: Callable[[], Any], expire_seconds: int,
+                           stale: Any, lock_timeout: int, wait_timeout: float) -> Any:
+        """Recompute a value while holding the cross-process lock of its key"""
+        lock_key = f"{self.LOCK_PREFIX}{key}"
+        token = uuid.uuid4().hex
+        # None means Redis is unavailable: recompute without cross-process coordination
+        acquired = self._call_redis(
+            "lock",
+            lambda: bool(self._redis_client.set(lock_key, token, nx=True, ex=lock_timeout)),
+            lambda: None
+        )
+        
+        if acquired is False:
+            # Another worker is recomputing: serve the stale copy, or wait for the new value
+            if stale is not None:
+                return stale
+            deadline = time.monotonic() + wait_timeout
+            while time.monotonic() < deadline:
+                time.sleep(0.05)
+                envelope = self._unwrap(self.get_json_cache(key))
+                if envelope is not None:
+                    return envelope["value"]
+            return compute()
+        
+        try:
+            started = time.monotonic()
+            value = compute()
+            if value is not None:
+                self.set_computed(key, value, expire_seconds, time.monotonic() - started)
+            return value
+        finally:
+            if acquired:
+                self._call_redis("unlock", lambda: self._release_lock(keys=[lock_key], args=[token]), lambda: None)
     
     def health_check(self) -> bool:
         """Check if Redis connection is healthy"""
-        try:
-            self._redis_client.ping()
-            return True
-        except:
-            return False 
\ No newline at end of file
+        return bool(self._call_redis("ping", self._redis_client.ping, lambda: False))
+    
+    def get_status(self) -> Dict[str, Any]:
+        """Get circuit breaker state, local store sizes and the delete backlog"""
+        return {
+            'circuit': self._breaker.state,
+            'fallback_entries': len(self._fallback_cache),
+            'local_entries': len(self._local_cache) if self._local_cache is not None else 0,
+            'pending_deletes': len(self._pending_deletes)
+        }
@@ -0,0 +1,108 @@
+"""
+Connection Pool Module
+SQLAlchemy engine pool configuration and live pool metrics
+"""
+import threading
+import time
+from typing import Dict, Any
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+
+class PoolMetrics:
+    """Thread-safe counters of connection checkouts and the time spent waiting for them"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._checkouts = 0
+        self._timeouts = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    def record_checkout(self, wait_seconds: float, timed_out: bool = False) -> None:
+        """Record one checkout attempt"""
+        with self._lock:
+            self._checkouts += 1
+            self._total_wait += wait_seconds
+            self._max_wait = max(self._max_wait, wait_seconds)
+            if timed_out:
+                self._timeouts += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Get checkout count, timeouts and wait times in milliseconds"""
+        with self._lock:
+            return {
+                'checkouts': self._checkouts,
+                'timeouts': self._timeouts,
+                'avg_wait_ms': round(self._total_wait / self._checkouts * 1000, 3) if self._checkouts else 0.0,
+                'max_wait_ms': round(self._max_wait * 1000, 3)
+            }
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that measures how long each checkout waits for a connection"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def recreate(self) -> "InstrumentedQueuePool":
+        pool = super().recreate()
+        # Keep counting across pool recreation (e.g. after a disconnect)
+        pool.metrics = self.metrics
+        return pool
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.metrics.record_checkout(time.perf_counter() - started, timed_out=True)
+            raise
+        self.metrics.record_checkout(time.perf_counter() - started)
+        return connection
+
+
+def build_engine_options(pool_config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Build SQLAlchemy engine options from the DatabasePool configuration section
+
+    Args:
+        pool_config: DatabasePool configuration, missing keys fall back to defaults
+
+    Returns:
+        Options for SQLALCHEMY_ENGINE_OPTIONS
+    """
+    return {
+        'poolclass': InstrumentedQueuePool,
+        'pool_size': pool_config.get('PoolSize', 10),
+        'max_overflow': pool_config.get('MaxOverflow', 20),
+        'pool_timeout': pool_config.get('PoolTimeout', 30),
+        # Must stay below MySQL's wait_timeout, or idle connections are closed under us
+        'pool_recycle': pool_config.get('PoolRecycle', 3600),
+        'pool_pre_ping': pool_config.get('PrePing', True)
+    }
+
+
+def get_pool_status(pool) -> Dict[str, Any]:
+    """
+    Get live statistics of an engine pool
+
+    Args:
+        pool: Engine pool
+
+    Returns:
+        Pool size, checked-in/checked-out/overflow connections and checkout wait metrics
+    """
+    status: Dict[str, Any] = {'status': pool.status()}
+    if isinstance(pool, QueuePool):
+        status.update({
+            'size': pool.size(),
+            'checked_in': pool.checkedin(),
+            'checked_out': pool.checkedout(),
+            'overflow': pool.overflow()
+        })
+    if isinstance(pool, InstrumentedQueuePool):
+        status.update(pool.metrics.snapshot())
+    return status
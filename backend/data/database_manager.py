@@ -2,23 +2,51 @@
 Database Manager Module
 Handles all database operations with modern architecture and caching
 """
+import os
 from datetime import datetime
 from typing import Union, List, Optional, Literal, Dict, Any
+import click
 from flask import Flask
-from sqlalchemy import or_
+from sqlalchemy import or_, func, select, tuple_, text, literal, union_all, DateTime
+from sqlalchemy.dialects.mysql import match
 from werkzeug.security import generate_password_hash, check_password_hash
 
 from core.config.settings import config_manager
 from .models import database, User, Book, Journal, JournalComment, JournalLike, Group, GroupDiscussion, GroupDiscussionReply, GroupUser, Chat, Error
 from .cache_manager import RedisCacheManager
+from .entity_cache import EntityCache, cached_lookup, invalidates_entity
+from .connection_pool import build_engine_options, get_pool_status
+from .routing import use_replica, REPLICA_BIND_PREFIX
+from .search_index import SearchIndex
+from .search_service import SearchService
+from .search_cache import SearchCache, cached_search, invalidates_search
+from .typeahead import TypeaheadIndex, PYPINYIN_AVAILABLE
 from .utilities import (
     UserData, BookData, JournalData, JournalCommentData, JournalLikeData,
-    GroupData, GroupDiscussionData, GroupDiscussionReplyData, GroupUserData, ChatData, ErrorData,
+    GroupData, GroupDiscussionData, GroupDiscussionReplyData, GroupUserData, ChatData, ErrorData, PageData,
+    encode_cursor, decode_cursor, parse_datetime_string,
     extract_user_data, extract_book_data, extract_journal_data, extract_journal_comment_data,
     extract_journal_like_data, extract_group_data, extract_group_discussion_data,
     extract_group_discussion_reply_data, extract_group_user_data, extract_chat_data, extract_error_data
 )
 
+# Text fields indexed by the embedded search index, per entity
+SEARCH_FIELDS = {
+    "Book": (Book, ("title", "subtitle", "author")),
+    "Group": (Group, ("name", "description")),
+    "User": (User, ("account",))
+}
+
+# Pub/sub channel telling other processes which record to re-index
+SEARCH_INDEX_CHANNEL = "MoYun:search:update"
+
+# Per-entity change counter, telling a search index snapshot whether it missed any change
+SEARCH_INDEX_VERSION_KEY = "Search_{entity}_index_version"
+
+# Largest id list sent to the database as an IN (...) filter when a search needs every match;
+# a short keyword can match most of a table, and beyond this a LIKE scan is cheaper
+MAX_SEARCH_ID_LIST = 1000
+
 
 class DatabaseError(Exception):
     """Custom exception for database-related errors"""
@@ -44,18 +72,221 @@ class DatabaseManager:
             
             uri = f"{client}://{account}:{password}@{host}:{port}/{database_name}"
             app.config["SQLALCHEMY_DATABASE_URI"] = uri
+            
+            # Optional read replicas, sharing the primary's credentials unless overridden
+            app.config["SQLALCHEMY_BINDS"] = {
+                f"{REPLICA_BIND_PREFIX}{index}": (
+                    f"{client}://{replica.get('Account', account)}:{replica.get('Password', password)}"
+                    f"@{replica['Host']}:{replica.get('Port', port)}/{database_name}"
+                )
+                for index, replica in enumerate(db_config.get("Replicas") or [])
+            }
+            app.config["DATABASE_READ_YOUR_WRITES_WINDOW"] = db_config.get("ReadYourWritesWindow", 5)
             app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+            app.config["SQLALCHEMY_ENGINE_OPTIONS"] = build_engine_options(
+                config_manager.get_database_pool_config()
+            )
             
             database.init_app(app)
+            self._register_cli_commands(app)
             
             # Initialize cache manager
             self.cache = RedisCacheManager()
+            cache_config = config_manager.get_cache_config()
+            self.entity_cache = EntityCache(
+                self.cache,
+                entity_ttl=cache_config.get("EntityTTL"),
+                default_ttl=cache_config.get("DefaultTTL", 600)
+            )
+            self.search_cache = SearchCache(
+                self.cache,
+                search_ttl=cache_config.get("SearchTTL"),
+                default_ttl=cache_config.get("DefaultSearchTTL", 60)
+            )
+            
+            # Initialize embedded search index of books, groups and users
+            self._app = app
+            self.search_index = None
+            search_config = config_manager.get_search_config()
+            if search_config.get("InvertedIndex", True):
+                index_folder = search_config.get("IndexFolder", "/data/index")
+                self.search_index = SearchIndex(
+                    self._load_search_documents,
+                    folder=f"{os.getcwd()}{index_folder}" if index_folder else None,
+                    save_interval=search_config.get("IndexSaveInterval", 60),
+                    version_source=lambda entity: self.cache.increment(SEARCH_INDEX_VERSION_KEY.format(entity=entity), 0)
+                )
+            
+            # Initialize book typeahead index, loaded on first use like the search index
+            self.typeahead = None
+            if search_config.get("Typeahead", True):
+                self.typeahead = TypeaheadIndex()
+                if not PYPINYIN_AVAILABLE:
+                    print("Warning: pypinyin is not installed, book typeahead will not match pinyin initials "
+                          "(pip install pypinyin)")
+            
+            if self.search_index is not None or self.typeahead is not None:
+                self.cache.subscribe(SEARCH_INDEX_CHANNEL, self._handle_search_index_update)
+            
+            self.search_service = SearchService(
+                self, app,
+                max_workers=search_config.get("MaxWorkers", 8),
+                timeout=search_config.get("Timeout", 5),
+                result_limits=search_config.get("ResultLimits"),
+                max_queued=search_config.get("MaxQueued")
+            )
             
         except Exception as e:
             raise DatabaseError(f"Failed to initialize database: {e}")
     
+    def _register_cli_commands(self, app: Flask) -> None:
+        """Register maintenance commands on the Flask CLI"""
+        
+        @app.cli.command("reconcile-journal-counters")
+        @click.option("--journal-id", type=int, default=None, help="Only rebuild counters of this journal")
+        def reconcile_journal_counters_command(journal_id: Optional[int]) -> None:
+            """Rebuild journal like_num/comment_num from the source tables"""
+            updated = self.reconcile_journal_counters(journal_id)
+            click.echo(f"Reconciled counters of {updated} journal(s)")
+        
+        @app.cli.command("rebuild-search-index")
+        @click.option("--entity", type=click.Choice(list(SEARCH_FIELDS)), default=None,
+                      help="Only rebuild the index of this entity")
+        def rebuild_search_index_command(entity: Optional[str]) -> None:
+            """Rebuild the embedded search index from the database"""
+            if self.search_index is None:
+                click.echo("Search index is disabled (Search.InvertedIndex)")
+                return
+            for name in [entity] if entity else SEARCH_FIELDS:
+                click.echo(f"Indexed {self.search_index.rebuild(name)} {name} record(s)")
+    
+    # Search index operations
+    
+    @staticmethod
+    def _load_search_documents(entity: str, after_id: Optional[int] = None):
+        """Load (id, indexed fields) rows of an entity, only those above after_id when given"""
+        model, fields = SEARCH_FIELDS[entity]
+        query = database.session.query(model.id, *[getattr(model, field) for field in fields])
+        if after_id is not None:
+            query = query.filter(model.id > after_id)
+        for row in query.order_by(model.id).yield_per(1000):
+            yield row[0], tuple(row[1:])
+    
+    def _search_ids(self, entity: str, keyword: str, limit: int = 0) -> Optional[List[int]]:
+        """
+        Look up the ids of an entity matching a keyword in the search index
+        
+        Args:
+            entity: Entity name, see SEARCH_FIELDS
+            keyword: Search keyword
+            limit: Number of rows the caller returns in id order, 0 if it needs every match
+                   (or orders them by something else)
+        
+        Returns:
+            The lowest ``limit`` matching ids in ascending order (every match when limit is 0), or
+            None if the index cannot answer, or limit is 0 and more than MAX_SEARCH_ID_LIST ids
+            match, and the caller must use LIKE
+        """
+        if self.search_index is None:
+            return None
+        # Index updates of other processes arrive through the pub/sub listener
+        self.cache.ensure_listener()
+        try:
+            ids = self.search_index.search(entity, keyword)
+        except Exception as e:
+            print(f"Search index error: {e}")
+            return None
+        if ids is None:
+            return None
+        if limit > 0:
+            return ids[:limit]
+        return ids if len(ids) <= MAX_SEARCH_ID_LIST else None
+    
+    @staticmethod
+    def _load_typeahead_rows():
+        """Load the (id, title, author, origin_title) rows of every book for the typeahead index"""
+        rows = database.session.query(Book.id, Book.title, Book.author, Book.origin_title).yield_per(1000)
+        return (tuple(row) for row in rows)
+    
+    def _index_record(self, entity: str, record, version: Optional[int] = None) -> None:
+        """Update the search indexes of this process with a created or updated record"""
+        try:
+            if self.search_index is not None:
+                _, fields = SEARCH_FIELDS[entity]
+                self.search_index.add(entity, record.id, [getattr(record, field) for field in fields], version)
+            if entity == "Book" and self.typeahead is not None:
+                self.typeahead.add(record.id, record.title, record.author, record.origin_title)
+        except Exception as e:
+            print(f"Search index update error: {e}")
+    
+    def _refresh_search_index(self, entity: str, record) -> None:
+        """Index a created or updated record, and tell the other processes to re-index it"""
+        if self.search_index is None and self.typeahead is None:
+            return
+        version = None
+        if self.search_index is not None:
+            version = self.cache.increment(SEARCH_INDEX_VERSION_KEY.format(entity=entity))
+        self._index_record(entity, record, version)
+        self.cache.publish(SEARCH_INDEX_CHANNEL, f"{entity}:{record.id}:{version if version is not None else ''}")
+    
+    def _handle_search_index_update(self, message: str) -> None:
+        """Re-index a record another process created or updated"""
+        entity, _, rest = message.partition(":")
+        entity_id, _, version = rest.partition(":")
+        if entity not in SEARCH_FIELDS or not entity_id.isdigit():
+            return
+        
+        model, _ = SEARCH_FIELDS[entity]
+        with self._app.app_context():
+            record = database.session.get(model, int(entity_id))
+            version = int(version) if version.isdigit() else None
+            if record is not None:
+                self._index_record(entity, record, version)
+            elif self.search_index is not None:
+                self.search_index.remove(entity, int(entity_id), version)
+    
+    @staticmethod
+    def _paginate(query, sort_columns: List, extract, per_page: int, cursor: Optional[str] = None,
+                  descending: bool = False) -> PageData:
+        """
+        Fetch one page of a query using keyset (seek) pagination
+        
+        The page is located with a ``(sort columns) < / > (cursor values)`` condition on an indexed
+        sort key, so every page costs the same regardless of how deep it is.
+        
+        Args:
+            query: Base query, already filtered
+            sort_columns: Sort key columns; must end with a unique column such as the primary key
+            extract: Function converting a model instance into its data dictionary
+            per_page: Number of rows per page
+            cursor: Cursor returned with the previous page, None for the first page
+            descending: Whether to sort from the largest key to the smallest
+            
+        Returns:
+            PageData with the items and the cursor of the next page (None on the last page)
+        """
+        values = decode_cursor(cursor)
+        if values is not None and len(values) == len(sort_columns):
+            values = [
+                parse_datetime_string(value) if isinstance(column.type, DateTime) and isinstance(value, str) else value
+                for column, value in zip(sort_columns, values)
+            ]
+            key = tuple_(*sort_columns)
+            query = query.filter(key < tuple_(*values) if descending else key > tuple_(*values))
+        
+        order = [column.desc() if descending else column.asc() for column in sort_columns]
+        rows = query.order_by(*order).limit(per_page + 1).all()
+        
+        next_cursor = None
+        if len(rows) > per_page:
+            rows = rows[:per_page]
+            next_cursor = encode_cursor([getattr(rows[-1], column.key) for column in sort_columns])
+        
+        return PageData(items=[extract(row) for row in rows], next_cursor=next_cursor)
+    
     # User operations
     
+    @invalidates_search("User")
     def create_user(self, account: str, raw_password: str, email: str, telephone: str, role: str = "student") -> int:
         """
         Create a new user
@@ -85,6 +316,7 @@ class DatabaseManager:
             
             database.session.add(user)
             database.session.commit()
+            self._refresh_search_index("User", user)
             
             return user.id
             
@@ -92,6 +324,9 @@ class DatabaseManager:
             database.session.rollback()
             raise DatabaseError(f"Failed to create user: {e}")
     
+    @cached_lookup("User", unique_keys=("account",), bypass_flags=("include_password",))
+    @cached_search("User")
+    @use_replica
     def get_user(self, limit: int = 1, include_password: bool = False, **filters) -> Union[List[UserData], UserData, None]:
         """
         Get user information
@@ -105,16 +340,15 @@ class DatabaseManager:
             User data or list of user data
         """
         try:
-            # Check cache for single user by ID
-            if "id" in filters and limit == 1:
-                cached_user = self.cache.get_cache(f"User_{filters['id']}")
-                if cached_user:
-                    # Parse cached data and return as UserData
-                    pass  # Simplified for now
-            
             # Build query
             if filters and "keyword" in filters:
-                query = User.query.filter(User.account.like(f"%{filters.get('keyword')}%"))
+                keyword = filters.get('keyword')
+                ids = self._search_ids("User", keyword, max(limit, 0))
+                if ids is not None:
+                    query = User.query.filter(User.id.in_(ids))
+                else:
+                    query = User.query.filter(User.account.like(f"%{keyword}%"))
+                query = query.order_by(User.id)
             else:
                 filter_dict = {k: v for k, v in filters.items() if k != 'keyword'}
                 query = User.query.filter_by(**filter_dict) if filter_dict else User.query
@@ -122,12 +356,7 @@ class DatabaseManager:
             # Execute query
             if limit == 1:
                 user = query.first()
-                if user:
-                    user_data = extract_user_data(user, include_password)
-                    # Cache the result
-                    self.cache.set_cache(f"User_{user_data['id']}", str(user_data), 1200)
-                    return user_data
-                return None
+                return extract_user_data(user, include_password) if user else None
                 
             elif limit > 1:
                 users = query.limit(limit).all()
@@ -140,6 +369,26 @@ class DatabaseManager:
         except Exception as e:
             raise DatabaseError(f"Failed to get user: {e}")
     
+    @use_replica
+    def get_user_page(self, per_page: int = 10, cursor: Optional[str] = None, **filters) -> PageData:
+        """
+        Get a page of users ordered by ID
+        
+        Args:
+            per_page: Number of users per page
+            cursor: Cursor returned with the previous page
+            **filters: User field filters
+            
+        Returns:
+            PageData of UserData
+        """
+        try:
+            query = User.query.filter_by(**filters) if filters else User.query
+            return self._paginate(query, [User.id], extract_user_data, per_page, cursor)
+        except Exception as e:
+            raise DatabaseError(f"Failed to get user page: {e}")
+    
+    @invalidates_search("User")
     def update_user(self, user_id: Optional[int] = None, account: Optional[str] = None, **kwargs) -> bool:
         """
         Update user information
@@ -172,9 +421,10 @@ class DatabaseManager:
                         setattr(user, key, value)
             
             database.session.commit()
+            self._refresh_search_index("User", user)
             
             # Clear cache
-            self.cache.delete_cache(f"User_{user.id}")
+            self.entity_cache.invalidate("User", user.id)
             
             return True
             
@@ -210,6 +460,7 @@ class DatabaseManager:
     
     # Journal operations
     
+    @invalidates_search("Journal")
     def create_journal(self, title: str, content: Union[List, str], publish_time: str, 
                       author_id: int, book_id: int) -> int:
         """
@@ -251,6 +502,9 @@ class DatabaseManager:
             database.session.rollback()
             raise DatabaseError(f"Failed to create journal: {e}")
     
+    @cached_lookup("Journal")
+    @cached_search("Journal")
+    @use_replica
     def get_journal(self, limit: int = 1, **filters) -> Union[List[JournalData], JournalData, None]:
         """
         Get journal information
@@ -265,21 +519,38 @@ class DatabaseManager:
         try:
             # Build query
             if filters and "keyword" in filters:
-                # Get related book for keyword search
+                # Journals of the first book matching the keyword are included as well, looked
+                # up by a subquery rather than a separate round trip. The two conditions are
+                # separate SELECTs joined by UNION ALL: OR-ing them would keep MySQL from using
+                # the FULLTEXT index, while each branch here uses its own index
                 keyword = filters.get('keyword')
-                related_book = self.get_book(keyword=keyword)
-                
-                if related_book:
-                    query = Journal.query.filter(
-                        Journal.title.like(f"%{keyword}%") |
-                        Journal.content.like(f"%{keyword}%") |
-                        (Journal.book_id == related_book['id'])
-                    )
+                text_match, relevance = self._journal_keyword_criteria(keyword)
+                branches = [
+                    select(Journal.id.label("id"), (relevance if relevance is not None else literal(0)).label("score"))
+                    .where(text_match)
+                ]
+                # The search index gives the first matching book directly, bound as a literal;
+                # only the LIKE fallback needs a subquery
+                book_ids = self._search_ids("Book", keyword, 1)
+                if book_ids is None:
+                    related_book_id = select(Book.id).where(
+                        self._book_like_criteria(keyword)
+                    ).order_by(Book.id).limit(1).scalar_subquery()
                 else:
-                    query = Journal.query.filter(
-                        Journal.title.like(f"%{keyword}%") |
-                        Journal.content.like(f"%{keyword}%")
+                    related_book_id = book_ids[0] if book_ids else None
+                if related_book_id is not None:
+                    branches.append(
+                        select(Journal.id.label("id"), literal(0).label("score"))
+                        .where(Journal.book_id == related_book_id)
                     )
+                matches = (union_all(*branches) if len(branches) > 1 else branches[0]).subquery()
+                # A journal found by both branches keeps its text relevance
+                ranked = select(matches.c.id, func.max(matches.c.score).label("score")).group_by(matches.c.id).subquery()
+                query = Journal.query.join(ranked, Journal.id == ranked.c.id)
+                
+                # Most relevant first
+                if relevance is not None:
+                    query = query.order_by(ranked.c.score.desc(), Journal.publish_time.desc())
             else:
                 filter_dict = {k: v for k, v in filters.items() if k != 'keyword'}
                 query = Journal.query.filter_by(**filter_dict) if filter_dict else Journal.query
@@ -287,35 +558,102 @@ class DatabaseManager:
             # Execute query
             if limit == 1:
                 journal = query.first()
-                if journal:
-                    comment_count = self.get_journal_comment_count(journal_id=journal.id)
-                    like_count = self.get_journal_like_count(journal.id)
-                    return extract_journal_data(journal, comment_count, like_count)
-                return None
+                return extract_journal_data(journal) if journal else None
                 
             elif limit > 1:
                 journals = query.limit(limit).all()
-                result = []
-                for journal in journals:
-                    comment_count = self.get_journal_comment_count(journal_id=journal.id)
-                    like_count = self.get_journal_like_count(journal.id)
-                    result.append(extract_journal_data(journal, comment_count, like_count))
-                return result
+                return [extract_journal_data(journal) for journal in journals]
                 
             else:
                 journals = query.all()
-                result = []
-                for journal in journals:
-                    comment_count = JournalComment.query.filter_by(journal_id=journal.id).count()
-                    like_count = JournalLike.query.filter_by(journal_id=journal.id).count()
-                    result.append(extract_journal_data(journal, comment_count, like_count))
-                return result
+                return [extract_journal_data(journal) for journal in journals]
                 
         except Exception as e:
             raise DatabaseError(f"Failed to get journal: {e}")
     
+    @staticmethod
+    def _journal_keyword_criteria(keyword: str):
+        """
+        Build the keyword filter of a journal search
+        
+        Uses the journal_title_content_fulltext FULLTEXT index (ngram parser, so Chinese text is
+        tokenized) when enabled in the Search config, falling back to LIKE scans otherwise and for
+        keywords shorter than the ngram token size.
+        
+        Args:
+            keyword: Search keyword
+            
+        Returns:
+            (filter criterion, relevance score expression or None)
+        """
+        search_config = config_manager.get_search_config()
+        # Quotes would change the meaning of the boolean-mode query
+        phrase = keyword.replace('"', ' ').strip()
+        
+        if search_config.get("JournalFullText", True) and len(phrase) >= search_config.get("NgramTokenSize", 2):
+            # A quoted phrase matches consecutive ngrams, i.e. the keyword as a substring
+            relevance = match(Journal.title, Journal.content, against=f'"{phrase}"').in_boolean_mode()
+            return relevance, relevance
+        
+        return Journal.title.like(f"%{keyword}%") | Journal.content.like(f"%{keyword}%"), None
+    
+    @use_replica
+    def get_journal_page(self, per_page: int = 10, cursor: Optional[str] = None, **filters) -> PageData:
+        """
+        Get a page of journals, newest first, ordered by (publish_time, id)
+        
+        Args:
+            per_page: Number of journals per page
+            cursor: Cursor returned with the previous page
+            **filters: Journal field filters, e.g. author_id or book_id
+            
+        Returns:
+            PageData of JournalData
+        """
+        try:
+            query = Journal.query.filter_by(**filters) if filters else Journal.query
+            return self._paginate(query, [Journal.publish_time, Journal.id], extract_journal_data,
+                                  per_page, cursor, descending=True)
+        except Exception as e:
+            raise DatabaseError(f"Failed to get journal page: {e}")
+    
+    def reconcile_journal_counters(self, journal_id: Optional[int] = None) -> int:
+        """
+        Rebuild the denormalized like_num/comment_num counters from the source tables
+        
+        Args:
+            journal_id: Only reconcile this journal; reconcile all journals if omitted.
+                Cached journals are only invalidated for a single journal, a full
+                reconciliation reaches the cache once the Journal TTL expires
+            
+        Returns:
+            Number of journal rows updated
+        """
+        try:
+            comment_count = select(func.count(JournalComment.id)).where(
+                JournalComment.journal_id == Journal.id
+            ).scalar_subquery()
+            like_count = select(func.count(JournalLike.author_id)).where(
+                JournalLike.journal_id == Journal.id
+            ).scalar_subquery()
+            
+            query = Journal.query.filter_by(id=journal_id) if journal_id else Journal.query
+            updated = query.update(
+                {Journal.comment_num: comment_count, Journal.like_num: like_count},
+                synchronize_session=False
+            )
+            database.session.commit()
+            self.entity_cache.invalidate("Journal", journal_id)
+            
+            return updated
+            
+        except Exception as e:
+            database.session.rollback()
+            raise DatabaseError(f"Failed to reconcile journal counters: {e}")
+    
     # Journal comment operations
     
+    @invalidates_entity("Journal", "journal_id")
     def create_journal_comment(self, journal_id: int, content: Union[str, List], 
                               author_id: int, publish_time: Optional[str] = None) -> int:
         """Create a journal comment"""
@@ -336,6 +674,9 @@ class DatabaseManager:
                 comment.is_read = True
             
             database.session.add(comment)
+            Journal.query.filter_by(id=journal_id).update(
+                {Journal.comment_num: Journal.comment_num + 1}, synchronize_session=False
+            )
             database.session.commit()
             
             return comment.id
@@ -344,6 +685,7 @@ class DatabaseManager:
             database.session.rollback()
             raise DatabaseError(f"Failed to create journal comment: {e}")
     
+    @use_replica
     def get_journal_comments(self, **filters) -> List[JournalCommentData]:
         """Get journal comments"""
         try:
@@ -352,6 +694,7 @@ class DatabaseManager:
         except Exception as e:
             raise DatabaseError(f"Failed to get journal comments: {e}")
     
+    @use_replica
     def get_journal_comment_count(self, **filters) -> int:
         """Get journal comment count"""
         try:
@@ -377,6 +720,7 @@ class DatabaseManager:
     
     # Journal like operations
     
+    @invalidates_entity("Journal", "journal_id")
     def create_journal_like(self, journal_id: int, author_id: int, 
                            publish_time: Optional[Union[str, datetime]] = None) -> bool:
         """Create a journal like"""
@@ -393,6 +737,9 @@ class DatabaseManager:
             
             like = JournalLike(journal_id=journal_id, author_id=author_id, publish_time=publish_time)
             database.session.add(like)
+            Journal.query.filter_by(id=journal_id).update(
+                {Journal.like_num: Journal.like_num + 1}, synchronize_session=False
+            )
             database.session.commit()
             
             return True
@@ -401,6 +748,7 @@ class DatabaseManager:
             database.session.rollback()
             raise DatabaseError(f"Failed to create journal like: {e}")
     
+    @use_replica
     def get_journal_likes(self, journal_id: int) -> List[JournalLikeData]:
         """Get journal likes"""
         try:
@@ -409,6 +757,7 @@ class DatabaseManager:
         except Exception as e:
             raise DatabaseError(f"Failed to get journal likes: {e}")
     
+    @use_replica
     def get_journal_like_count(self, journal_id: int) -> int:
         """Get journal like count"""
         try:
@@ -418,6 +767,7 @@ class DatabaseManager:
     
     # Book operations
     
+    @invalidates_search("Book", "Journal")
     def create_book(self, isbn: str, title: str, origin_title: Optional[str], subtitle: Optional[str],
                    author: str, page: Optional[int], publish_date: Optional[Union[str, datetime]],
                    publisher: Optional[str], description: Optional[str], douban_score: Optional[float],
@@ -446,6 +796,7 @@ class DatabaseManager:
             
             database.session.add(book)
             database.session.commit()
+            self._refresh_search_index("Book", book)
             
             return book.id
             
@@ -453,17 +804,17 @@ class DatabaseManager:
             database.session.rollback()
             raise DatabaseError(f"Failed to create book: {e}")
     
+    @cached_lookup("Book", unique_keys=("isbn",))
+    @cached_search("Book")
+    @use_replica
     def get_book(self, limit: int = 1, **filters) -> Union[List[BookData], BookData, None]:
         """Get book information"""
         try:
             # Build query
             if filters and "keyword" in filters:
-                keyword = filters.get('keyword')
                 query = Book.query.filter(
-                    Book.title.like(f"%{keyword}%") |
-                    Book.subtitle.like(f"%{keyword}%") |
-                    Book.author.like(f"%{keyword}%")
-                )
+                    self._book_keyword_criteria(filters.get('keyword'), max(limit, 0))
+                ).order_by(Book.id)
             else:
                 filter_dict = {k: v for k, v in filters.items() if k != 'keyword'}
                 query = Book.query.filter_by(**filter_dict) if filter_dict else Book.query
@@ -482,6 +833,61 @@ class DatabaseManager:
         except Exception as e:
             raise DatabaseError(f"Failed to get book: {e}")
     
+    def _book_keyword_criteria(self, keyword: str, limit: int = 0):
+        """
+        Build the keyword filter of a book search, from the search index when available
+        
+        Args:
+            keyword: Search keyword
+            limit: Number of books the query returns in id order, 0 for every match
+        """
+        ids = self._search_ids("Book", keyword, limit)
+        if ids is not None:
+            return Book.id.in_(ids)
+        return self._book_like_criteria(keyword)
+    
+    @staticmethod
+    def _book_like_criteria(keyword: str):
+        """Build the LIKE scan filter of a book search"""
+        return (
+            Book.title.like(f"%{keyword}%") |
+            Book.subtitle.like(f"%{keyword}%") |
+            Book.author.like(f"%{keyword}%")
+        )
+    
+    def suggest_books(self, prefix: str, limit: int = 8) -> List[Dict[str, Any]]:
+        """
+        Get as-you-type book suggestions from the in-memory typeahead index
+        
+        Args:
+            prefix: Typed text, matched against the start of titles, original titles, authors,
+                    their words, and the pinyin initials of Chinese text
+            limit: Maximum number of suggestions
+            
+        Returns:
+            List of {id, title, author, origin_title}
+        """
+        if self.typeahead is None:
+            return []
+        # Typeahead updates of other processes arrive through the pub/sub listener
+        self.cache.ensure_listener()
+        try:
+            self.typeahead.ensure_loaded(self._load_typeahead_rows)
+            return self.typeahead.suggest(prefix, limit)
+        except Exception as e:
+            raise DatabaseError(f"Failed to suggest books: {e}")
+    
+    @use_replica
+    def get_book_page(self, per_page: int = 10, cursor: Optional[str] = None, **filters) -> PageData:
+        """Get a page of books ordered by ID"""
+        try:
+            query = Book.query.filter_by(**filters) if filters else Book.query
+            return self._paginate(query, [Book.id], extract_book_data, per_page, cursor)
+        except Exception as e:
+            raise DatabaseError(f"Failed to get book page: {e}")
+    
+    @invalidates_entity("Book", "book_id")
+    @invalidates_search("Book", "Journal")
     def update_book(self, book_id: int, **kwargs) -> bool:
         """Update book information"""
         try:
@@ -496,6 +902,7 @@ class DatabaseManager:
                     setattr(book, key, value)
             
             database.session.commit()
+            self._refresh_search_index("Book", book)
             return True
             
         except Exception as e:
@@ -504,6 +911,7 @@ class DatabaseManager:
     
     # Group operations
     
+    @invalidates_search("Group")
     def create_group(self, name: str, description: str, founder_id: int,
                     establish_time: Optional[Union[datetime, str]] = None) -> Union[int, Literal[False]]:
         """Create a new group"""
@@ -516,6 +924,7 @@ class DatabaseManager:
             group = Group(name=name, description=description, founder_id=founder_id, establish_time=establish_time)
             database.session.add(group)
             database.session.commit()
+            self._refresh_search_index("Group", group)
             
             return group.id
             
@@ -523,16 +932,25 @@ class DatabaseManager:
             database.session.rollback()
             raise DatabaseError(f"Failed to create group: {e}")
     
+    @cached_lookup("Group", unique_keys=("name",))
+    @cached_search("Group")
+    @use_replica
     def get_group(self, limit: int = 1, **filters) -> Union[List[GroupData], GroupData, None]:
         """Get group information"""
         try:
             # Build query
             if filters and "keyword" in filters:
                 keyword = filters.get('keyword')
-                query = Group.query.filter(
-                    Group.name.like(f"%{keyword}%") |
-                    Group.description.like(f"%{keyword}%")
-                )
+                # Ordered by establish time, so the index cannot pick the first ids; a keyword
+                # matching more than MAX_SEARCH_ID_LIST groups uses LIKE instead
+                ids = self._search_ids("Group", keyword)
+                if ids is not None:
+                    query = Group.query.filter(Group.id.in_(ids))
+                else:
+                    query = Group.query.filter(
+                        Group.name.like(f"%{keyword}%") |
+                        Group.description.like(f"%{keyword}%")
+                    )
             else:
                 filter_dict = {k: v for k, v in filters.items() if k != 'keyword'}
                 query = Group.query.filter_by(**filter_dict) if filter_dict else Group.query
@@ -553,6 +971,18 @@ class DatabaseManager:
         except Exception as e:
             raise DatabaseError(f"Failed to get group: {e}")
     
+    @use_replica
+    def get_group_page(self, per_page: int = 10, cursor: Optional[str] = None, **filters) -> PageData:
+        """Get a page of groups, newest first, ordered by (establish_time, id)"""
+        try:
+            query = Group.query.filter_by(**filters) if filters else Group.query
+            return self._paginate(query, [Group.establish_time, Group.id], extract_group_data,
+                                  per_page, cursor, descending=True)
+        except Exception as e:
+            raise DatabaseError(f"Failed to get group page: {e}")
+    
+    @invalidates_entity("Group", "group_id")
+    @invalidates_search("Group")
     def update_group(self, group_id: int, **kwargs) -> bool:
         """Update group information"""
         try:
@@ -567,31 +997,88 @@ class DatabaseManager:
                     setattr(group, key, value)
             
             database.session.commit()
+            self._refresh_search_index("Group", group)
             return True
             
         except Exception as e:
             database.session.rollback()
             raise DatabaseError(f"Failed to update group: {e}")
     
+    # Error operations
+    
+    @cached_lookup("Error", primary_key="error_code")
+    @use_replica
+    def get_error(self, limit: int = 1, **filters) -> Union[List[ErrorData], ErrorData, None]:
+        """Get custom error page information"""
+        try:
+            query = Error.query.filter_by(**filters) if filters else Error.query
+            
+            # Execute query
+            if limit == 1:
+                error = query.first()
+                return extract_error_data(error) if error else None
+            elif limit > 1:
+                errors = query.limit(limit).all()
+                return [extract_error_data(error) for error in errors]
+            else:
+                errors = query.all()
+                return [extract_error_data(error) for error in errors]
+                
+        except Exception as e:
+            raise DatabaseError(f"Failed to get error: {e}")
+    
     # Additional methods would go here for:
     # - Group discussion operations
     # - Group user operations  
     # - Chat operations
-    # - Error operations
     # - Message aggregation operations
     
+    def search(self, keyword: str, limits: Optional[Dict[str, int]] = None) -> Dict[str, Any]:
+        """
+        Search users, books, journals and groups for a keyword concurrently
+        
+        Args:
+            keyword: Search keyword
+            limits: Number of results per entity name ("User", "Book", "Journal", "Group")
+            
+        Returns:
+            Result lists keyed by entity name, see SearchService.search
+        """
+        self.cache.ensure_listener()
+        return self.search_service.search(keyword, limits)
+    
+    def get_cache_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get entity cache hit/miss counters of this process"""
+        return self.entity_cache.get_stats()
+    
+    def get_search_cache_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get search result cache hit/miss counters of this process"""
+        return self.search_cache.get_stats()
+    
+    def get_pool_status(self) -> Dict[str, Dict[str, Any]]:
+        """Get live connection pool statistics of the primary and every replica"""
+        return {
+            bind_key or "primary": get_pool_status(engine.pool)
+            for bind_key, engine in database.engines.items()
+        }
+    
     def get_health_status(self) -> Dict[str, Any]:
         """Get database health status"""
         try:
             # Test database connection
-            database.session.execute('SELECT 1')
+            database.session.execute(text('SELECT 1'))
             
             # Test cache connection
             cache_healthy = self.cache.health_check()
             
             return {
                 'database': 'healthy',
-                'cache': 'healthy' if cache_healthy else 'unhealthy',
+                'pool': self.get_pool_status(),
+                'cache': 'healthy' if cache_healthy else 'degraded',
+                'cache_status': self.cache.get_status(),
+                'cache_stats': self.get_cache_stats(),
+                'search_cache_stats': self.get_search_cache_stats(),
+                'search_index': self.search_index.get_stats() if self.search_index else None,
                 'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             }
             
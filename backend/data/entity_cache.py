@@ -0,0 +1,248 @@
+"""
+Entity Cache Module
+Read-through caching of single-entity lookups on top of RedisCacheManager
+"""
+import inspect
+import threading
+from functools import wraps
+from typing import Optional, Dict, Any, Tuple, Callable, Iterable, List
+
+from .cache_manager import RedisCacheManager
+from .routing import use_primary
+
+
+class EntityCache:
+    """
+    Caches entity data dictionaries by primary key and unique keys
+
+    Records are stored as computed values (see RedisCacheManager.get_or_compute) under
+    ``{Entity}_{primary key}``, so primary-key lookups of hot entities are protected against
+    cache stampedes. Unique-key lookups are stored as aliases ``{Entity}_{field}_{value}`` that
+    only hold the primary key, so invalidating the primary record is enough to drop every
+    cached view of an entity.
+    """
+
+    def __init__(self, cache_manager: RedisCacheManager, entity_ttl: Optional[Dict[str, int]] = None,
+                 default_ttl: int = 600):
+        """
+        Initialize entity cache
+
+        Args:
+            cache_manager: Redis cache manager used for storage
+            entity_ttl: Per-entity TTL in seconds, keyed by entity name
+            default_ttl: TTL for entities without an explicit setting
+        """
+        self._cache = cache_manager
+        self._entity_ttl = dict(entity_ttl or {})
+        self._default_ttl = default_ttl
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self._stats_lock = threading.Lock()
+
+    def get_ttl(self, entity: str) -> int:
+        """Get TTL in seconds for an entity"""
+        return int(self._entity_ttl.get(entity, self._default_ttl))
+
+    @staticmethod
+    def _record_key(entity: str, entity_id: Any) -> str:
+        return f"{entity}_{entity_id}"
+
+    @staticmethod
+    def _alias_key(entity: str, field: str, value: Any) -> str:
+        return f"{entity}_{field}_{value}"
+
+    def _count(self, entity: str, outcome: str) -> None:
+        with self._stats_lock:
+            counters = self._stats.setdefault(entity, {"hits": 0, "misses": 0})
+            counters[outcome] += 1
+
+    def get(self, entity: str, field: str, value: Any, primary_key: str = "id") -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached entity
+
+        Args:
+            entity: Entity name, e.g. "Book"
+            field: Lookup field, either the primary key or a unique key
+            value: Lookup value
+            primary_key: Name of the primary key field
+
+        Returns:
+            Cached data dictionary, or None on a miss
+        """
+        entity_id = value if field == primary_key else self._cache.get_json_cache(self._alias_key(entity, field, value))
+        data = None
+        if entity_id is not None:
+            record_key = self._record_key(entity, entity_id)
+            data = self._cache.get_computed_many([record_key])[record_key]
+            # The unique key may have been changed since the alias was written
+            if data is not None and field != primary_key and str(data.get(field)) != str(value):
+                data = None
+
+        self._count(entity, "hits" if data is not None else "misses")
+        return data
+
+    def set(self, entity: str, data: Dict[str, Any], field: Optional[str] = None, primary_key: str = "id") -> None:
+        """
+        Cache an entity, and an alias for the unique key it was looked up by
+
+        Args:
+            entity: Entity name
+            data: Entity data dictionary
+            field: Unique key the entity was looked up by, if not the primary key
+            primary_key: Name of the primary key field
+        """
+        ttl = self.get_ttl(entity)
+        entity_id = data[primary_key]
+        self._cache.set_computed(self._record_key(entity, entity_id), data, ttl)
+        if field and field != primary_key:
+            self._cache.set_json_cache(self._alias_key(entity, field, data[field]), entity_id, ttl)
+
+    def get_or_load(self, entity: str, entity_id: Any, loader: Callable[[], Any]) -> Any:
+        """
+        Look up an entity by primary key, loading it on a single worker on a miss
+
+        Args:
+            entity: Entity name
+            entity_id: Primary key
+            loader: Function loading the entity data from the database
+
+        Returns:
+            Entity data, or whatever the loader returned if it was not cached
+        """
+        loaded = []
+
+        def load() -> Any:
+            loaded.append(True)
+            return loader()
+
+        data = self._cache.get_or_compute(self._record_key(entity, entity_id), load, self.get_ttl(entity))
+        self._count(entity, "misses" if loaded else "hits")
+        return data
+
+    def get_many(self, entity: str, entity_ids: Iterable[Any]) -> Dict[Any, Dict[str, Any]]:
+        """
+        Look up several cached entities by primary key in one round trip
+
+        Args:
+            entity: Entity name
+            entity_ids: Primary keys
+
+        Returns:
+            Mapping of primary key to cached data; misses are omitted
+        """
+        entity_ids = list(dict.fromkeys(entity_ids))
+        keys = [self._record_key(entity, entity_id) for entity_id in entity_ids]
+        cached = self._cache.get_computed_many(keys)
+
+        result = {}
+        for entity_id, key in zip(entity_ids, keys):
+            if cached[key] is not None:
+                result[entity_id] = cached[key]
+        hits = len(result)
+        with self._stats_lock:
+            counters = self._stats.setdefault(entity, {"hits": 0, "misses": 0})
+            counters["hits"] += hits
+            counters["misses"] += len(entity_ids) - hits
+        return result
+
+    def set_many(self, entity: str, items: List[Dict[str, Any]], primary_key: str = "id") -> None:
+        """Cache several entities by primary key in one round trip"""
+        if items:
+            self._cache.set_computed_many(
+                {self._record_key(entity, data[primary_key]): data for data in items},
+                self.get_ttl(entity)
+            )
+
+    def invalidate(self, entity: str, entity_id: Any) -> None:
+        """Drop the cached record of an entity"""
+        if entity_id is not None:
+            self._cache.delete_cache(self._record_key(entity, entity_id))
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get hit/miss counters of this process
+
+        Returns:
+            Mapping of entity name to hits, misses and hit_ratio
+        """
+        with self._stats_lock:
+            stats = {entity: dict(counters) for entity, counters in self._stats.items()}
+
+        for counters in stats.values():
+            total = counters["hits"] + counters["misses"]
+            counters["hit_ratio"] = round(counters["hits"] / total, 4) if total else 0.0
+        return stats
+
+
+def cached_lookup(entity: str, primary_key: str = "id", unique_keys: Tuple[str, ...] = (),
+                  bypass_flags: Tuple[str, ...] = ()) -> Callable:
+    """
+    Decorator adding read-through caching to a ``get_*(limit=1, **filters)`` getter
+
+    Only single-entity lookups filtered by exactly one of the primary or unique keys are
+    cached; every other call goes straight to the wrapped getter. Cache misses are loaded
+    from the primary, so a lagging replica cannot refill the cache with a stale row.
+
+    Args:
+        entity: Entity name used for cache keys and TTL configuration
+        primary_key: Name of the primary key field
+        unique_keys: Other fields identifying a single entity
+        bypass_flags: Keyword flags that disable caching when truthy, e.g. include_password
+
+    Returns:
+        Decorator
+    """
+    key_fields = (primary_key,) + tuple(unique_keys)
+
+    def decorator(func: Callable) -> Callable:
+        load = use_primary(func)
+
+        @wraps(func)
+        def wrapper(self, *args, **kwargs):
+            limit = args[0] if args else kwargs.get("limit", 1)
+            filters = {k: v for k, v in kwargs.items() if k != "limit" and k not in bypass_flags}
+            cacheable = (
+                limit == 1 and len(args) <= 1 and len(filters) == 1
+                and next(iter(filters)) in key_fields
+                and not any(kwargs.get(flag) for flag in bypass_flags)
+            )
+            if not cacheable:
+                return func(self, *args, **kwargs)
+
+            field, value = next(iter(filters.items()))
+            if field == primary_key:
+                return self.entity_cache.get_or_load(entity, value, lambda: load(self, *args, **kwargs))
+
+            cached = self.entity_cache.get(entity, field, value, primary_key)
+            if cached is not None:
+                return cached
+
+            result = load(self, *args, **kwargs)
+            if result:
+                self.entity_cache.set(entity, result, field, primary_key)
+            return result
+        return wrapper
+    return decorator
+
+
+def invalidates_entity(entity: str, id_argument: str) -> Callable:
+    """
+    Decorator invalidating a cached entity after the wrapped write method returns
+
+    Args:
+        entity: Entity name
+        id_argument: Name of the wrapped method's argument holding the entity's primary key
+
+    Returns:
+        Decorator
+    """
+    def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+
+        @wraps(func)
+        def wrapper(self, *args, **kwargs):
+            result = func(self, *args, **kwargs)
+            bound = signature.bind_partial(self, *args, **kwargs)
+            self.entity_cache.invalidate(entity, bound.arguments.get(id_argument))
+            return result
+        return wrapper
+    return decorator
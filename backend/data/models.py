@@ -8,8 +8,10 @@ from enum import Enum
 
 from flask_sqlalchemy import SQLAlchemy
 
-# Database instance
-database = SQLAlchemy()
+from .routing import RoutingSession
+
+# Database instance; read-only DatabaseManager calls may be routed to replicas
+database = SQLAlchemy(session_options={"class_": RoutingSession})
 
 
 class UserRole(Enum):
@@ -156,6 +158,11 @@ class Book(database.Model, BaseModel):
 class Journal(database.Model, BaseModel):
     """Journal model for book reviews"""
     __tablename__ = 'journal'
+    __table_args__ = (
+        database.Index('journal_publish_time_id_index', 'publish_time', 'id'),
+        database.Index('journal_title_content_fulltext', 'title', 'content',
+                       mysql_prefix='FULLTEXT', mysql_with_parser='ngram'),
+    )
     
     id = database.Column(database.Integer, primary_key=True, autoincrement=True)
     title = database.Column(database.String(128), nullable=False)
@@ -164,6 +171,9 @@ class Journal(database.Model, BaseModel):
     publish_time = database.Column(database.DateTime, nullable=False)
     author_id = database.Column(database.Integer, database.ForeignKey('user.id'), nullable=False)
     book_id = database.Column(database.Integer, database.ForeignKey('book.id'), nullable=False)
+    # Denormalized counters, maintained by DatabaseManager on comment/like creation
+    like_num = database.Column(database.Integer, nullable=False, default=0, server_default='0')
+    comment_num = database.Column(database.Integer, nullable=False, default=0, server_default='0')
     
     # Relationships
     comments = database.relationship('JournalComment', backref='journal', lazy=True, cascade='all, delete-orphan')
@@ -182,6 +192,8 @@ class Journal(database.Model, BaseModel):
             
         self.author_id = author_id
         self.book_id = book_id
+        self.like_num = 0
+        self.comment_num = 0
     
     def __repr__(self):
         return f'<Journal {self.title}>'
@@ -239,6 +251,9 @@ class JournalLike(database.Model, BaseModel):
 class Group(database.Model, BaseModel):
     """Group model for reading groups"""
     __tablename__ = 'group'
+    __table_args__ = (
+        database.Index('group_establish_time_id_index', 'establish_time', 'id'),
+    )
     
     id = database.Column(database.Integer, primary_key=True, autoincrement=True)
     name = database.Column(database.String(32), unique=True, nullable=False)
@@ -0,0 +1,101 @@
+"""
+Read Routing Module
+Routes read-only queries to MySQL replicas and everything else to the primary
+"""
+import random
+import time
+from contextvars import ContextVar
+from functools import wraps
+from typing import Callable
+
+from flask import current_app, has_request_context, session as user_session
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+
+# Bind keys of replica engines in SQLALCHEMY_BINDS start with this prefix
+REPLICA_BIND_PREFIX = "replica_"
+
+# Flask session key holding the time until which this user's reads go to the primary
+PRIMARY_UNTIL_SESSION_KEY = "_db_primary_until"
+
+_use_replica: ContextVar[bool] = ContextVar("use_replica", default=False)
+_use_primary: ContextVar[bool] = ContextVar("use_primary", default=False)
+
+
+def use_replica(func: Callable) -> Callable:
+    """
+    Decorator marking a DatabaseManager method as read-only, so its queries may run on a replica
+
+    Queries still go to the primary while the session has unflushed or uncommitted writes, and
+    during the read-your-writes window after the current user wrote something.
+    """
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        token = _use_replica.set(True)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _use_replica.reset(token)
+    return wrapper
+
+
+def use_primary(func: Callable) -> Callable:
+    """
+    Wrap a function so its queries run on the primary, even inside methods marked use_replica
+
+    Used for loaders filling a shared cache: a lagging replica read right after an invalidation
+    would put the old row back into the cache for its whole TTL.
+    """
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        token = _use_primary.set(True)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _use_primary.reset(token)
+    return wrapper
+
+
+def _in_read_your_writes_window() -> bool:
+    """Whether the current user wrote recently enough that reads must see the primary"""
+    if not has_request_context():
+        return False
+    return user_session.get(PRIMARY_UNTIL_SESSION_KEY, 0) > time.time()
+
+
+class RoutingSession(Session):
+    """Flask-SQLAlchemy session choosing a replica engine for read-only calls"""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if (
+            bind is None and _use_replica.get() and not _use_primary.get()
+            and not self._has_writes() and not _in_read_your_writes_window()
+        ):
+            replicas = [
+                engine for key, engine in self._db.engines.items()
+                if key and key.startswith(REPLICA_BIND_PREFIX)
+            ]
+            if replicas:
+                return random.choice(replicas)
+        return super().get_bind(mapper, clause=clause, bind=bind, **kwargs)
+
+    def _has_writes(self) -> bool:
+        """Whether this session holds writes the replicas cannot have seen yet"""
+        return bool(self._flushing or self.new or self.dirty or self.deleted or self.info.get("has_writes"))
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _record_write(session, flush_context) -> None:
+    """Pin the session, and the current user for a short window, to the primary after a write"""
+    session.info["has_writes"] = True
+    if has_request_context():
+        window = current_app.config.get("DATABASE_READ_YOUR_WRITES_WINDOW", 0)
+        if window:
+            user_session[PRIMARY_UNTIL_SESSION_KEY] = time.time() + window
+
+
+@event.listens_for(RoutingSession, "after_commit")
+@event.listens_for(RoutingSession, "after_rollback")
+def _clear_writes(session) -> None:
+    """Writes are either visible to replicas (subject to lag) or gone once the transaction ends"""
+    session.info.pop("has_writes", None)
@@ -0,0 +1,167 @@
+"""
+Search Cache Module
+Short-lived caching of keyword search results on top of RedisCacheManager
+"""
+import hashlib
+import threading
+import time
+from functools import wraps
+from typing import Optional, Dict, Any, Callable
+
+from .cache_manager import RedisCacheManager
+from .routing import use_primary
+from .search_index import normalize_text
+
+# Generation keys must outlive every result cached under them
+GENERATION_TTL = 86400
+
+
+def normalize_keyword(keyword: Optional[str]) -> str:
+    """Trim, collapse whitespace and fold width and case, so equivalent keywords share a cache entry"""
+    return " ".join(normalize_text(keyword).split())
+
+
+class SearchCache:
+    """
+    Caches keyword search results by entity, normalized keyword and result limit
+
+    Result keys embed a per-entity generation, ``Search_{Entity}_{generation}_{limit}_{keyword}``.
+    Creating or changing an entity starts a new generation, which makes every cached search
+    of that entity unreachable at once; the orphaned entries simply expire. Results are
+    computed values (see RedisCacheManager.get_or_compute), so a popular search that expires
+    is recomputed by one worker only.
+    """
+
+    def __init__(self, cache_manager: RedisCacheManager, search_ttl: Optional[Dict[str, int]] = None,
+                 default_ttl: int = 60):
+        """
+        Initialize search cache
+
+        Args:
+            cache_manager: Redis cache manager used for storage
+            search_ttl: Per-entity TTL of search results in seconds, keyed by entity name
+            default_ttl: TTL for entities without an explicit setting
+        """
+        self._cache = cache_manager
+        self._search_ttl = dict(search_ttl or {})
+        self._default_ttl = default_ttl
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self._stats_lock = threading.Lock()
+
+    def get_ttl(self, entity: str) -> int:
+        """Get search result TTL in seconds for an entity"""
+        return int(self._search_ttl.get(entity, self._default_ttl))
+
+    @staticmethod
+    def _generation_key(entity: str) -> str:
+        return f"Search_{entity}_generation"
+
+    def _result_key(self, entity: str, keyword: str, limit: int) -> str:
+        generation = self._cache.get_cache(self._generation_key(entity)) or "0"
+        # Keep keys short for long keywords
+        if len(keyword) > 64:
+            keyword = hashlib.md5(keyword.encode("utf-8")).hexdigest()
+        return f"Search_{entity}_{generation}_{limit}_{keyword}"
+
+    def _count(self, entity: str, outcome: str) -> None:
+        with self._stats_lock:
+            counters = self._stats.setdefault(entity, {"hits": 0, "misses": 0})
+            counters[outcome] += 1
+
+    def get_or_search(self, entity: str, keyword: str, limit: int, search: Callable[[str], Any]) -> Any:
+        """
+        Get cached search results, running the search on a miss
+
+        Args:
+            entity: Entity name, e.g. "Book"
+            keyword: Search keyword as entered
+            limit: Result limit of the search
+            search: Function running the search for a normalized keyword
+
+        Returns:
+            Search results
+        """
+        keyword = normalize_keyword(keyword)
+        searched = []
+
+        def compute() -> Any:
+            searched.append(True)
+            return search(keyword)
+
+        result = self._cache.get_or_compute(self._result_key(entity, keyword, limit), compute, self.get_ttl(entity))
+        self._count(entity, "misses" if searched else "hits")
+        return result
+
+    def invalidate(self, entity: str) -> None:
+        """Drop every cached search of an entity by starting a new generation"""
+        self._cache.set_cache(self._generation_key(entity), str(time.time_ns()), GENERATION_TTL)
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get hit/miss counters of this process
+
+        Returns:
+            Mapping of entity name to hits, misses, hit_ratio and the configured ttl
+        """
+        with self._stats_lock:
+            stats = {entity: dict(counters) for entity, counters in self._stats.items()}
+
+        for entity, counters in stats.items():
+            total = counters["hits"] + counters["misses"]
+            counters["hit_ratio"] = round(counters["hits"] / total, 4) if total else 0.0
+            counters["ttl"] = self.get_ttl(entity)
+        return stats
+
+
+def cached_search(entity: str) -> Callable:
+    """
+    Decorator caching the keyword searches of a ``get_*(limit=1, **filters)`` getter
+
+    Only calls filtering by ``keyword`` alone are cached; every other call goes straight to
+    the wrapped getter. Cache misses are searched on the primary, so a lagging replica cannot
+    cache results from before the invalidating write.
+
+    Args:
+        entity: Entity name used for cache keys and TTL configuration
+
+    Returns:
+        Decorator
+    """
+    def decorator(func: Callable) -> Callable:
+        search = use_primary(func)
+
+        @wraps(func)
+        def wrapper(self, *args, **kwargs):
+            limit = args[0] if args else kwargs.get("limit", 1)
+            filters = {k: v for k, v in kwargs.items() if k != "limit"}
+            if len(args) > 1 or list(filters) != ["keyword"] or not isinstance(filters["keyword"], str):
+                return func(self, *args, **kwargs)
+
+            return self.search_cache.get_or_search(
+                entity, filters["keyword"], limit,
+                lambda keyword: search(self, limit=limit, keyword=keyword)
+            )
+        return wrapper
+    return decorator
+
+
+def invalidates_search(*entities: str) -> Callable:
+    """
+    Decorator invalidating the cached searches of entities after the wrapped write method returns
+
+    Args:
+        *entities: Names of the entities whose search results the write may change
+
+    Returns:
+        Decorator
+    """
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        def wrapper(self, *args, **kwargs):
+            result = func(self, *args, **kwargs)
+            if result:
+                for entity in entities:
+                    self.search_cache.invalidate(entity)
+            return result
+        return wrapper
+    return decorator
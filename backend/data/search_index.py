@@ -0,0 +1,446 @@
+"""
+Search Index Module
+Embedded inverted index with CJK bigram tokenization for keyword searches
+"""
+import atexit
+import os
+import pickle
+import threading
+import time
+import unicodedata
+from array import array
+from bisect import bisect_left, insort
+from pathlib import Path
+from typing import Optional, Dict, Any, Iterable, List, Set, Tuple, Callable
+
+# Bumped whenever tokenization or the snapshot layout changes, so stale snapshots are rebuilt
+SNAPSHOT_VERSION = 2
+
+# Out-of-order change versions remembered per entity before its index is considered out of sync
+MAX_PENDING_VERSIONS = 1024
+
+# Separates indexed fields, so a keyword never matches across two fields
+FIELD_SEPARATOR = "\x00"
+
+
+def normalize_text(text: Optional[str]) -> str:
+    """Fold full-width characters and case, so that "ＡＢＣ", "abc" and "ABC" match each other"""
+    return unicodedata.normalize("NFKC", text or "").casefold()
+
+
+def _runs(text: str) -> Iterable[str]:
+    """Split normalized text into runs of letters and digits (CJK characters included)"""
+    run: List[str] = []
+    for char in text:
+        if char.isalnum():
+            run.append(char)
+        elif run:
+            yield "".join(run)
+            run = []
+    if run:
+        yield "".join(run)
+
+
+def tokenize(text: str) -> Set[str]:
+    """
+    Tokenize normalized text into every unigram and bigram of its letter/digit runs
+
+    Bigrams make any keyword of two or more characters a postings intersection, unigrams
+    cover single-character keywords. Chinese needs no word segmentation this way.
+    """
+    tokens = set()
+    for run in _runs(text):
+        tokens.update(run)
+        tokens.update(run[i:i + 2] for i in range(len(run) - 1))
+    return tokens
+
+
+def query_tokens(keyword: str) -> Set[str]:
+    """Get the smallest token set every document containing the normalized keyword must have"""
+    tokens = set()
+    for run in _runs(keyword):
+        if len(run) == 1:
+            tokens.add(run)
+        else:
+            tokens.update(run[i:i + 2] for i in range(len(run) - 1))
+    return tokens
+
+
+class InvertedIndex:
+    """
+    Inverted index of one entity type
+
+    Postings are sorted ``array('I')`` lists of ids, 4 bytes per entry. The normalized text of
+    every document is kept as well, to remove its old tokens on update and to verify candidates,
+    because a document holding all bigrams of a keyword does not necessarily contain the keyword.
+    """
+
+    def __init__(self):
+        self._postings: Dict[str, array] = {}
+        self._documents: Dict[int, str] = {}
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    @property
+    def max_id(self) -> int:
+        """Largest indexed id, 0 when empty"""
+        with self._lock:
+            return max(self._documents, default=0)
+
+    def add(self, doc_id: int, fields: Iterable[Optional[str]]) -> None:
+        """
+        Index a document, replacing its previous version
+
+        Args:
+            doc_id: Primary key
+            fields: Text of the indexed fields; None is treated as empty
+        """
+        text = FIELD_SEPARATOR.join(normalize_text(field) for field in fields)
+        with self._lock:
+            old_text = self._documents.get(doc_id)
+            if old_text == text:
+                return
+            old_tokens = tokenize(old_text) if old_text is not None else set()
+            new_tokens = tokenize(text)
+
+            for token in old_tokens - new_tokens:
+                self._discard_posting(token, doc_id)
+            for token in new_tokens - old_tokens:
+                insort(self._postings.setdefault(token, array("I")), doc_id)
+            self._documents[doc_id] = text
+
+    def remove(self, doc_id: int) -> None:
+        """Remove a document from the index"""
+        with self._lock:
+            text = self._documents.pop(doc_id, None)
+            if text is not None:
+                for token in tokenize(text):
+                    self._discard_posting(token, doc_id)
+
+    def _discard_posting(self, token: str, doc_id: int) -> None:
+        postings = self._postings.get(token)
+        if postings is None:
+            return
+        position = bisect_left(postings, doc_id)
+        if position < len(postings) and postings[position] == doc_id:
+            del postings[position]
+        if not postings:
+            del self._postings[token]
+
+    def search(self, keyword: str) -> Optional[List[int]]:
+        """
+        Find documents with a field containing the keyword
+
+        Args:
+            keyword: Search keyword
+
+        Returns:
+            Matching ids in ascending order, or None if the keyword has no letters or digits to
+            look up (the caller should fall back to a table scan)
+        """
+        keyword = normalize_text(keyword)
+        tokens = query_tokens(keyword)
+        if not tokens:
+            return None
+
+        with self._lock:
+            postings = [self._postings.get(token) for token in tokens]
+            if not all(postings):
+                return []
+            # Walk the shortest list and probe the others with binary search
+            postings.sort(key=len)
+            shortest, others = postings[0], postings[1:]
+            candidates = [doc_id for doc_id in shortest if all(self._contains(other, doc_id) for other in others)]
+            return [doc_id for doc_id in candidates if keyword in self._documents[doc_id]]
+
+    @staticmethod
+    def _contains(postings: array, doc_id: int) -> bool:
+        position = bisect_left(postings, doc_id)
+        return position < len(postings) and postings[position] == doc_id
+
+    def get_state(self) -> Dict[str, Any]:
+        """Get a picklable copy of the index"""
+        with self._lock:
+            return {
+                "postings": {token: array("I", postings) for token, postings in self._postings.items()},
+                "documents": dict(self._documents)
+            }
+
+    def set_state(self, state: Dict[str, Any]) -> None:
+        """Replace the index with a state returned by get_state"""
+        with self._lock:
+            self._postings = state["postings"]
+            self._documents = state["documents"]
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get document, token and postings entry counts"""
+        with self._lock:
+            return {
+                "documents": len(self._documents),
+                "tokens": len(self._postings),
+                "postings": sum(len(postings) for postings in self._postings.values())
+            }
+
+
+# Loads (id, field values) rows of an entity; only rows with an id above after_id when given
+DocumentLoader = Callable[[str, Optional[int]], Iterable[Tuple[int, Tuple[Optional[str], ...]]]]
+
+# Reads the change counter of an entity shared by every process; None when it is unavailable
+VersionSource = Callable[[str], Optional[int]]
+
+
+class SearchIndex:
+    """
+    Inverted indexes of several entity types, persisted as snapshot files
+
+    An entity's index is loaded on its first search: from its snapshot when there is one, then
+    caught up with the rows created since, or built from the database otherwise. Afterwards it
+    is kept current through add/remove, and written back by a background thread at most every
+    ``save_interval`` seconds. Pending changes are also written at interpreter exit.
+
+    With a ``version_source``, every change carries the next value of its entity's shared change
+    counter. An index tracks the version up to which it has applied every change and its snapshot
+    records it. A snapshot behind the counter has missed edits to existing rows, which catching up
+    by id cannot recover, so it is rebuilt instead; and a process never replaces a snapshot with
+    an older one. Changes made outside the application (e.g. by hand in MySQL) need a rebuild.
+    """
+
+    def __init__(self, loader: DocumentLoader, folder: Optional[str] = None, save_interval: int = 60,
+                 version_source: Optional[VersionSource] = None):
+        """
+        Initialize search index
+
+        Args:
+            loader: Function loading the documents of an entity from the database
+            folder: Snapshot folder, None to keep the indexes in memory only
+            save_interval: Minimum seconds between two snapshot writes of an entity
+            version_source: Function reading an entity's change counter, None to catch up by id only
+        """
+        self._loader = loader
+        self._folder = Path(folder) if folder else None
+        self._save_interval = save_interval
+        self._version_source = version_source
+        self._indexes: Dict[str, InvertedIndex] = {}
+        self._last_saved: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        # Version up to which every change of an entity is applied, None once unknown
+        self._versions: Dict[str, Optional[int]] = {}
+        self._pending_versions: Dict[str, Set[int]] = {}
+        self._version_lock = threading.Lock()
+        self._saving: Set[str] = set()
+        self._save_requested: Set[str] = set()
+        self._save_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        if self._folder is not None:
+            atexit.register(self.flush)
+
+    def _snapshot_path(self, entity: str) -> Optional[Path]:
+        return self._folder / f"{entity.lower()}.idx" if self._folder else None
+
+    def _current_version(self, entity: str) -> Optional[int]:
+        return self._version_source(entity) if self._version_source is not None else None
+
+    def _get_index(self, entity: str) -> InvertedIndex:
+        """Get the index of an entity, loading or building it on first use"""
+        index = self._indexes.get(entity)
+        if index is not None:
+            return index
+
+        with self._lock:
+            index = self._indexes.get(entity)
+            if index is None:
+                index = InvertedIndex()
+                # Read before loading, so the loaded rows hold every change up to this version
+                version = self._current_version(entity)
+                if self._load_snapshot(entity, index, version):
+                    after_id = index.max_id
+                else:
+                    after_id = None
+                for doc_id, fields in self._loader(entity, after_id):
+                    index.add(doc_id, fields)
+                self._install(entity, index, version)
+        self.save(entity)
+        return index
+
+    def _install(self, entity: str, index: InvertedIndex, version: Optional[int]) -> None:
+        """Make a loaded index current, holding every change up to version"""
+        with self._version_lock:
+            self._versions[entity] = version
+            self._pending_versions[entity] = set()
+            self._indexes[entity] = index
+            self._last_saved[entity] = 0
+
+    def _load_snapshot(self, entity: str, index: InvertedIndex, version: Optional[int]) -> bool:
+        """Load an entity's snapshot into the index, if it holds every change up to version"""
+        path = self._snapshot_path(entity)
+        if path is None or not path.is_file():
+            return False
+        try:
+            with open(path, "rb") as file:
+                header = pickle.load(file)
+                saved_version = header.get("entity_version")
+                current = header.get("version") == SNAPSHOT_VERSION and (
+                    self._version_source is None or (version is not None and saved_version == version)
+                )
+                if current:
+                    index.set_state(pickle.load(file))
+            if not current and version is not None and saved_version is not None and saved_version > version:
+                # The counter went back (Redis lost its data), so this snapshot would never be replaced
+                path.unlink()
+            return current
+        except Exception as e:
+            print(f"Search index snapshot error: {e}")
+            return False
+
+    @staticmethod
+    def _saved_version(path: Path) -> Optional[int]:
+        """Get the entity version recorded in a snapshot file, None when it records none"""
+        try:
+            with open(path, "rb") as file:
+                header = pickle.load(file)
+            return header.get("entity_version") if header.get("version") == SNAPSHOT_VERSION else None
+        except Exception:
+            return None
+
+    def _apply_version(self, entity: str, version: Optional[int]) -> None:
+        """Record that the change with this version has been applied to an entity's index"""
+        if self._version_source is None:
+            return
+        with self._version_lock:
+            applied = self._versions.get(entity)
+            if applied is None:
+                return
+            pending = self._pending_versions[entity]
+            if version is None or len(pending) >= MAX_PENDING_VERSIONS:
+                # An uncounted change, or one that never arrived (e.g. while the listener was down):
+                # the index can no longer tell which changes it has missed
+                self._versions[entity] = None
+                pending.clear()
+                return
+            if version > applied:
+                pending.add(version)
+            while applied + 1 in pending:
+                applied += 1
+                pending.discard(applied)
+            self._versions[entity] = applied
+
+    def save(self, entity: str, force: bool = False) -> None:
+        """
+        Write an entity's index to its snapshot file in a background thread
+
+        Args:
+            entity: Entity name
+            force: Write even if the last write was less than save_interval seconds ago
+        """
+        if self._snapshot_path(entity) is None or entity not in self._indexes:
+            return
+        if not force and time.monotonic() - self._last_saved.get(entity, 0) < self._save_interval:
+            return
+
+        self._last_saved[entity] = time.monotonic()
+        with self._save_lock:
+            # A running writer picks the request up when it finishes its current write
+            self._save_requested.add(entity)
+            if entity in self._saving:
+                return
+            self._saving.add(entity)
+        threading.Thread(target=self._save_in_background, args=(entity,),
+                         name=f"search-index-save-{entity.lower()}", daemon=True).start()
+
+    def _save_in_background(self, entity: str) -> None:
+        while True:
+            with self._save_lock:
+                if entity not in self._save_requested:
+                    self._saving.discard(entity)
+                    return
+                self._save_requested.discard(entity)
+            self._write_snapshot(entity)
+
+    def _write_snapshot(self, entity: str) -> None:
+        """Write an entity's index to its snapshot file, unless the file already holds newer changes"""
+        path = self._snapshot_path(entity)
+        index = self._indexes.get(entity)
+        if path is None or index is None:
+            return
+
+        with self._write_lock:
+            try:
+                # Version first: the state copied afterwards holds at least every change up to it
+                version = self._versions.get(entity)
+                state = index.get_state()
+                if self._version_source is not None and path.is_file():
+                    saved_version = self._saved_version(path)
+                    if saved_version is not None and (version is None or version < saved_version):
+                        return
+
+                path.parent.mkdir(parents=True, exist_ok=True)
+                # Write aside and rename, so concurrent readers never see a partial file
+                temp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+                with open(temp_path, "wb") as file:
+                    # Header first, so its version can be read without unpickling the state
+                    pickle.dump({"version": SNAPSHOT_VERSION, "entity_version": version}, file,
+                                protocol=pickle.HIGHEST_PROTOCOL)
+                    pickle.dump(state, file, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(temp_path, path)
+            except Exception as e:
+                print(f"Search index save error: {e}")
+
+    def flush(self) -> None:
+        """Write the snapshots of every loaded index, waiting for the writes to finish"""
+        for entity in list(self._indexes):
+            self._write_snapshot(entity)
+
+    def search(self, entity: str, keyword: str) -> Optional[List[int]]:
+        """
+        Find ids of an entity whose indexed fields contain the keyword
+
+        Returns:
+            Matching ids in ascending order, or None if the keyword cannot be looked up
+        """
+        return self._get_index(entity).search(keyword)
+
+    def add(self, entity: str, doc_id: int, fields: Iterable[Optional[str]], version: Optional[int] = None) -> None:
+        """
+        Index a new or changed document, if the entity's index is loaded
+
+        Args:
+            entity: Entity name
+            doc_id: Primary key
+            fields: Text of the indexed fields
+            version: Value of the entity's change counter for this change, None if not counted
+        """
+        index = self._indexes.get(entity)
+        if index is not None:
+            index.add(doc_id, fields)
+            self._apply_version(entity, version)
+            self.save(entity)
+
+    def remove(self, entity: str, doc_id: int, version: Optional[int] = None) -> None:
+        """Remove a document, if the entity's index is loaded (see add for version)"""
+        index = self._indexes.get(entity)
+        if index is not None:
+            index.remove(doc_id)
+            self._apply_version(entity, version)
+            self.save(entity)
+
+    def rebuild(self, entity: str) -> int:
+        """
+        Rebuild an entity's index from the database and write its snapshot
+
+        Returns:
+            Number of indexed documents
+        """
+        version = self._current_version(entity)
+        index = InvertedIndex()
+        for doc_id, fields in self._loader(entity, None):
+            index.add(doc_id, fields)
+        with self._lock:
+            self._install(entity, index, version)
+        self._write_snapshot(entity)
+        return len(index)
+
+    def get_stats(self) -> Dict[str, Dict[str, int]]:
+        """Get statistics of every loaded index"""
+        return {entity: index.get_stats() for entity, index in list(self._indexes.items())}
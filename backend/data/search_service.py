@@ -0,0 +1,163 @@
+"""
+Search Service Module
+Multi-entity keyword search fanned out over a bounded thread pool
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, Future, wait
+from contextvars import ContextVar
+from typing import Dict, Any, Optional, Callable, List
+
+from flask import Flask, has_request_context, copy_current_request_context
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Entity name -> DatabaseManager getter searched by keyword
+SEARCH_GETTERS = {
+    "User": "get_user",
+    "Book": "get_book",
+    "Journal": "get_journal",
+    "Group": "get_group"
+}
+
+DEFAULT_RESULT_LIMITS = {"User": 5, "Book": 10, "Journal": 10, "Group": 5}
+
+# time.monotonic() deadline of the sub-search running in this thread, None outside sub-searches
+_statement_deadline: ContextVar[Optional[float]] = ContextVar("statement_deadline", default=None)
+
+
+@event.listens_for(Engine, "before_cursor_execute", retval=True)
+def _limit_statement_time(conn, cursor, statement, parameters, context, executemany):
+    """
+    Give the SELECTs of a sub-search a MySQL MAX_EXECUTION_TIME hint of its remaining budget
+
+    A timed-out sub-search cannot be cancelled from Python once its query runs, so the server
+    aborts the query instead of letting it hold a worker and a connection.
+    """
+    deadline = _statement_deadline.get()
+    if deadline is not None and conn.dialect.name == "mysql" and statement[:6].upper() == "SELECT":
+        remaining_ms = max(1, int((deadline - time.monotonic()) * 1000))
+        statement = f"SELECT /*+ MAX_EXECUTION_TIME({remaining_ms}) */{statement[6:]}"
+    return statement, parameters
+
+
+class SearchService:
+    """
+    Runs the per-entity searches of one keyword concurrently
+
+    Every sub-search runs on a worker of a pool shared by all requests, inside its own
+    application context (and a copy of the request context, so read routing still sees the
+    current user), hence its own database session. A search takes about as long as its
+    slowest sub-search; sub-searches that fail or exceed the timeout return no results.
+
+    The timeout is enforced on the server as well (MAX_EXECUTION_TIME), and a search is
+    rejected right away when the pool already holds more sub-searches than it can start
+    within the timeout, instead of queueing behind them.
+    """
+
+    def __init__(self, database_manager, app: Flask, max_workers: int = 8, timeout: float = 5.0,
+                 result_limits: Optional[Dict[str, int]] = None, max_queued: Optional[int] = None):
+        """
+        Initialize search service
+
+        Args:
+            database_manager: DatabaseManager running the sub-searches
+            app: Flask application, for application contexts on the workers
+            max_workers: Maximum number of concurrently running sub-searches, across all requests
+            timeout: Seconds to wait for the sub-searches of one search
+            result_limits: Default number of results per entity name
+            max_queued: Sub-searches allowed to wait for a worker, max_workers when None
+        """
+        self._db = database_manager
+        self._app = app
+        self._timeout = timeout
+        self._result_limits = {**DEFAULT_RESULT_LIMITS, **(result_limits or {})}
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="search")
+        self._capacity = max_workers + (max_workers if max_queued is None else max_queued)
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    def _bind_context(self, func: Callable[[], Any]) -> Callable[[], Any]:
+        """Wrap a function to run inside the current request context, or an application context"""
+        if has_request_context():
+            return copy_current_request_context(func)
+
+        def run() -> Any:
+            with self._app.app_context():
+                return func()
+        return run
+
+    @staticmethod
+    def _with_deadline(func: Callable[[], Any], deadline: float) -> Callable[[], Any]:
+        """Wrap a sub-search so its queries are limited to the time left until the deadline"""
+        def run() -> Any:
+            if time.monotonic() >= deadline:
+                # Waited in the queue for the whole budget; nobody reads the result any more
+                raise TimeoutError("search timed out before it started")
+            token = _statement_deadline.set(deadline)
+            try:
+                return func()
+            finally:
+                _statement_deadline.reset(token)
+        return run
+
+    def _task_done(self, future: Future) -> None:
+        with self._lock:
+            self._in_flight -= 1
+
+    def search(self, keyword: str, limits: Optional[Dict[str, int]] = None) -> Dict[str, Any]:
+        """
+        Search users, books, journals and groups for a keyword
+
+        Args:
+            keyword: Search keyword
+            limits: Number of results per entity name, overriding the defaults; 0 skips an entity
+
+        Returns:
+            Dictionary with a result list per entity name, the entities whose search failed,
+            timed out or was rejected under 'errors', and the elapsed time under 'elapsed_ms'
+        """
+        started = time.perf_counter()
+        deadline = time.monotonic() + self._timeout
+        limits = {**self._result_limits, **(limits or {})}
+        entities = [entity for entity in SEARCH_GETTERS if limits.get(entity, 0) > 0]
+
+        result: Dict[str, Any] = {entity: [] for entity in SEARCH_GETTERS}
+        with self._lock:
+            saturated = self._in_flight + len(entities) > self._capacity
+            if not saturated:
+                self._in_flight += len(entities)
+        if saturated:
+            print(f"Search pool saturated, rejecting search ({self._in_flight} sub-searches in flight)")
+            result["errors"] = entities
+            result["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 3)
+            return result
+
+        futures = {}
+        for entity in entities:
+            getter = getattr(self._db, SEARCH_GETTERS[entity])
+            task = self._bind_context(self._with_deadline(
+                lambda getter=getter, limit=limits[entity]: getter(limit=limit, keyword=keyword), deadline
+            ))
+            futures[entity] = self._executor.submit(task)
+            futures[entity].add_done_callback(self._task_done)
+
+        wait(futures.values(), timeout=self._timeout)
+
+        errors: List[str] = []
+        for entity, future in futures.items():
+            if not future.done():
+                # Only stops a sub-search still queued; a running one ends at its MAX_EXECUTION_TIME
+                future.cancel()
+                errors.append(entity)
+                continue
+            try:
+                found = future.result()
+                result[entity] = found if isinstance(found, list) else [found] if found else []
+            except Exception as e:
+                print(f"Search error ({entity}): {e}")
+                errors.append(entity)
+
+        result["errors"] = errors
+        result["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 3)
+        return result
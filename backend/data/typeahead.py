@@ -0,0 +1,145 @@
+"""
+Typeahead Module
+In-memory prefix index serving as-you-type book suggestions
+"""
+import threading
+from bisect import bisect_left, insort
+from typing import Optional, Dict, Any, Callable, Iterable, List, Tuple
+
+from .search_index import normalize_text
+
+try:
+    from pypinyin import lazy_pinyin, Style
+    PYPINYIN_AVAILABLE = True
+except ImportError:
+    PYPINYIN_AVAILABLE = False
+
+
+def _has_cjk(text: str) -> bool:
+    return any("一" <= char <= "鿿" for char in text)
+
+
+def pinyin_initials(text: str) -> str:
+    """Get the pinyin initials of the Chinese characters of a text, e.g. "三体" -> "st" """
+    if not PYPINYIN_AVAILABLE:
+        return ""
+    return "".join(
+        char for syllable in lazy_pinyin(text, style=Style.FIRST_LETTER, errors="ignore")
+        for char in normalize_text(syllable) if char.isalnum()
+    )
+
+
+def prefix_terms(value: Optional[str]) -> List[str]:
+    """
+    Get the terms of a field that a typed prefix is matched against
+
+    These are the normalized field and every suffix starting at a word boundary, so "Harry
+    Potter" is suggested for both "har" and "pot", plus the pinyin initials of Chinese text.
+    """
+    text = normalize_text(value).strip()
+    terms = [
+        text[i:] for i in range(len(text))
+        if text[i].isalnum() and (i == 0 or not text[i - 1].isalnum())
+    ]
+    if _has_cjk(text):
+        terms.append(pinyin_initials(text))
+    return [term for term in terms if term]
+
+
+class TypeaheadIndex:
+    """
+    Prefix index of book titles, original titles and authors
+
+    Terms are kept in one sorted list of ``(term, book id)`` pairs, so a lookup is a binary search
+    for the typed prefix followed by a short forward scan until enough distinct books are found.
+    """
+
+    def __init__(self):
+        self._entries: List[Tuple[str, int]] = []
+        self._terms: Dict[int, List[str]] = {}
+        self._books: Dict[int, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        self.loaded = False
+
+    def __len__(self) -> int:
+        return len(self._books)
+
+    @staticmethod
+    def _book_terms(title: Optional[str], author: Optional[str], origin_title: Optional[str]) -> List[str]:
+        return sorted({term for value in (title, author, origin_title) for term in prefix_terms(value)})
+
+    def load(self, books: Iterable[Tuple[int, Optional[str], Optional[str], Optional[str]]]) -> None:
+        """
+        Replace the index contents
+
+        Args:
+            books: (id, title, author, origin_title) rows
+        """
+        entries, terms, data = [], {}, {}
+        for book_id, title, author, origin_title in books:
+            terms[book_id] = self._book_terms(title, author, origin_title)
+            data[book_id] = {"id": book_id, "title": title, "author": author, "origin_title": origin_title}
+            entries.extend((term, book_id) for term in terms[book_id])
+        entries.sort()
+
+        with self._lock:
+            self._entries, self._terms, self._books = entries, terms, data
+            self.loaded = True
+
+    def ensure_loaded(self, loader: Callable[[], Iterable[Tuple[int, Optional[str], Optional[str], Optional[str]]]]) -> None:
+        """
+        Load the index on first use
+
+        Args:
+            loader: Function returning the (id, title, author, origin_title) rows; concurrent
+                    first callers wait for a single load
+        """
+        if self.loaded:
+            return
+        with self._load_lock:
+            if not self.loaded:
+                self.load(loader())
+
+    def add(self, book_id: int, title: Optional[str], author: Optional[str], origin_title: Optional[str]) -> None:
+        """Index a new book, or re-index a changed one"""
+        terms = self._book_terms(title, author, origin_title)
+        with self._lock:
+            old_terms = self._terms.get(book_id, [])
+            for term in set(old_terms) - set(terms):
+                position = bisect_left(self._entries, (term, book_id))
+                if position < len(self._entries) and self._entries[position] == (term, book_id):
+                    del self._entries[position]
+            for term in set(terms) - set(old_terms):
+                insort(self._entries, (term, book_id))
+            self._terms[book_id] = terms
+            self._books[book_id] = {"id": book_id, "title": title, "author": author, "origin_title": origin_title}
+
+    def suggest(self, prefix: str, limit: int = 8) -> List[Dict[str, Any]]:
+        """
+        Get books with a title, original title or author starting with a prefix
+
+        Args:
+            prefix: Typed text
+            limit: Maximum number of suggestions
+
+        Returns:
+            List of {id, title, author, origin_title}, shortest matching term first
+        """
+        prefix = normalize_text(prefix).strip()
+        if not prefix or limit <= 0:
+            return []
+
+        found: Dict[int, int] = {}
+        with self._lock:
+            position = bisect_left(self._entries, (prefix,))
+            while position < len(self._entries) and len(found) < limit:
+                term, book_id = self._entries[position]
+                if not term.startswith(prefix):
+                    break
+                found.setdefault(book_id, len(term))
+                position += 1
+            books = [dict(self._books[book_id]) for book_id in found]
+
+        # Terms of the same prefix range are in alphabetical order; prefer the closest match
+        return sorted(books, key=lambda book: found[book["id"]])
@@ -2,7 +2,9 @@
 Data Utilities Module
 Provides TypedDict definitions and utility functions for data extraction and conversion
 """
-from typing import TypedDict, List, Union, Optional
+import base64
+import json
+from typing import TypedDict, List, Union, Optional, Any
 from datetime import datetime
 
 # Type definitions for data transfer objects
@@ -132,6 +134,12 @@ class UnreadMessagesData(TypedDict):
     chats: List[ChatData]
 
 
+class PageData(TypedDict):
+    """Keyset-paginated result page"""
+    items: List[Any]
+    next_cursor: Optional[str]
+
+
 # Utility functions for data extraction
 
 def extract_user_data(user_model, include_password: bool = False) -> UserData:
@@ -185,18 +193,24 @@ def extract_book_data(book_model) -> BookData:
     )
 
 
-def extract_journal_data(journal_model, comment_count: int = 0, like_count: int = 0) -> JournalData:
+def extract_journal_data(journal_model, comment_count: Optional[int] = None,
+                         like_count: Optional[int] = None) -> JournalData:
     """
     Extract journal data from Journal model instance
     
     Args:
         journal_model: Journal model instance
-        comment_count: Number of comments
-        like_count: Number of likes
+        comment_count: Number of comments, defaults to the persisted comment_num counter
+        like_count: Number of likes, defaults to the persisted like_num counter
         
     Returns:
         JournalData dictionary
     """
+    if comment_count is None:
+        comment_count = journal_model.comment_num or 0
+    if like_count is None:
+        like_count = journal_model.like_num or 0
+    
     return JournalData(
         id=journal_model.id,
         title=journal_model.title,
@@ -435,4 +449,41 @@ def safe_float_conversion(value: Union[str, float, None]) -> Optional[float]:
     try:
         return float(value)
     except (ValueError, TypeError):
-        return None 
\ No newline at end of file
+        return None 
+
+
+def encode_cursor(values: List[Union[str, int, datetime, None]]) -> str:
+    """
+    Encode the sort key of the last row on a page as an opaque cursor
+    
+    Args:
+        values: Sort key values, in sort column order
+        
+    Returns:
+        URL-safe cursor string
+    """
+    payload = json.dumps([format_datetime_string(v) if isinstance(v, datetime) else v for v in values],
+                         separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[List[Any]]:
+    """
+    Decode a cursor produced by encode_cursor
+    
+    Args:
+        cursor: Cursor string
+        
+    Returns:
+        List of sort key values, or None if the cursor is empty or malformed
+    """
+    if not cursor:
+        return None
+    
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8"))
+    except (ValueError, TypeError):
+        return None
+    
+    return values if isinstance(values, list) else None
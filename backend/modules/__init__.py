@@ -8,6 +8,7 @@
     - file_manager: 文件系统管理模块
     - network_services: 网络服务模块
     - image_processor: 图像处理模块
+    - image_tasks: 图像后台处理模块
 
 主要功能:
     - 文件管理
@@ -18,7 +19,8 @@
 
 from .file_manager import FileSystemManager, AssetType
 from .network_services import EmailService, ExternalAPIService
-from .image_processor import ImageProcessor, AlignmentOption
+from .image_processor import ImageProcessor, ImagePipeline, AlignmentOption
+from .image_tasks import ImageTaskQueue
 
 # 定义包的公共API
 __all__ = [
@@ -27,5 +29,7 @@ __all__ = [
     'EmailService',        # 邮件服务
     'ExternalAPIService',  # 外部API服务
     'ImageProcessor',      # 图像处理器
+    'ImagePipeline',       # 图像处理流水线
+    'ImageTaskQueue',      # 图像后台处理队列
     'AlignmentOption'      # 对齐选项枚举
 ] 
\ No newline at end of file
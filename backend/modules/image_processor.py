@@ -10,6 +10,10 @@
     - 纵横比调整
     - 图像优化
     - 图像信息获取
+    - 处理流水线（一次解码、多步内存操作、一次编码）
+    - 多尺寸缩略图生成
+    - WebP/AVIF 格式输出
+    - 大图的降分辨率解码与解压缩炸弹防护
 
 依赖:
     - OpenCV (cv2): 图像处理核心库
@@ -17,19 +21,174 @@
 """
 
 import os
+import shutil
+import struct
 from enum import Enum
+from functools import lru_cache
 from pathlib import Path
-from typing import Tuple, Optional
+from typing import Tuple, Optional, List, Callable, Dict, Sequence, NamedTuple, BinaryIO
 
 import cv2
 import numpy as np
 
+# 可选的现代输出格式，按同等画质下的压缩率从高到低排列
+MODERN_FORMATS = (".avif", ".webp")
+
+# 允许解码的最大像素数（约9000万，与Pillow的默认值相当，足够容纳8000x6000的手机照片）；
+# 超过时直接拒绝，防止很小的文件解码出数GB的内存（解压缩炸弹）
+MAX_IMAGE_PIXELS = 89_478_485
+
+# 降分辨率解码的缩小倍数与对应的读取标志；JPEG可在解码时直接按1/2、1/4、1/8缩小，内存与耗时同比下降
+REDUCED_DECODE_FLAGS = {
+    8: cv2.IMREAD_REDUCED_COLOR_8,
+    4: cv2.IMREAD_REDUCED_COLOR_4,
+    2: cv2.IMREAD_REDUCED_COLOR_2,
+}
+
+# 降分辨率解码后，图像仍须至少是缩放目标的这个倍数，以保证缩小后的画质
+REDUCED_DECODE_MARGIN = 2
+
+# 读取JPEG尺寸时，查找下一个标记最多跳过的字节数；损坏或伪造的文件超过时放弃读取文件头，改为完整解码
+MAX_JPEG_MARKER_SCAN = 4096
+
+# 旋转90度的EXIF方向值，OpenCV读取时会按方向旋转，宽高互换
+TRANSPOSED_ORIENTATIONS = (5, 6, 7, 8)
+
 
 class ImageProcessingError(Exception):
     """图像处理相关的自定义异常"""
     pass
 
 
+class ImageSizeError(ImageProcessingError):
+    """目标尺寸超过图像尺寸时的异常"""
+    pass
+
+
+class ImageTooLargeError(ImageProcessingError):
+    """图像像素数超过上限时的异常"""
+    pass
+
+
+def _read_jpeg_size(file: BinaryIO) -> Optional[Tuple[int, int]]:
+    """
+    从JPEG的段结构读取尺寸（只读取文件头部的标记段，不解码）
+    
+    返回:
+        按EXIF方向旋转后的 (宽度, 高度)，无法识别时返回None
+    """
+    orientation = 1
+    file.seek(2)
+    while True:
+        # 跳过标记前的填充字节，超过上限时放弃
+        skipped = 0
+        byte = file.read(1)
+        while byte and byte != b"\xff" and skipped < MAX_JPEG_MARKER_SCAN:
+            skipped += 1
+            byte = file.read(1)
+        while byte == b"\xff" and skipped < MAX_JPEG_MARKER_SCAN:
+            skipped += 1
+            byte = file.read(1)
+        if not byte or skipped >= MAX_JPEG_MARKER_SCAN:
+            return None
+        marker = byte[0]
+        if marker in (0x01, 0xd8) or 0xd0 <= marker <= 0xd7:
+            # 没有长度字段的标记
+            continue
+        header = file.read(2)
+        if len(header) < 2:
+            return None
+        length = struct.unpack(">H", header)[0]
+        if length < 2:
+            return None
+        if 0xc0 <= marker <= 0xcf and marker not in (0xc4, 0xc8, 0xcc):
+            # SOFn 帧头: 精度(1) 高度(2) 宽度(2)
+            frame = file.read(5)
+            if len(frame) < 5:
+                return None
+            height, width = struct.unpack(">HH", frame[1:5])
+            return (height, width) if orientation in TRANSPOSED_ORIENTATIONS else (width, height)
+        if marker == 0xe1 and orientation == 1:
+            segment = file.read(length - 2)
+            orientation = _read_exif_orientation(segment)
+            continue
+        if marker == 0xda:
+            # 已到图像数据，前面没有帧头
+            return None
+        file.seek(length - 2, os.SEEK_CUR)
+
+
+def _read_exif_orientation(segment: bytes) -> int:
+    """从APP1段读取EXIF方向，没有时返回1"""
+    if not segment.startswith(b"Exif\x00\x00") or len(segment) < 14:
+        return 1
+    tiff = segment[6:]
+    order = {b"II": "<", b"MM": ">"}.get(tiff[:2])
+    if order is None:
+        return 1
+    try:
+        offset = struct.unpack(f"{order}I", tiff[4:8])[0]
+        count = struct.unpack(f"{order}H", tiff[offset:offset + 2])[0]
+        for index in range(count):
+            entry = tiff[offset + 2 + index * 12:offset + 14 + index * 12]
+            if struct.unpack(f"{order}H", entry[:2])[0] == 0x0112:
+                return struct.unpack(f"{order}H", entry[8:10])[0]
+    except struct.error:
+        pass
+    return 1
+
+
+def probe_image_size(image_path: str) -> Optional[Tuple[int, int]]:
+    """
+    只读取文件头获取图像尺寸，不解码像素
+    
+    参数:
+        image_path: 图像文件路径
+        
+    返回:
+        (宽度, 高度) 的元组；JPEG按EXIF方向旋转，与OpenCV读取的结果一致。
+        支持JPEG、PNG、WebP、GIF和BMP，其他格式或文件损坏时返回None
+    """
+    with open(image_path, "rb") as file:
+        head = file.read(32)
+        if head.startswith(b"\xff\xd8"):
+            return _read_jpeg_size(file)
+    
+    if head.startswith(b"\x89PNG\r\n\x1a\n") and head[12:16] == b"IHDR":
+        return struct.unpack(">II", head[16:24])
+    if head[:6] in (b"GIF87a", b"GIF89a"):
+        return struct.unpack("<HH", head[6:10])
+    if head.startswith(b"BM") and len(head) >= 26:
+        width, height = struct.unpack("<ii", head[18:26])
+        return width, abs(height)
+    if head.startswith(b"RIFF") and head[8:12] == b"WEBP" and len(head) >= 30:
+        chunk = head[12:16]
+        if chunk == b"VP8 ":
+            width, height = struct.unpack("<HH", head[26:30])
+            return width & 0x3fff, height & 0x3fff
+        if chunk == b"VP8L":
+            bits = int.from_bytes(head[21:25], "little")
+            return (bits & 0x3fff) + 1, ((bits >> 14) & 0x3fff) + 1
+        if chunk == b"VP8X":
+            return int.from_bytes(head[24:27], "little") + 1, int.from_bytes(head[27:30], "little") + 1
+    return None
+
+
+@lru_cache(maxsize=None)
+def supported_output_formats() -> Tuple[str, ...]:
+    """
+    获取当前OpenCV构建能够编码的现代图像格式
+    
+    返回:
+        扩展名元组，如 (".webp",)；AVIF需要OpenCV 4.10+ 且编译时启用了libavif
+    """
+    try:
+        return tuple(extension for extension in MODERN_FORMATS if cv2.haveImageWriter(f"probe{extension}"))
+    except (AttributeError, cv2.error):
+        # 旧版本OpenCV没有 haveImageWriter，WebP自3.x起默认可用
+        return (".webp",)
+
+
 class AlignmentOption(Enum):
     """
     图像对齐选项枚举
@@ -48,6 +207,331 @@ class AlignmentOption(Enum):
     BOTTOM = "bottom"
 
 
+class _Step(NamedTuple):
+    """
+    流水线中的一步
+    
+    字段:
+        apply: 处理函数；缩放步骤为None，由流水线按 output_size 缩放
+        output_size: 由输入尺寸 (宽, 高) 计算输出尺寸；结果随输入分辨率变化的步骤（如按像素裁剪）为None
+        resizes: 是否为缩放步骤
+    """
+    apply: Optional[Callable[[np.ndarray], np.ndarray]]
+    output_size: Optional[Callable[[int, int], Tuple[int, int]]]
+    resizes: bool = False
+
+
+def _aspect_crop_size(width: int, height: int, aspect_width: int, aspect_height: int) -> Tuple[int, int]:
+    """计算按纵横比居中裁剪后的最大尺寸"""
+    if width / height > aspect_width / aspect_height:
+        # 图像比目标比例更宽
+        return height * aspect_width // aspect_height, height
+    # 图像比目标比例更高
+    return width, width * aspect_height // aspect_width
+
+
+def _resize_size(width: int, height: int, target_width: int, target_height: int,
+                 maintain_aspect_ratio: bool) -> Tuple[int, int]:
+    """计算缩放后的尺寸"""
+    if not maintain_aspect_ratio:
+        return target_width, target_height
+    aspect_ratio = width / height
+    if target_width / target_height > aspect_ratio:
+        return max(int(target_height * aspect_ratio), 1), target_height
+    return target_width, max(int(target_width / aspect_ratio), 1)
+
+
+def _fit_size(width: int, height: int, max_width: int, max_height: int) -> Tuple[int, int]:
+    """计算按比例缩小到最大尺寸以内后的尺寸，不放大"""
+    if width <= max_width and height <= max_height:
+        return width, height
+    scale = min(max_width / width, max_height / height)
+    return max(int(width * scale), 1), max(int(height * scale), 1)
+
+
+class ImagePipeline:
+    """
+    可组合的图像处理流水线
+    
+    说明:
+        各处理步骤只记录下来，在 save()/encode()/execute() 时才统一执行：
+        图像只解码一次，所有步骤都在内存中的NumPy数组上完成，最后只编码一次，
+        避免多次有损压缩造成的画质损失和重复的编解码开销。
+        
+        解码前先读取文件头：像素数超过上限的图像直接拒绝；
+        若各步骤最终把图像缩小到原图的几分之一，则以降分辨率模式解码（IMREAD_REDUCED_COLOR_2/4/8），
+        大照片不必先完整解码到内存
+        
+    用法:
+        ImagePipeline(path).crop_to_square().fit_within(512, 512).save(quality=85)
+    """
+    
+    def __init__(self, image_path: Optional[str] = None, image: Optional[np.ndarray] = None,
+                 max_pixels: int = MAX_IMAGE_PIXELS):
+        """
+        初始化处理流水线
+        
+        参数:
+            image_path: 源图像文件路径
+            image: 已解码的图像数组（与 image_path 二选一）
+            max_pixels: 允许解码的最大像素数
+            
+        异常:
+            ImageProcessingError: 当两者都未提供或源文件不存在时
+        """
+        if image is None and image_path is None:
+            raise ImageProcessingError("未指定源图像")
+        if image is None and not os.path.exists(image_path):
+            raise ImageProcessingError(f"图像文件未找到: {image_path}")
+        
+        self._image_path = image_path
+        self._image = image
+        self._max_pixels = max_pixels
+        self._steps: List[_Step] = []
+    
+    def _reduction_factor(self, width: int, height: int) -> int:
+        """
+        计算可以使用的降分辨率解码倍数
+        
+        参数:
+            width: 原图宽度
+            height: 原图高度
+            
+        返回:
+            8、4、2，或1（完整解码）
+            
+        说明:
+            只有当所有步骤都与分辨率无关（按比例裁剪、缩放）、且降分辨率后每个缩放步骤的输入
+            仍至少是其输出的 REDUCED_DECODE_MARGIN 倍时才降分辨率，保证画质不变；
+            输出尺寸由 _apply_steps 按原图尺寸计算，同样不受降分辨率影响
+        """
+        if not any(step.resizes for step in self._steps):
+            return 1
+        for factor in REDUCED_DECODE_FLAGS:
+            current_width, current_height = -(-width // factor), -(-height // factor)
+            for step in self._steps:
+                if step.output_size is None:
+                    return 1
+                next_width, next_height = step.output_size(current_width, current_height)
+                if step.resizes and (
+                    current_width < next_width * REDUCED_DECODE_MARGIN
+                    or current_height < next_height * REDUCED_DECODE_MARGIN
+                ):
+                    break
+                current_width, current_height = next_width, next_height
+            else:
+                return factor
+        return 1
+    
+    def _decode(self) -> Tuple[np.ndarray, Tuple[int, int]]:
+        """
+        解码源图像
+        
+        返回:
+            (图像数组, 原图完整尺寸 (宽, 高))；降分辨率解码时图像数组小于完整尺寸
+            
+        异常:
+            ImageTooLargeError: 当像素数超过上限时
+            ImageProcessingError: 当图像无法读取时
+        """
+        if self._image is not None:
+            return self._image, (self._image.shape[1], self._image.shape[0])
+        
+        try:
+            size = probe_image_size(self._image_path)
+        except OSError as e:
+            raise ImageProcessingError(f"图像读取失败: {self._image_path} ({e})")
+        if size is not None and size[0] * size[1] > self._max_pixels:
+            raise ImageTooLargeError(f"图像像素数超过上限: {size[0]}x{size[1]}")
+        
+        factor = self._reduction_factor(*size) if size is not None else 1
+        image = cv2.imread(self._image_path, REDUCED_DECODE_FLAGS.get(factor, cv2.IMREAD_COLOR))
+        if image is None:
+            raise ImageProcessingError(f"图像读取失败: {self._image_path}")
+        if size is None:
+            if image.shape[0] * image.shape[1] > self._max_pixels:
+                raise ImageTooLargeError(f"图像像素数超过上限: {image.shape[1]}x{image.shape[0]}")
+            size = (image.shape[1], image.shape[0])
+        elif factor == 1:
+            # 以实际解码结果为准（如文件头中的EXIF方向与OpenCV的处理不一致时）
+            size = (image.shape[1], image.shape[0])
+        return image, size
+    
+    def _apply_steps(self, image: np.ndarray, size: Tuple[int, int]) -> np.ndarray:
+        """
+        依次执行所有步骤
+        
+        参数:
+            image: 解码后的图像数组
+            size: 原图完整尺寸 (宽, 高)
+            
+        说明:
+            缩放步骤的目标尺寸按原图完整尺寸逐步推算，而不是按降分辨率解码后的实际尺寸计算，
+            否则向上取整的缩小会使输出尺寸相差1像素
+        """
+        for step in self._steps:
+            if step.resizes:
+                size = step.output_size(*size)
+                if size != (image.shape[1], image.shape[0]):
+                    image = cv2.resize(image, size, interpolation=cv2.INTER_AREA)
+                continue
+            image = step.apply(image)
+            size = step.output_size(*size) if step.output_size is not None else (image.shape[1], image.shape[0])
+        return image
+    
+    def execute(self) -> np.ndarray:
+        """
+        解码源图像并依次执行所有步骤
+        
+        返回:
+            处理后的图像数组
+        """
+        return self._apply_steps(*self._decode())
+    
+    def backup(self, backup_path: Optional[str] = None) -> 'ImagePipeline':
+        """
+        立即备份源文件（原样复制，不重新编码）
+        
+        参数:
+            backup_path: 备份路径，默认为 "{源路径}.backup"
+        """
+        if self._image_path is None:
+            raise ImageProcessingError("内存中的图像无法备份")
+        shutil.copyfile(self._image_path, backup_path or f"{self._image_path}.backup")
+        return self
+    
+    def crop(
+        self,
+        target_width: int,
+        target_height: int,
+        horizontal_align: AlignmentOption = AlignmentOption.CENTER,
+        vertical_align: AlignmentOption = AlignmentOption.CENTER
+    ) -> 'ImagePipeline':
+        """
+        裁剪为指定尺寸
+        
+        异常:
+            ImageSizeError: 执行时目标尺寸超过图像尺寸
+        """
+        def apply(image: np.ndarray) -> np.ndarray:
+            height, width = image.shape[:2]
+            if target_width > width or target_height > height:
+                raise ImageSizeError(f"目标尺寸 {target_width}x{target_height} 超过图像尺寸 {width}x{height}")
+            x_start, x_end = ImageProcessor._calculate_crop_range(width, target_width, horizontal_align)
+            y_start, y_end = ImageProcessor._calculate_crop_range(height, target_height, vertical_align)
+            return image[y_start:y_end, x_start:x_end]
+        
+        # 按像素裁剪的结果随解码分辨率变化，不能降分辨率解码
+        self._steps.append(_Step(apply, None))
+        return self
+    
+    def crop_to_aspect_ratio(self, aspect_width: int, aspect_height: int) -> 'ImagePipeline':
+        """居中裁剪为指定纵横比，同时保持最大尺寸"""
+        def apply(image: np.ndarray) -> np.ndarray:
+            height, width = image.shape[:2]
+            new_width, new_height = _aspect_crop_size(width, height, aspect_width, aspect_height)
+            if (new_width, new_height) == (width, height):
+                return image
+            start_x = (width - new_width) // 2
+            start_y = (height - new_height) // 2
+            return image[start_y:start_y + new_height, start_x:start_x + new_width]
+        
+        self._steps.append(_Step(
+            apply, lambda width, height: _aspect_crop_size(width, height, aspect_width, aspect_height)
+        ))
+        return self
+    
+    def crop_to_square(self) -> 'ImagePipeline':
+        """居中裁剪为正方形（边长取较短边）"""
+        return self.crop_to_aspect_ratio(1, 1)
+    
+    def resize(self, target_width: int, target_height: int, maintain_aspect_ratio: bool = True) -> 'ImagePipeline':
+        """
+        缩放到指定尺寸
+        
+        参数:
+            target_width: 目标宽度
+            target_height: 目标高度
+            maintain_aspect_ratio: 是否保持纵横比（适配到目标框内）
+        """
+        def output_size(width: int, height: int) -> Tuple[int, int]:
+            return _resize_size(width, height, target_width, target_height, maintain_aspect_ratio)
+        
+        self._steps.append(_Step(None, output_size, resizes=True))
+        return self
+    
+    def fit_within(self, max_width: int, max_height: int) -> 'ImagePipeline':
+        """仅当图像超出最大尺寸时按比例缩小"""
+        def output_size(width: int, height: int) -> Tuple[int, int]:
+            return _fit_size(width, height, max_width, max_height)
+        
+        self._steps.append(_Step(None, output_size, resizes=True))
+        return self
+    
+    @staticmethod
+    def _encode_params(extension: str, quality: Optional[int]) -> List[int]:
+        """获取编码参数"""
+        if quality is None:
+            return []
+        if extension in (".jpg", ".jpeg"):
+            return [cv2.IMWRITE_JPEG_QUALITY, quality]
+        if extension == ".webp":
+            return [cv2.IMWRITE_WEBP_QUALITY, quality]
+        if extension == ".avif" and hasattr(cv2, "IMWRITE_AVIF_QUALITY"):
+            return [cv2.IMWRITE_AVIF_QUALITY, quality]
+        return []
+    
+    def encode(self, extension: str = ".jpg", quality: Optional[int] = None) -> bytes:
+        """
+        执行流水线并编码到内存
+        
+        参数:
+            extension: 输出格式的扩展名，如 ".jpg"
+            quality: 编码质量（1-100），None使用OpenCV默认值
+            
+        返回:
+            编码后的图像数据
+        """
+        image = self.execute()
+        success, buffer = cv2.imencode(extension, image, self._encode_params(extension.lower(), quality))
+        if not success:
+            raise ImageProcessingError(f"图像编码失败: {extension}")
+        return buffer.tobytes()
+    
+    def save(self, output_path: Optional[str] = None, quality: Optional[int] = None,
+             only_if_changed: bool = False, backup: bool = False) -> bool:
+        """
+        执行流水线并写入文件
+        
+        参数:
+            output_path: 输出路径，默认覆盖源文件
+            quality: 编码质量（1-100），None使用OpenCV默认值
+            only_if_changed: 为True时若各步骤都未改变图像则不重新编码
+            backup: 为True时在写入前备份源文件，见 backup()；
+                步骤执行失败（如 ImageSizeError）或因未改变而跳过时不会留下备份
+            
+        返回:
+            写入文件返回True，因未改变而跳过返回False
+        """
+        output_path = output_path or self._image_path
+        if output_path is None:
+            raise ImageProcessingError("未指定输出路径")
+        
+        source, size = self._decode()
+        image = self._apply_steps(source, size)
+        if only_if_changed and image is source and output_path == self._image_path:
+            return False
+        
+        extension = Path(output_path).suffix.lower() or ".jpg"
+        success, buffer = cv2.imencode(extension, image, self._encode_params(extension, quality))
+        if not success:
+            raise ImageProcessingError(f"图像编码失败: {output_path}")
+        if backup:
+            self.backup()
+        Path(output_path).write_bytes(buffer.tobytes())
+        return True
+
+
 class ImageProcessor:
     """
     现代化的图像处理器，提供改进的错误处理和类型安全
@@ -62,8 +546,23 @@ class ImageProcessor:
         - 类型安全：使用枚举和类型注解
         - 错误处理：详细的异常信息
         - 备份机制：支持原图备份
+        - 单步操作都是 ImagePipeline 的简单包装；需要连续执行多步时请直接使用 ImagePipeline，
+          只解码、编码各一次
     """
     
+    @staticmethod
+    def pipeline(image_path: str) -> ImagePipeline:
+        """
+        创建以指定文件为源的处理流水线
+        
+        参数:
+            image_path: 图像文件路径
+            
+        返回:
+            ImagePipeline 实例
+        """
+        return ImagePipeline(image_path)
+    
     @staticmethod
     def get_image_dimensions(image_path: str) -> Tuple[int, int]:
         """
@@ -79,12 +578,16 @@ class ImageProcessor:
             ImageProcessingError: 当图像无法读取时
             
         说明:
-            使用OpenCV读取图像并返回其尺寸信息
+            常见格式只读取文件头，不解码像素；无法识别的格式才使用OpenCV完整读取
         """
         if not os.path.exists(image_path):
             raise ImageProcessingError(f"图像文件未找到: {image_path}")
         
         try:
+            size = probe_image_size(image_path)
+            if size is not None:
+                return size[1], size[0]
+            
             image = cv2.imread(image_path)
             if image is None:
                 raise ImageProcessingError(f"图像读取失败: {image_path}")
@@ -122,47 +625,16 @@ class ImageProcessor:
             
         说明:
             1. 支持多种对齐方式
-            2. 可选择是否备份原图
+            2. 可选择是否备份原图，目标尺寸无效时不会留下备份
             3. 自动验证目标尺寸的有效性
         """
-        if not os.path.exists(image_path):
-            raise ImageProcessingError(f"图像文件未找到: {image_path}")
-        
+        pipeline = ImagePipeline(image_path)
         try:
-            # 加载图像
-            image = cv2.imread(image_path)
-            if image is None:
-                raise ImageProcessingError(f"图像读取失败: {image_path}")
-            
-            original_height, original_width = image.shape[:2]
-            
-            # 检查目标尺寸是否有效
-            if target_width > original_width or target_height > original_height:
-                return False
-            
-            # 如果需要则创建备份
-            if backup_original:
-                backup_path = f"{image_path}.backup"
-                cv2.imwrite(backup_path, image)
-            
-            # 计算裁剪坐标
-            width_range = ImageProcessor._calculate_crop_range(
-                original_width, target_width, horizontal_align
-            )
-            height_range = ImageProcessor._calculate_crop_range(
-                original_height, target_height, vertical_align
-            )
-            
-            # 执行裁剪
-            cropped_image = image[
-                height_range[0]:height_range[1],
-                width_range[0]:width_range[1]
-            ]
-            
-            # 保存裁剪后的图像
-            cv2.imwrite(image_path, cropped_image)
+            pipeline.crop(target_width, target_height, horizontal_align, vertical_align).save(backup=backup_original)
             return True
             
+        except ImageSizeError:
+            return False
         except Exception as e:
             raise ImageProcessingError(f"裁剪图像时出错: {e}")
     
@@ -228,43 +700,9 @@ class ImageProcessor:
             2. 居中裁剪以保持主要内容
             3. 可选择是否备份原图
         """
-        if not os.path.exists(image_path):
-            raise ImageProcessingError(f"图像文件未找到: {image_path}")
-        
+        pipeline = ImagePipeline(image_path)
         try:
-            # 加载图像
-            image = cv2.imread(image_path)
-            if image is None:
-                raise ImageProcessingError(f"图像读取失败: {image_path}")
-            
-            original_height, original_width = image.shape[:2]
-            
-            # 如果需要则创建备份
-            if backup_original:
-                backup_path = f"{image_path}.backup"
-                cv2.imwrite(backup_path, image)
-            
-            # 根据纵横比计算目标尺寸
-            if original_width / original_height > aspect_width / aspect_height:
-                # 图像比目标比例更宽
-                new_width = original_height * aspect_width // aspect_height
-                new_height = original_height
-            else:
-                # 图像比目标比例更高
-                new_width = original_width
-                new_height = original_width * aspect_height // aspect_width
-            
-            # 计算居中裁剪的坐标
-            start_x = (original_width - new_width) // 2
-            end_x = start_x + new_width
-            start_y = (original_height - new_height) // 2
-            end_y = start_y + new_height
-            
-            # 执行裁剪
-            cropped_image = image[start_y:end_y, start_x:end_x]
-            
-            # Save result
-            cv2.imwrite(image_path, cropped_image)
+            pipeline.crop_to_aspect_ratio(aspect_width, aspect_height).save(backup=backup_original)
             return True
             
         except Exception as e:
@@ -285,41 +723,10 @@ class ImageProcessor:
         Raises:
             ImageProcessingError: If image processing fails
         """
-        if not os.path.exists(image_path):
-            raise ImageProcessingError(f"Image file not found: {image_path}")
-        
+        pipeline = ImagePipeline(image_path)
         try:
-            # Load image
-            image = cv2.imread(image_path)
-            if image is None:
-                raise ImageProcessingError(f"Failed to read image: {image_path}")
-            
-            original_height, original_width = image.shape[:2]
-            
-            # If already square, no processing needed
-            if original_width == original_height:
-                return True
-            
-            # Create backup if requested
-            if backup_original:
-                backup_path = f"{image_path}.backup"
-                cv2.imwrite(backup_path, image)
-            
-            # Calculate square dimensions (use smaller dimension)
-            square_size = min(original_width, original_height)
-            
-            # Calculate center-aligned crop coordinates
-            if original_width > original_height:
-                # Wider image - crop width
-                start_x = (original_width - square_size) // 2
-                cropped_image = image[:, start_x:start_x + square_size]
-            else:
-                # Taller image - crop height
-                start_y = (original_height - square_size) // 2
-                cropped_image = image[start_y:start_y + square_size, :]
-            
-            # Save result
-            cv2.imwrite(image_path, cropped_image)
+            # Already square images are left untouched: no re-encoding and no backup
+            pipeline.crop_to_square().save(only_if_changed=True, backup=backup_original)
             return True
             
         except Exception as e:
@@ -349,41 +756,9 @@ class ImageProcessor:
         Raises:
             ImageProcessingError: If image processing fails
         """
-        if not os.path.exists(image_path):
-            raise ImageProcessingError(f"Image file not found: {image_path}")
-        
+        pipeline = ImagePipeline(image_path)
         try:
-            # Load image
-            image = cv2.imread(image_path)
-            if image is None:
-                raise ImageProcessingError(f"Failed to read image: {image_path}")
-            
-            # Create backup if requested
-            if backup_original:
-                backup_path = f"{image_path}.backup"
-                cv2.imwrite(backup_path, image)
-            
-            if maintain_aspect_ratio:
-                # Calculate dimensions maintaining aspect ratio
-                original_height, original_width = image.shape[:2]
-                aspect_ratio = original_width / original_height
-                
-                if target_width / target_height > aspect_ratio:
-                    # Fit to height
-                    new_height = target_height
-                    new_width = int(target_height * aspect_ratio)
-                else:
-                    # Fit to width
-                    new_width = target_width
-                    new_height = int(target_width / aspect_ratio)
-            else:
-                new_width, new_height = target_width, target_height
-            
-            # Perform resizing
-            resized_image = cv2.resize(image, (new_width, new_height), interpolation=cv2.INTER_AREA)
-            
-            # Save result
-            cv2.imwrite(image_path, resized_image)
+            pipeline.resize(target_width, target_height, maintain_aspect_ratio).save(backup=backup_original)
             return True
             
         except Exception as e:
@@ -395,7 +770,8 @@ class ImageProcessor:
         max_width: int = 1920,
         max_height: int = 1080,
         quality: int = 85,
-        backup_original: bool = False
+        backup_original: bool = False,
+        alternate_paths: Sequence[str] = ()
     ) -> bool:
         """
         Optimize image for web usage
@@ -406,6 +782,8 @@ class ImageProcessor:
             max_height: Maximum allowed height
             quality: JPEG quality (1-100)
             backup_original: Whether to create backup of original image
+            alternate_paths: Additional copies to write, e.g. "12.webp"; the format follows
+                the extension (see supported_output_formats)
             
         Returns:
             True if optimization successful
@@ -413,47 +791,79 @@ class ImageProcessor:
         Raises:
             ImageProcessingError: If image processing fails
         """
-        if not os.path.exists(image_path):
-            raise ImageProcessingError(f"Image file not found: {image_path}")
-        
+        pipeline = ImagePipeline(image_path)
         try:
-            # Load image
-            image = cv2.imread(image_path)
-            if image is None:
-                raise ImageProcessingError(f"Failed to read image: {image_path}")
+            image = pipeline.fit_within(max_width, max_height).execute()
+            if backup_original:
+                pipeline.backup()
+            for output_path in [image_path, *alternate_paths]:
+                ImagePipeline(image=image).save(output_path, quality=quality)
+            return True
             
-            original_height, original_width = image.shape[:2]
+        except Exception as e:
+            raise ImageProcessingError(f"Error optimizing image: {e}")
+    
+    @staticmethod
+    def generate_thumbnails(image_path: str, output_paths: Dict[int, str], quality: int = 85) -> Dict[int, str]:
+        """
+        生成多个尺寸的缩略图，原图只解码一次
+        
+        参数:
+            image_path: 原图路径
+            output_paths: 缩略图边长 -> 输出路径
+            quality: 编码质量（1-100）
             
-            # Create backup if requested
-            if backup_original:
-                backup_path = f"{image_path}.backup"
-                cv2.imwrite(backup_path, image)
-            
-            # Resize if image exceeds maximum dimensions
-            if original_width > max_width or original_height > max_height:
-                aspect_ratio = original_width / original_height
-                
-                if original_width > max_width:
-                    new_width = max_width
-                    new_height = int(max_width / aspect_ratio)
-                else:
-                    new_width = original_width
-                    new_height = original_height
-                
-                if new_height > max_height:
-                    new_height = max_height
-                    new_width = int(max_height * aspect_ratio)
-                
-                image = cv2.resize(image, (new_width, new_height), interpolation=cv2.INTER_AREA)
-            
-            # Save with optimized quality
-            cv2.imwrite(
-                image_path,
-                image,
-                [cv2.IMWRITE_JPEG_QUALITY, quality]
-            )
+        返回:
+            output_paths
             
-            return True
+        异常:
+            ImageProcessingError: 当图像处理失败时
+        """
+        ImageProcessor.generate_variants(image_path, {size: [path] for size, path in output_paths.items()}, quality)
+        return output_paths
+    
+    @staticmethod
+    def generate_variants(
+        image_path: str,
+        outputs: Dict[Optional[int], Sequence[str]],
+        quality: int = 85,
+        image: Optional[np.ndarray] = None
+    ) -> Dict[Optional[int], Sequence[str]]:
+        """
+        生成多个尺寸、多种格式的衍生图，原图只解码一次
+        
+        参数:
+            image_path: 原图路径
+            outputs: 缩略图边长（None表示原尺寸） -> 输出路径列表，格式由扩展名决定（.jpg/.webp/.avif）
+            quality: 编码质量（1-100）
+            image: 已解码的原图，提供时不再读取 image_path
+            
+        返回:
+            outputs
             
+        异常:
+            ImageProcessingError: 当图像处理失败时
+            
+        说明:
+            缩略图按比例缩放到 边长x边长 的范围内，不放大小图；
+            从大到小依次生成，每一级都在上一级的结果上缩放，缩放的像素量逐级减少。
+            只生成缩略图时，大图以降分辨率模式解码
+        """
+        try:
+            if image is None:
+                pipeline = ImagePipeline(image_path)
+                if None not in outputs:
+                    largest = max(outputs)
+                    pipeline.fit_within(largest, largest)
+                image = pipeline.execute()
+            for size in sorted(outputs, key=lambda item: (item is not None, -(item or 0))):
+                if size is not None:
+                    image = ImagePipeline(image=image).fit_within(size, size).execute()
+                for output_path in outputs[size]:
+                    ImagePipeline(image=image).save(output_path, quality=quality)
+            return outputs
+            
+        except ImageProcessingError:
+            raise
         except Exception as e:
-            raise ImageProcessingError(f"Error optimizing image: {e}") 
\ No newline at end of file
+            raise ImageProcessingError(f"生成衍生图时出错: {e}")
@@ -8,6 +8,7 @@
     - base_handler: 基础处理器类
     - auth_handler: 认证处理器类
     - home_handler: 主页处理器类
+    - search_handler: 搜索处理器类
 
 兼容性说明:
     本模块同时支持新的处理器架构和旧的服务层架构，
@@ -18,10 +19,16 @@
     - 请求处理
     - 响应生成
     - 安全中间件配置
+    - 资源文件缓存头配置
 """
 
+from flask import request
+
+from core.modules.file_manager import IMMUTABLE_CACHE_CONTROL
+
 from .base_handler import BaseHandler
 from .auth_handler import AuthenticationHandler
+from .search_handler import SearchHandler
 
 # 导入旧服务层组件（兼容性导入）
 try:
@@ -179,17 +186,23 @@ def register_group_routes(app, file_manager, database_manager):
 
 def register_search_routes(app, file_manager, database_manager):
     """
-    注册搜索相关路由（兼容性包装）
+    注册搜索相关路由
     
     参数:
         app: Flask应用实例
         file_manager: 文件管理器实例
         database_manager: 数据库管理器实例
+        
+    说明:
+        搜索页面仍由旧服务层提供，综合搜索接口使用新的处理器架构注册
     """
     try:
         searchResponse(app, file_manager, database_manager)
     except Exception as e:
         print(f"警告: 搜索路由注册失败: {e}")
+    
+    search_handler = SearchHandler(database_manager, file_manager)
+    search_handler.register_routes(app)
 
 
 def register_message_routes(app, file_manager, database_manager):
@@ -223,10 +236,30 @@ def configure_security_middleware(app):
         print(f"警告: 安全中间件配置失败: {e}")
 
 
+def configure_asset_caching(app, file_manager):
+    """
+    配置资源文件的HTTP缓存头
+    
+    参数:
+        app: Flask应用实例
+        file_manager: 文件管理器实例
+        
+    说明:
+        带版本号的资源文件（如头像、封面）内容永不改变，替换图片时会生成新文件名，
+        因此使用一年期的 immutable 缓存，浏览器无需再向nginx/Flask发起验证请求
+    """
+    @app.after_request
+    def set_asset_cache_headers(response):
+        if response.status_code in (200, 304) and file_manager.is_immutable_asset_path(request.path):
+            response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+        return response
+
+
 # 定义包的公共API
 __all__ = [
     'BaseHandler',           # 基础处理器类
     'AuthenticationHandler', # 认证处理器类
+    'SearchHandler',         # 搜索处理器类
     'register_authentication_routes',  # 注册认证路由
     'register_book_routes',           # 注册图书路由
     'register_chat_routes',           # 注册聊天路由
@@ -238,5 +271,6 @@ __all__ = [
     'register_group_routes',          # 注册群组路由
     'register_search_routes',         # 注册搜索路由
     'register_message_routes',        # 注册消息路由
-    'configure_security_middleware'   # 配置安全中间件
+    'configure_security_middleware',  # 配置安全中间件
+    'configure_asset_caching'         # 配置资源文件缓存头
 ] 
\ No newline at end of file
@@ -11,7 +11,7 @@
     - 消息闪现
     - 模板渲染
     - 数据库操作异常处理
-    - 分页参数处理
+    - 分页参数处理（页码分页与游标分页）
 
 依赖:
     - flask: Web框架
@@ -26,6 +26,9 @@ from functools import wraps
 from core.data import DatabaseManager, UserData
 from core.modules.file_manager import FileSystemManager
 
+# 页头头像的展示边长（像素，按高分屏的两倍取值）
+HEADER_AVATAR_SIZE = 96
+
 
 class HandlerError(Exception):
     """处理器相关的自定义异常类"""
@@ -214,15 +217,39 @@ class BaseHandler:
             渲染后的HTML字符串
             
         说明:
-            自动添加当前用户信息和认证状态到模板上下文
+            自动添加当前用户信息和认证状态到模板上下文；页头模板使用的 login_user 带有本次解析的头像路径
         """
+        current_user = self.get_current_user()
         context = {
-            'current_user': self.get_current_user(),
+            'current_user': current_user,
+            'login_user': self._with_header_avatar(current_user),
             'is_authenticated': self.is_authenticated(),
             **kwargs
         }
         return render_template(template, **context)
     
+    def _with_header_avatar(self, user_data: Optional[UserData]) -> Optional[Dict[str, Any]]:
+        """
+        为用户数据添加页头头像路径
+        
+        参数:
+            user_data: 会话中的用户数据
+            
+        返回:
+            带 profile_photo 的用户数据副本，未登录时返回None
+            
+        说明:
+            头像文件名带版本号，更换头像后旧路径即失效，因此每次渲染时从资源索引解析，而不是保存在会话中。
+            页头只显示小头像，使用缩略图，并按浏览器支持选择WebP/AVIF
+        """
+        if not user_data:
+            return None
+        user_data_with_photo = dict(user_data)
+        user_data_with_photo["profile_photo"] = self.file_manager.get_profile_photo_path(
+            user_data["id"], size=HEADER_AVATAR_SIZE, accept=request.headers.get("Accept")
+        )
+        return user_data_with_photo
+    
     def login_user(self, user_data: UserData) -> None:
         """
         登录用户并设置会话数据
@@ -231,12 +258,9 @@ class BaseHandler:
             user_data: 要存储在会话中的用户数据
             
         说明:
-            自动添加用户头像路径到用户数据中
+            头像路径不保存在会话中，渲染页面时再解析（见 render_with_user_context）
         """
-        user_data_with_photo = user_data.copy()
-        user_data_with_photo["profile_photo"] = self.file_manager.get_profile_photo_path(user_data["id"])
-        
-        session["login_user"] = user_data_with_photo
+        session["login_user"] = user_data.copy()
     
     def logout_user(self) -> None:
         """注销当前用户，清除会话数据"""
@@ -0,0 +1,182 @@
+"""
+搜索处理器模块
+============
+
+本模块负责处理综合搜索请求，一次查询同时返回用户、图书、书评和小组的搜索结果。
+
+主要功能:
+    - 综合搜索（各类别并发查询）
+    - 每类结果条数控制
+    - 书籍搜索框输入联想
+
+依赖:
+    - flask: Web框架
+    - core.data: 数据库管理
+    - core.modules.file_manager: 文件系统管理
+"""
+
+from typing import Any, Dict, List
+from flask import Flask, request
+
+from core.data import DatabaseManager
+from core.modules.file_manager import FileSystemManager
+from .base_handler import BaseHandler
+
+# 请求参数名 -> 搜索类别
+LIMIT_ARGUMENTS = {
+    'user_limit': 'User',
+    'book_limit': 'Book',
+    'journal_limit': 'Journal',
+    'group_limit': 'Group'
+}
+
+# 单个类别最多返回的结果条数
+MAX_RESULT_LIMIT = 50
+
+# 搜索结果中公开的用户字段（邮箱、电话等联系方式不返回）
+PUBLIC_USER_FIELDS = ('id', 'account', 'signature')
+
+# 输入联想默认及最多返回的条数
+DEFAULT_SUGGESTION_LIMIT = 8
+MAX_SUGGESTION_LIMIT = 20
+
+
+class SearchHandler(BaseHandler):
+    """
+    综合搜索相关操作的处理器类
+
+    主要职责:
+        1. 解析搜索关键词与每类结果条数
+        2. 调用数据层的并发综合搜索
+        3. 提供书籍输入联想
+
+    继承:
+        BaseHandler: 继承基础处理器的通用功能
+    """
+
+    def __init__(self, database_manager: DatabaseManager, file_manager: FileSystemManager):
+        """
+        初始化搜索处理器
+
+        参数:
+            database_manager: 数据库管理器实例
+            file_manager: 文件管理器实例
+        """
+        super().__init__(database_manager, file_manager)
+
+    def register_routes(self, app: Flask) -> None:
+        """
+        注册搜索相关的路由到Flask应用
+
+        参数:
+            app: Flask应用实例
+
+        路由列表:
+            - /search/all: 综合搜索，返回JSON
+            - /search/suggest: 书籍输入联想，返回JSON
+        """
+
+        @app.route("/search/all")
+        @self.require_authentication
+        def search_all() -> Any:
+            """
+            综合搜索路由
+
+            查询参数:
+                keyword: 搜索关键词
+                user_limit/book_limit/journal_limit/group_limit: 每类结果条数，0表示不搜索该类
+
+            返回:
+                搜索结果的JSON响应
+            """
+            return self._handle_search_all()
+
+        @app.route("/search/suggest")
+        @self.require_authentication
+        def search_suggest() -> Any:
+            """
+            书籍输入联想路由
+
+            查询参数:
+                q: 已输入的文字
+                limit: 联想条数
+
+            返回:
+                联想结果的JSON响应
+            """
+            return self._handle_search_suggest()
+
+    def _get_result_limits(self) -> Dict[str, int]:
+        """
+        从请求参数获取每类结果条数
+
+        返回:
+            类别名到结果条数的字典，未指定或无效的类别使用默认条数
+        """
+        limits = {}
+        for argument, entity in LIMIT_ARGUMENTS.items():
+            try:
+                limits[entity] = max(0, min(MAX_RESULT_LIMIT, int(request.args[argument])))
+            except (KeyError, ValueError, TypeError):
+                continue
+        return limits
+
+    def _to_public_users(self, users: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        将用户搜索结果裁剪为公开字段并附上头像
+
+        参数:
+            users: 数据层返回的用户数据列表
+
+        返回:
+            只含公开字段及 profile_photo 的用户列表
+        """
+        photos = self.file_manager.get_profile_photo_paths([user['id'] for user in users])
+        return [
+            {**{field: user.get(field) for field in PUBLIC_USER_FIELDS}, 'profile_photo': photos[user['id']]}
+            for user in users
+        ]
+
+    def _handle_search_all(self) -> Dict[str, Any]:
+        """
+        处理综合搜索请求
+
+        返回:
+            包含各类搜索结果的字典
+        """
+        keyword = request.args.get('keyword', '').strip()
+        if not keyword:
+            return {'status': 'error', 'message': '请输入搜索关键词'}
+
+        try:
+            results = self.db.search(keyword, self._get_result_limits())
+            results['User'] = self._to_public_users(results['User'])
+            return {'status': 'success', 'data': results}
+
+        except Exception as e:
+            self.handle_database_error(e)
+            return {'status': 'error', 'message': '搜索失败，请稍后重试'}
+
+    def _handle_search_suggest(self) -> Dict[str, Any]:
+        """
+        处理书籍输入联想请求
+
+        返回:
+            包含联想书籍列表的字典
+        """
+        prefix = request.args.get('q', '').strip()
+        try:
+            limit = max(1, min(MAX_SUGGESTION_LIMIT, int(request.args.get('limit', DEFAULT_SUGGESTION_LIMIT))))
+        except (ValueError, TypeError):
+            limit = DEFAULT_SUGGESTION_LIMIT
+
+        if not prefix:
+            return {'status': 'success', 'data': []}
+
+        try:
+            return {'status': 'success', 'data': self.db.suggest_books(prefix, limit)}
+
+        except Exception as e:
+            # 每次按键都会请求，不闪现错误消息
+            print(f"Database error: {e}")
+            return {'status': 'error', 'message': '获取联想结果失败'}
@@ -7,22 +7,44 @@
 主要功能:
     - 文件存储和检索
     - 资源类型管理
-    - 路径解析和验证
+    - 路径解析和验证（基于内存中的资源索引，无需每次扫描目录）
+    - 多尺寸缩略图及WebP/AVIF格式衍生图的生成与解析（按浏览器Accept头选择格式）
+    - 上传图片的后台处理
     - 目录结构维护
 
 依赖:
     - os: 操作系统接口
     - pathlib: 路径处理
+    - threading: 资源索引的并发保护与后台轮询
     - core.config: 配置管理
+    - core.modules.image_processor: 缩略图及衍生格式生成
+    - core.modules.image_tasks: 图像处理进程池
 """
 
+import hashlib
 import os
+import re
+import threading
+import time
+from concurrent.futures import Future
 from enum import Enum
 from pathlib import Path
-from typing import Tuple, Optional
+from typing import Tuple, Optional, Dict, Union, Iterable, Iterator, Set, List, Sequence, Any
 from os import remove
 
 from core.config.settings import config_manager
+from .image_processor import ImageProcessor, ImageProcessingError, supported_output_formats
+from .image_tasks import ImageTaskQueue, ImageOperation, generate_variant_files, process_upload
+
+# 带版本号的资源文件名，如 "12.17c0b2d9a4e3f000.jpg"，及其衍生图 "12.17c0b2d9a4e3f000@96.webp"；
+# 内容变化时文件名随之变化，可被浏览器永久缓存
+VERSIONED_FILE_PATTERN = re.compile(r"^\d+\.[0-9a-f]{12,}(@(\d+|full))?\.[A-Za-z0-9]+$")
+
+# 分片子目录名（两位十六进制）
+SHARD_DIRECTORY_PATTERN = re.compile(r"^[0-9a-f]{2}$")
+
+# 带版本号资源的HTTP缓存头
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
 
 
 class FileTypeError(Exception):
@@ -56,6 +78,34 @@ class AssetType(Enum):
     ERROR_IMAGE = "errorImage"
 
 
+# 按ID分片存放的资源类型（错误提示图数量很少，保持平铺）
+SHARDED_ASSET_TYPES = (AssetType.BOOK_COVER, AssetType.JOURNAL_HEADER, AssetType.PROFILE_PHOTO, AssetType.GROUP_ICON)
+
+# 生成缩略图的资源类型（日志头图按原尺寸展示）
+THUMBNAIL_ASSET_TYPES = (AssetType.PROFILE_PHOTO, AssetType.BOOK_COVER, AssetType.GROUP_ICON)
+
+# 生成WebP/AVIF衍生格式的资源类型
+ALTERNATE_FORMAT_ASSET_TYPES = SHARDED_ASSET_TYPES
+
+# 衍生图文件名中原图与尺寸的分隔符，如 "12.17c0b2d9a4e3f000@96.jpg"、"12.17c0b2d9a4e3f000@full.webp"
+VARIANT_SEPARATOR = "@"
+
+# 原尺寸衍生图的尺寸标记
+FULL_SIZE_LABEL = "full"
+
+# 等待后台处理的上传原始文件的尺寸标记，如 "12.17c0b2d9a4e3f000@upload"
+UPLOAD_LABEL = "upload"
+
+# 已生成路径但一直没有写入文件的资源（如上传失败的请求）等待的最长秒数，之后不再等待
+PENDING_ASSET_TIMEOUT = 600
+
+# 被新文件取代的旧资源文件，在新文件出现该秒数后由扫描删除（仍引用旧路径的页面有时间加载完）
+SUPERSEDED_ASSET_GRACE = 300
+
+# 衍生格式对应的MIME类型，用于匹配请求的Accept头
+FORMAT_MIME_TYPES = {".avif": "image/avif", ".webp": "image/webp"}
+
+
 class FileSystemManager:
     """
     现代化的文件系统管理器，提供改进的错误处理和类型安全
@@ -70,6 +120,23 @@ class FileSystemManager:
         - 类型安全：使用枚举限制资源类型
         - 错误处理：提供详细的异常信息
         - 路径管理：统一处理相对和绝对路径
+        - 资源索引：每种资源类型维护 ID -> 文件名 的字典，查找路径只需一次字典访问
+        - 版本化文件名：新生成的资源文件名带版本号（{id}.{版本}.jpg），替换图片即得到新URL，
+          因此可以使用一年期的 immutable 缓存头
+        - 分片目录：开启 AssetSharding 后新文件按ID哈希存放到两级子目录（如 profilePhoto/ab/cd/12.jpg），
+          避免单个目录中文件过多；平铺与分片两种布局的文件都能被解析，便于在线迁移
+        - 衍生图：头像、封面和群组图标按 ThumbnailSizes 生成多个尺寸的缩略图，原图及缩略图再按
+          AlternateFormats 生成WebP/AVIF格式，与原图存放在同一目录；文件名由原图文件名加尺寸构成
+          （12.17c0b2d9a4e3f000@96.jpg、12.17c0b2d9a4e3f000@full.avif），原图替换后衍生图自然失效。
+          解析路径时按请求的Accept头选择浏览器支持的最小格式，不支持时仍使用原格式
+        
+    索引维护:
+        - 启动时扫描一次各资源目录
+        - generate_*_path 与 delete_* 方法同步更新索引
+        - 其他进程（如uWSGI的其他worker）写入的文件由后台轮询发现：
+          定期检查各资源目录及其分片子目录的修改时间，有变化时重新扫描该目录；
+          解析路径只查询索引，不访问文件系统
+        - 同一ID的旧文件由替换它的进程删除；该进程未能删除的（如进程退出）由扫描在宽限期后删除
     """
     
     def __init__(self):
@@ -84,6 +151,36 @@ class FileSystemManager:
         self._project_root: Path = Path(os.getcwd())
         self._static_directory: Path = self._get_static_directory()
         self._validate_storage_structure()
+        
+        # 资源索引: 资源类型 -> {文件名主干(即ID): 文件名}
+        self._asset_index: Dict[AssetType, Dict[str, str]] = {}
+        self._directory_mtimes: Dict[AssetType, float] = {}
+        # 已生成路径但文件尚未写入的资源: (资源类型, ID) -> (新文件名, 原文件名, 生成时间)
+        self._pending_assets: Dict[Tuple[AssetType, str], Tuple[str, Optional[str], float]] = {}
+        self._index_lock = threading.Lock()
+        path_config = config_manager.get_config("Path")
+        self._refresh_interval: float = path_config.get("AssetIndexRefresh", 2)
+        self._sharding: bool = path_config.get("AssetSharding", False)
+        # 分片子目录的修改时间: 资源类型 -> {分片子目录(如 "ab/cd"): 修改时间}
+        self._shard_mtimes: Dict[AssetType, Dict[str, float]] = {}
+        self._poller_pid: Optional[int] = None
+        # 缩略图边长（升序）、衍生格式（按优先级，仅保留OpenCV能编码的）
+        self._thumbnail_sizes: Tuple[int, ...] = tuple(sorted(path_config.get("ThumbnailSizes", [48, 96, 256])))
+        self._thumbnail_quality: int = path_config.get("ThumbnailQuality", 85)
+        self._alternate_formats: Tuple[str, ...] = tuple(
+            f".{item.lower().lstrip('.')}" for item in path_config.get("AlternateFormats", ["avif", "webp"])
+            if f".{item.lower().lstrip('.')}" in supported_output_formats()
+        )
+        # 已存在的衍生图: 资源类型 -> {相对资源目录的文件名}
+        self._variants: Dict[AssetType, Set[str]] = {}
+        # 生成失败的原图，本进程内不再重试: (资源类型, 原图文件名)
+        self._failed_variants: Set[Tuple[AssetType, str]] = set()
+        # 已提交、尚未完成的衍生图生成任务: (资源类型, 原图文件名)
+        self._variant_jobs: Set[Tuple[AssetType, str]] = set()
+        # 上传图片的后台处理队列（进程池在第一次提交时创建）
+        self._task_queue = ImageTaskQueue(path_config.get("ImageWorkers", 2))
+        for asset_type in AssetType:
+            self._scan_asset_directory(asset_type)
     
     def _get_static_directory(self) -> Path:
         """
@@ -120,56 +217,958 @@ class FileSystemManager:
                 # 创建缺失的目录
                 asset_dir.mkdir(parents=True, exist_ok=True)
     
+    def _scan_asset_directory(self, asset_type: AssetType) -> None:
+        """
+        扫描资源目录，重建该资源类型的索引
+        
+        参数:
+            asset_type: 资源类型
+            
+        异常:
+            FileTypeError: 当资源目录不存在时
+        """
+        asset_directory: Path = self._static_directory / asset_type.value
+        
+        try:
+            mtime = asset_directory.stat().st_mtime
+            index: Dict[str, str] = {}
+            file_mtimes: Dict[str, float] = {}
+            variants: Set[str] = set()
+            superseded: List[str] = []
+            shard_mtimes: Dict[str, float] = {}
+            self._collect_asset_files(
+                self._iter_asset_files(asset_directory, shard_mtimes), index, file_mtimes, variants, superseded
+            )
+        except FileNotFoundError:
+            raise FileTypeError(f"资源目录未找到: {asset_directory}")
+        
+        with self._index_lock:
+            self._asset_index[asset_type] = index
+            self._variants[asset_type] = variants
+            self._directory_mtimes[asset_type] = mtime
+            self._shard_mtimes[asset_type] = shard_mtimes
+        
+        self._remove_superseded_assets(asset_type, index, file_mtimes, superseded)
+    
+    @staticmethod
+    def _collect_asset_files(
+        files: Iterable[Tuple[str, os.DirEntry]],
+        index: Dict[str, str],
+        file_mtimes: Dict[str, float],
+        variants: Set[str],
+        superseded: List[str]
+    ) -> None:
+        """
+        将目录中的文件归入资源索引
+        
+        参数:
+            files: (相对资源目录的文件名, 目录项) 的迭代器
+            index: 收集 ID -> 文件名
+            file_mtimes: 收集 ID -> 索引中文件的修改时间
+            variants: 收集衍生图文件名
+            superseded: 收集被同一ID较新文件取代的文件名
+        """
+        for file_name, entry in files:
+            if VARIANT_SEPARATOR in entry.name:
+                # 衍生图（及其写入中的临时文件）不是独立的资源
+                variants.add(file_name)
+                continue
+            stem = entry.name.split(".", 1)[0]
+            # 同一ID存在多个文件（如旧的.png与新生成的.jpg）时保留最近修改的
+            file_mtime = entry.stat().st_mtime
+            existing = index.get(stem)
+            if existing is None or file_mtime > file_mtimes[stem]:
+                if existing is not None:
+                    superseded.append(existing)
+                index[stem] = file_name
+                file_mtimes[stem] = file_mtime
+            else:
+                superseded.append(file_name)
+    
+    def _remove_superseded_assets(
+        self, asset_type: AssetType, index: Dict[str, str], file_mtimes: Dict[str, float], superseded: List[str]
+    ) -> None:
+        """
+        删除扫描中发现的被取代的旧文件
+        
+        参数:
+            asset_type: 资源类型
+            index: 扫描得到的 ID -> 文件名
+            file_mtimes: 扫描得到的 ID -> 索引中文件的修改时间
+            superseded: 被取代的文件名
+            
+        说明:
+            只清理被本管理器生成的带版本号文件取代、且已过宽限期的旧文件
+        """
+        now = time.time()
+        for file_name in superseded:
+            stem = file_name.rsplit("/", 1)[-1].split(".", 1)[0]
+            if (
+                VERSIONED_FILE_PATTERN.match(index[stem].rsplit("/", 1)[-1])
+                and now - file_mtimes[stem] >= SUPERSEDED_ASSET_GRACE
+                and (asset_type, stem) not in self._pending_assets
+            ):
+                self._remove_superseded_asset(asset_type, file_name)
+    
+    def _remove_superseded_asset(self, asset_type: AssetType, file_name: str) -> None:
+        """
+        删除被同一ID的新文件取代的旧资源文件及其衍生图
+        
+        参数:
+            asset_type: 资源类型
+            file_name: 旧文件名
+        """
+        try:
+            remove(self._static_directory / asset_type.value / file_name)
+        except OSError:
+            # 可能已被其他进程删除
+            return
+        self._remove_variants(asset_type, file_name)
+    
+    @staticmethod
+    def _iter_asset_files(
+        asset_directory: Path, shard_mtimes: Optional[Dict[str, float]] = None
+    ) -> Iterator[Tuple[str, os.DirEntry]]:
+        """
+        遍历资源目录中平铺及分片存放的文件
+        
+        参数:
+            asset_directory: 资源目录
+            shard_mtimes: 指定时记录每个分片子目录（如 "ab/cd"）的修改时间
+            
+        返回:
+            (相对资源目录的文件名, 目录项) 的迭代器，如 ("12.jpg", ...) 或 ("ab/cd/12.jpg", ...)
+        """
+        with os.scandir(asset_directory) as entries:
+            for entry in entries:
+                if entry.is_file():
+                    yield entry.name, entry
+                elif entry.is_dir() and SHARD_DIRECTORY_PATTERN.match(entry.name):
+                    with os.scandir(entry.path) as shard_entries:
+                        for shard_entry in shard_entries:
+                            if shard_entry.is_dir() and SHARD_DIRECTORY_PATTERN.match(shard_entry.name):
+                                shard = f"{entry.name}/{shard_entry.name}"
+                                if shard_mtimes is not None:
+                                    # 先记录修改时间再列出文件，之后的变化一定会被下一次轮询发现
+                                    shard_mtimes[shard] = shard_entry.stat().st_mtime
+                                yield from FileSystemManager._iter_shard_files(asset_directory, shard)
+    
+    @staticmethod
+    def _iter_shard_files(asset_directory: Path, shard: str) -> Iterator[Tuple[str, os.DirEntry]]:
+        """
+        遍历一个分片子目录中的文件
+        
+        参数:
+            asset_directory: 资源目录
+            shard: 分片子目录，如 "ab/cd"
+            
+        返回:
+            (相对资源目录的文件名, 目录项) 的迭代器；目录不存在时为空
+        """
+        try:
+            with os.scandir(asset_directory / shard) as files:
+                for file in files:
+                    if file.is_file():
+                        yield f"{shard}/{file.name}", file
+        except FileNotFoundError:
+            return
+    
+    @staticmethod
+    def _shard_directory(asset_id: Union[int, str]) -> str:
+        """
+        获取资源ID所在的分片子目录
+        
+        参数:
+            asset_id: 资源ID
+            
+        返回:
+            两级分片子目录，如 "ab/cd"（取ID的MD5前四位，使文件均匀分布）
+        """
+        digest = hashlib.md5(str(asset_id).encode("utf-8")).hexdigest()
+        return f"{digest[:2]}/{digest[2:4]}"
+    
+    @staticmethod
+    def _list_shard_mtimes(asset_directory: Path) -> Dict[str, float]:
+        """
+        获取资源目录下所有分片子目录的修改时间
+        
+        参数:
+            asset_directory: 资源目录
+            
+        返回:
+            分片子目录（如 "ab/cd"） -> 修改时间
+        """
+        shard_mtimes: Dict[str, float] = {}
+        with os.scandir(asset_directory) as entries:
+            for entry in entries:
+                if entry.is_dir() and SHARD_DIRECTORY_PATTERN.match(entry.name):
+                    with os.scandir(entry.path) as shard_entries:
+                        for shard_entry in shard_entries:
+                            if shard_entry.is_dir() and SHARD_DIRECTORY_PATTERN.match(shard_entry.name):
+                                shard_mtimes[f"{entry.name}/{shard_entry.name}"] = shard_entry.stat().st_mtime
+        return shard_mtimes
+    
+    def _poll_shard_directories(self, asset_type: AssetType) -> None:
+        """
+        检查分片子目录的修改时间，重新扫描有变化的分片子目录
+        
+        参数:
+            asset_type: 资源类型
+            
+        说明:
+            分片目录中的变化不会改变资源目录本身的修改时间，因此单独检查每个分片子目录；
+            每轮的开销是每个已存在的分片子目录一次stat，与资源文件数无关
+        """
+        asset_directory = self._static_directory / asset_type.value
+        known = self._shard_mtimes.get(asset_type, {})
+        current = self._list_shard_mtimes(asset_directory)
+        changed = [shard for shard, mtime in current.items() if known.get(shard) != mtime]
+        changed.extend(shard for shard in known if shard not in current)
+        if not changed:
+            return
+        
+        index_part: Dict[str, str] = {}
+        file_mtimes: Dict[str, float] = {}
+        variants_part: Set[str] = set()
+        superseded: List[str] = []
+        for shard in changed:
+            self._collect_asset_files(
+                self._iter_shard_files(asset_directory, shard), index_part, file_mtimes, variants_part, superseded
+            )
+        
+        # 分片子目录前缀形如 "ab/cd/"
+        prefixes = {f"{shard}/" for shard in changed}
+        prefix_length = len(next(iter(prefixes)))
+        with self._index_lock:
+            index = self._asset_index.setdefault(asset_type, {})
+            for stem, file_name in list(index.items()):
+                if file_name[:prefix_length] in prefixes and stem not in index_part:
+                    del index[stem]
+            index.update(index_part)
+            self._variants[asset_type] = {
+                variant_name for variant_name in self._variants.get(asset_type, set())
+                if variant_name[:prefix_length] not in prefixes
+            } | variants_part
+            shard_mtimes = self._shard_mtimes.setdefault(asset_type, {})
+            for shard in changed:
+                if shard in current:
+                    shard_mtimes[shard] = current[shard]
+                else:
+                    shard_mtimes.pop(shard, None)
+        
+        self._remove_superseded_assets(asset_type, index_part, file_mtimes, superseded)
+    
+    def _ensure_index_poller(self) -> None:
+        """
+        启动后台轮询线程（按进程启动，保证预fork的每个worker都有自己的轮询线程）
+        
+        说明:
+            AssetIndexRefresh 配置为0时不轮询，仅依赖本进程的 generate/delete 更新索引
+        """
+        if self._refresh_interval <= 0 or self._poller_pid == os.getpid():
+            return
+        
+        with self._index_lock:
+            if self._poller_pid == os.getpid():
+                return
+            self._poller_pid = os.getpid()
+        
+        threading.Thread(target=self._poll_asset_directories, name="asset-index-poller", daemon=True).start()
+    
+    def _poll_asset_directories(self) -> None:
+        """定期检查资源目录及其分片子目录的修改时间，内容变化时重新扫描"""
+        while True:
+            time.sleep(self._refresh_interval)
+            for asset_type in AssetType:
+                try:
+                    mtime = (self._static_directory / asset_type.value).stat().st_mtime
+                    if mtime != self._directory_mtimes.get(asset_type):
+                        self._scan_asset_directory(asset_type)
+                    elif asset_type in SHARDED_ASSET_TYPES:
+                        self._poll_shard_directories(asset_type)
+                except Exception as e:
+                    print(f"资源索引刷新失败 ({asset_type.value}): {e}")
+    
+    def _index_asset(self, asset_type: AssetType, asset_id: Union[int, str], file_name: Optional[str]) -> None:
+        """
+        更新资源索引中的一项
+        
+        参数:
+            asset_type: 资源类型
+            asset_id: 资源ID
+            file_name: 文件名，为None时从索引中移除
+        """
+        with self._index_lock:
+            index = self._asset_index.setdefault(asset_type, {})
+            if file_name is None:
+                index.pop(str(asset_id), None)
+            else:
+                index[str(asset_id)] = file_name
+    
     def _resolve_file_paths(
         self, 
         asset_type: AssetType, 
-        pattern: Optional[str] = None, 
-        use_default: bool = False
+        asset_id: Optional[Union[int, str]] = None, 
+        use_default: bool = False,
+        size: Optional[int] = None,
+        accept: Optional[str] = None
     ) -> Tuple[str, str]:
         """
-        解析指定资源类型和模式的文件路径
+        从资源索引解析指定资源类型和ID的文件路径
         
         参数:
             asset_type: 资源类型
-            pattern: 文件名模式（如 "1.*" 匹配 "1.jpg"）
+            asset_id: 资源ID（对应文件名主干，如 1 对应 "1.jpg"）
             use_default: 是否在未找到文件时返回默认文件
+            size: 展示边长（像素），指定时解析到不小于该边长的最小缩略图
+            accept: 请求的Accept头，指定时解析到浏览器支持的衍生格式
             
         返回:
             (绝对路径, 相对路径) 的元组
+        """
+        self._ensure_index_poller()
+        
+        index = self._asset_index.get(asset_type, {})
+        file_name = index.get(str(asset_id)) if asset_id is not None else None
+        if (asset_type, str(asset_id)) in self._pending_assets:
+            file_name = self._confirm_generated_asset(asset_type, str(asset_id))
+        
+        # 如果未找到文件且启用默认值，则使用默认文件
+        if file_name is None and use_default and index.get("default") == "default.webp":
+            file_name = "default.webp"
+        
+        if file_name is None:
+            return "", ""
+        
+        if size is not None or accept:
+            file_name = self._resolve_variant(asset_type, file_name, size, accept)
+        
+        absolute_path = (self._static_directory / asset_type.value / file_name).as_posix()
+        relative_path = absolute_path.replace(self._project_root.as_posix(), "")
+        return absolute_path, relative_path
+    
+    @staticmethod
+    def _variant_name(file_name: str, size: Optional[int], extension: Optional[str] = None) -> str:
+        """
+        获取衍生图文件名
+        
+        参数:
+            file_name: 原图文件名，如 "ab/cd/12.17c0b2d9a4e3f000.jpg"
+            size: 缩略图边长，None表示原尺寸
+            extension: 衍生格式的扩展名，如 ".webp"，None表示与原图相同
             
-        异常:
-            FileTypeError: 当资源目录不存在时
+        返回:
+            衍生图文件名，如 "ab/cd/12.17c0b2d9a4e3f000@96.webp"
         """
-        asset_directory: Path = self._static_directory / asset_type.value
+        base, dot, original_extension = file_name.rpartition(".")
+        if not dot:
+            base, original_extension = file_name, ""
+        label = FULL_SIZE_LABEL if size is None else str(size)
+        extension = extension or (f".{original_extension}" if original_extension else "")
+        return f"{base}{VARIANT_SEPARATOR}{label}{extension}"
+    
+    def _variant_names(self, asset_type: AssetType, file_name: str) -> Dict[Optional[int], Dict[str, str]]:
+        """
+        获取原图的所有衍生图文件名
         
-        if not asset_directory.exists():
-            raise FileTypeError(f"资源目录未找到: {asset_directory}")
+        参数:
+            asset_type: 资源类型
+            file_name: 原图文件名
+            
+        返回:
+            尺寸（None表示原尺寸） -> {扩展名: 衍生图文件名}
+        """
+        original_extension = Path(file_name).suffix.lower()
+        formats = [
+            extension for extension in self._alternate_formats
+            if asset_type in ALTERNATE_FORMAT_ASSET_TYPES and extension != original_extension
+        ]
+        names: Dict[Optional[int], Dict[str, str]] = {}
+        if formats:
+            names[None] = {extension: self._variant_name(file_name, None, extension) for extension in formats}
+        if asset_type in THUMBNAIL_ASSET_TYPES:
+            for size in self._thumbnail_sizes:
+                names[size] = {
+                    extension: self._variant_name(file_name, size, extension)
+                    for extension in [original_extension] + formats
+                }
+        return names
+    
+    def _accepted_formats(self, accept: Optional[str]) -> Tuple[str, ...]:
+        """
+        从Accept头获取浏览器明确支持的衍生格式
         
-        absolute_path = ""
-        relative_path = ""
+        参数:
+            accept: 请求的Accept头，如 "image/avif,image/webp,*/*;q=0.8"
+            
+        返回:
+            按优先级排列的扩展名；通配符 */* 不代表支持新格式
+        """
+        if not accept:
+            return ()
+        accepted = set()
+        for item in accept.lower().split(","):
+            mime_type, *parameters = [part.strip() for part in item.split(";")]
+            quality = 1.0
+            for parameter in parameters:
+                key, _, value = parameter.partition("=")
+                if key.strip() == "q":
+                    try:
+                        quality = float(value)
+                    except ValueError:
+                        quality = 0.0
+            if quality > 0:
+                accepted.add(mime_type)
+        return tuple(extension for extension in self._alternate_formats if FORMAT_MIME_TYPES.get(extension) in accepted)
+    
+    def _resolve_variant(self, asset_type: AssetType, file_name: str, size: Optional[int], accept: Optional[str]) -> str:
+        """
+        解析原图对应尺寸和格式的衍生图
         
-        # 尝试查找匹配模式的文件
-        if pattern:
-            matching_files = list(asset_directory.glob(pattern))
-            if matching_files:
-                absolute_path = matching_files[0].as_posix()
-                relative_path = absolute_path.replace(self._project_root.as_posix(), "")
+        参数:
+            asset_type: 资源类型
+            file_name: 原图文件名
+            size: 展示边长，None表示原尺寸
+            accept: 请求的Accept头
+            
+        返回:
+            衍生图文件名；没有合适的衍生图，或衍生图尚未生成时返回原图文件名
+            
+        说明:
+            尺寸取不小于 size 的最小缩略图，超过最大缩略图边长时取原尺寸；
+            格式按 AlternateFormats 的优先级取浏览器支持的第一个。
+            衍生图尚未生成时提交到后台任务队列生成，本次请求先使用原图，不在请求内解码图片
+        """
+        names = self._variant_names(asset_type, file_name)
+        thumbnail_size = None
+        if size is not None and asset_type in THUMBNAIL_ASSET_TYPES:
+            thumbnail_size = next((item for item in self._thumbnail_sizes if item >= size), None)
+        candidates = names.get(thumbnail_size, {})
         
-        # 如果未找到文件且启用默认值，则使用默认文件
-        if not absolute_path and use_default:
-            default_file = asset_directory / "default.webp"
-            if default_file.exists():
-                absolute_path = default_file.as_posix()
-                relative_path = absolute_path.replace(self._project_root.as_posix(), "")
+        extension = next((item for item in self._accepted_formats(accept) if item in candidates), None)
+        if extension is None:
+            extension = Path(file_name).suffix.lower()
+        variant_name = candidates.get(extension)
+        if variant_name is None:
+            return file_name
+        
+        if variant_name in self._variants.get(asset_type, ()):
+            return variant_name
+        self._schedule_variants(asset_type, file_name)
+        return file_name
+    
+    def _variant_outputs(self, asset_type: AssetType, file_name: str) -> Dict[Optional[int], List[str]]:
+        """
+        获取原图所有衍生图的绝对路径
+        
+        参数:
+            asset_type: 资源类型
+            file_name: 原图文件名
+            
+        返回:
+            尺寸（None表示原尺寸） -> 衍生图绝对路径列表，见 ImageProcessor.generate_variants
+        """
+        asset_directory = self._static_directory / asset_type.value
+        return {
+            size: [(asset_directory / variant_name).as_posix() for variant_name in variants.values()]
+            for size, variants in self._variant_names(asset_type, file_name).items()
+        }
+    
+    def _schedule_variants(self, asset_type: AssetType, file_name: str) -> None:
+        """
+        提交原图的衍生图生成任务
+        
+        参数:
+            asset_type: 资源类型
+            file_name: 原图文件名
+            
+        说明:
+            同一原图同时只提交一个任务；生成失败的原图在本进程内不再重试
+        """
+        key = (asset_type, file_name)
+        with self._index_lock:
+            if key in self._failed_variants or key in self._variant_jobs:
+                return
+            self._variant_jobs.add(key)
         
+        source_path = (self._static_directory / asset_type.value / file_name).as_posix()
+        try:
+            self._task_queue.submit(
+                generate_variant_files, source_path, self._variant_outputs(asset_type, file_name),
+                self._thumbnail_quality,
+                callback=lambda future: self._finish_variants(asset_type, file_name, future)
+            )
+        except Exception as e:
+            # 如进程池已关闭，下一次解析时重试
+            print(f"衍生图任务提交失败 ({asset_type.value}/{file_name}): {e}")
+            with self._index_lock:
+                self._variant_jobs.discard(key)
+    
+    def _finish_variants(self, asset_type: AssetType, file_name: str, future: Future) -> None:
+        """
+        衍生图生成任务完成的回调
+        
+        参数:
+            asset_type: 资源类型
+            file_name: 原图文件名
+            future: 生成任务
+        """
+        error = future.exception()
+        if error is not None:
+            print(f"衍生图生成失败 ({asset_type.value}/{file_name}): {error}")
+        with self._index_lock:
+            self._variant_jobs.discard((asset_type, file_name))
+            if error is not None:
+                self._failed_variants.add((asset_type, file_name))
+            else:
+                self._variants.setdefault(asset_type, set()).update(
+                    variant_name for variants in self._variant_names(asset_type, file_name).values()
+                    for variant_name in variants.values()
+                )
+    
+    def _generate_variants(self, asset_type: AssetType, file_name: str) -> bool:
+        """
+        在当前线程中为原图生成所有尺寸和格式的衍生图
+        
+        参数:
+            asset_type: 资源类型
+            file_name: 原图文件名
+            
+        返回:
+            生成成功返回True
+            
+        说明:
+            原图只解码一次；生成失败的原图在本进程内不再重试，避免重复解码
+        """
+        names = self._variant_names(asset_type, file_name)
+        if not names or (asset_type, file_name) in self._failed_variants:
+            return False
+        
+        source_path = (self._static_directory / asset_type.value / file_name).as_posix()
+        try:
+            generate_variant_files(source_path, self._variant_outputs(asset_type, file_name), self._thumbnail_quality)
+        except (ImageProcessingError, OSError) as e:
+            print(f"衍生图生成失败 ({asset_type.value}/{file_name}): {e}")
+            with self._index_lock:
+                self._failed_variants.add((asset_type, file_name))
+            return False
+        
+        with self._index_lock:
+            self._variants.setdefault(asset_type, set()).update(
+                variant_name for variants in names.values() for variant_name in variants.values()
+            )
+        return True
+    
+    def _remove_variants(self, asset_type: AssetType, file_name: str) -> None:
+        """
+        删除原图的所有衍生图
+        
+        参数:
+            asset_type: 资源类型
+            file_name: 原图文件名
+        """
+        for variants in self._variant_names(asset_type, file_name).values():
+            for variant_name in variants.values():
+                with self._index_lock:
+                    self._variants.get(asset_type, set()).discard(variant_name)
+                try:
+                    remove(self._static_directory / asset_type.value / variant_name)
+                except OSError:
+                    pass
+    
+    def _confirm_generated_asset(self, asset_type: AssetType, asset_id: str) -> Optional[str]:
+        """
+        确认已生成路径的资源文件是否已写入
+        
+        参数:
+            asset_type: 资源类型
+            asset_id: 资源ID
+            
+        返回:
+            新文件已写入时返回新文件名（并删除被替换的旧文件），否则返回原文件名；
+            超过 PENDING_ASSET_TIMEOUT 秒仍未写入时不再等待新文件
+        """
+        key = (asset_type, asset_id)
+        pending = self._pending_assets.get(key)
+        if pending is None:
+            return self._asset_index.get(asset_type, {}).get(asset_id)
+        
+        file_name, previous_name, created_at = pending
+        asset_directory = self._static_directory / asset_type.value
+        if not (asset_directory / file_name).exists():
+            if time.monotonic() - created_at >= PENDING_ASSET_TIMEOUT:
+                # 文件一直没有写入（如请求在写入前失败），不再等待
+                with self._index_lock:
+                    if self._pending_assets.get(key) == pending:
+                        self._pending_assets.pop(key, None)
+            return previous_name
+        
+        with self._index_lock:
+            self._pending_assets.pop(key, None)
+            self._asset_index.setdefault(asset_type, {})[asset_id] = file_name
+        if previous_name and previous_name != file_name:
+            try:
+                remove(asset_directory / previous_name)
+            except OSError:
+                pass
+            self._remove_variants(asset_type, previous_name)
+        return file_name
+    
+    def _generate_file_paths(self, asset_type: AssetType, asset_id: Union[int, str]) -> Tuple[str, str]:
+        """
+        生成资源的带版本号存储路径
+        
+        参数:
+            asset_type: 资源类型
+            asset_id: 资源ID
+            
+        返回:
+            (绝对路径, 相对路径) 的元组
+            
+        说明:
+            调用方随后应将文件写入该路径。写入之前仍解析到原文件；
+            之后第一次解析时改用新文件，并删除原文件
+        """
+        file_name = f"{asset_id}.{time.time_ns():x}.jpg"
+        if self._sharding and asset_type in SHARDED_ASSET_TYPES:
+            file_name = f"{self._shard_directory(asset_id)}/{file_name}"
+            (self._static_directory / asset_type.value / file_name).parent.mkdir(parents=True, exist_ok=True)
+        key = (asset_type, str(asset_id))
+        now = time.monotonic()
+        with self._index_lock:
+            previous = self._pending_assets.get(key)
+            previous_name = previous[1] if previous else self._asset_index.get(asset_type, {}).get(str(asset_id))
+            self._pending_assets[key] = (file_name, previous_name, now)
+            # 顺带清理再也没有被解析过的过期项
+            for item, pending in list(self._pending_assets.items()):
+                if now - pending[2] >= PENDING_ASSET_TIMEOUT:
+                    del self._pending_assets[item]
+        absolute_path = (self._static_directory / asset_type.value / file_name).as_posix()
+        relative_path = absolute_path.replace(self._project_root.as_posix(), "")
         return absolute_path, relative_path
     
+    def _finish_upload(self, asset_type: AssetType, asset_id: str, file_name: str, staging_path: str,
+                       future: Future) -> None:
+        """
+        上传图片后台处理完成的回调
+        
+        参数:
+            asset_type: 资源类型
+            asset_id: 资源ID
+            file_name: 处理结果的文件名
+            staging_path: 上传的原始文件路径
+            future: 处理任务
+            
+        说明:
+            成功时立即切换到新图片（删除被替换的旧图片及其衍生图）；
+            失败或已被更新的上传取代时清理本次的文件，继续使用原图片
+        """
+        key = (asset_type, asset_id)
+        error = future.exception()
+        with self._index_lock:
+            pending = self._pending_assets.get(key)
+            # 结果文件出现后可能已被并发的解析请求确认
+            current = (
+                pending[0] == file_name if pending is not None
+                else self._asset_index.get(asset_type, {}).get(asset_id) == file_name
+            )
+            if error is not None and pending is not None and current:
+                self._pending_assets.pop(key, None)
+        
+        if error is None and current:
+            with self._index_lock:
+                self._variants.setdefault(asset_type, set()).update(
+                    variant_name for variants in self._variant_names(asset_type, file_name).values()
+                    for variant_name in variants.values()
+                )
+            self._confirm_generated_asset(asset_type, asset_id)
+            return
+        
+        if error is not None:
+            print(f"图片处理失败 ({asset_type.value}/{file_name}): {error}")
+        self._remove_variants(asset_type, file_name)
+        for path in (self._static_directory / asset_type.value / file_name, Path(staging_path)):
+            try:
+                remove(path)
+            except OSError:
+                pass
+    
+    def _delete_asset(self, asset_type: AssetType, asset_id: Union[int, str]) -> bool:
+        """
+        删除资源文件并从资源索引中移除
+        
+        参数:
+            asset_type: 资源类型
+            asset_id: 资源ID
+            
+        返回:
+            删除成功返回True，文件不存在返回False
+        """
+        absolute_path, _ = self._resolve_file_paths(asset_type, asset_id)
+        self._index_asset(asset_type, asset_id, None)
+        with self._index_lock:
+            pending = self._pending_assets.pop((asset_type, str(asset_id)), None)
+        if pending is not None:
+            # 已生成但尚未被确认的新文件一并删除
+            pending_path = self._static_directory / asset_type.value / pending[0]
+            if pending_path.exists():
+                remove(pending_path)
+        if absolute_path and Path(absolute_path).exists():
+            remove(absolute_path)
+            self._remove_variants(asset_type, Path(absolute_path).relative_to(
+                self._static_directory / asset_type.value).as_posix())
+            return True
+        return False
+    
+    def refresh_asset_index(self, asset_type: Optional[AssetType] = None) -> None:
+        """
+        重新扫描资源目录，重建资源索引
+        
+        参数:
+            asset_type: 资源类型，为None时重建所有类型
+            
+        说明:
+            绕过本管理器直接增删文件后（如手工拷贝、批量导入）可调用此方法立即生效
+        """
+        for item in [asset_type] if asset_type else AssetType:
+            self._scan_asset_directory(item)
+    
+    def is_immutable_asset_path(self, url_path: str) -> bool:
+        """
+        判断URL路径是否指向带版本号的资源文件
+        
+        参数:
+            url_path: 请求路径，如 "/static/profilePhoto/12.17c0b2d9a4e3f000.jpg"
+            
+        返回:
+            是带版本号的资源文件时返回True，此类响应可使用 immutable 缓存头
+        """
+        directory, _, file_name = url_path.rpartition("/")
+        if not VERSIONED_FILE_PATTERN.match(file_name):
+            return False
+        parts = directory.split("/")
+        if len(parts) >= 3 and SHARD_DIRECTORY_PATTERN.match(parts[-1]) and SHARD_DIRECTORY_PATTERN.match(parts[-2]):
+            parts = parts[:-2]
+        return parts[-1] in {asset_type.value for asset_type in AssetType}
+    
+    def migrate_to_sharded_layout(self, asset_type: Optional[AssetType] = None, dry_run: bool = False) -> int:
+        """
+        将平铺存放的资源文件迁移到分片子目录
+        
+        参数:
+            asset_type: 资源类型，为None时迁移所有分片类型
+            dry_run: 为True时只统计需要迁移的文件数，不移动文件
+            
+        返回:
+            迁移（或需要迁移）的文件数
+            
+        说明:
+            可在线执行：逐个文件原子移动（os.replace）并立即更新本进程的索引，
+            迁移期间两种布局的文件都能被解析；其他进程在下一次轮询时发现变化。
+            衍生图随原图一起迁移；默认图片（default.*）等非数字命名的文件保持原位
+        """
+        migrated = 0
+        for item in [asset_type] if asset_type else SHARDED_ASSET_TYPES:
+            asset_directory = self._static_directory / item.value
+            with os.scandir(asset_directory) as entries:
+                flat_files = [entry.name for entry in entries if entry.is_file()]
+            
+            for file_name in flat_files:
+                asset_id = file_name.split(".", 1)[0].split(VARIANT_SEPARATOR, 1)[0]
+                if not asset_id.isdigit() or file_name.endswith(f"{VARIANT_SEPARATOR}{UPLOAD_LABEL}"):
+                    # 等待处理的上传文件由后台任务按原路径读取，不能移动
+                    continue
+                migrated += 1
+                if dry_run:
+                    continue
+                
+                target_name = f"{self._shard_directory(asset_id)}/{file_name}"
+                target_path = asset_directory / target_name
+                target_path.parent.mkdir(parents=True, exist_ok=True)
+                try:
+                    os.replace(asset_directory / file_name, target_path)
+                except FileNotFoundError:
+                    # 已被其他进程删除或替换
+                    migrated -= 1
+                    continue
+                with self._index_lock:
+                    index = self._asset_index.setdefault(item, {})
+                    variants = self._variants.setdefault(item, set())
+                    if index.get(asset_id) == file_name:
+                        index[asset_id] = target_name
+                    elif file_name in variants:
+                        variants.discard(file_name)
+                        variants.add(target_name)
+        return migrated
+    
+    # 批量路径解析
+    def get_asset_paths(
+        self, 
+        asset_type: AssetType, 
+        asset_ids: Iterable[Union[int, str]], 
+        return_absolute: bool = False, 
+        use_default: bool = True,
+        size: Optional[int] = None,
+        accept: Optional[str] = None
+    ) -> Dict[Union[int, str], str]:
+        """
+        批量获取同一资源类型下多个ID的文件路径
+        
+        参数:
+            asset_type: 资源类型
+            asset_ids: 资源ID列表
+            return_absolute: 是否返回绝对路径
+            use_default: 是否在未找到时使用默认文件
+            size: 展示边长（像素），指定时返回缩略图路径
+            accept: 请求的Accept头，指定时返回浏览器支持的衍生格式路径
+            
+        返回:
+            ID到文件路径的字典，未找到且不使用默认文件时为空字符串
+            
+        说明:
+            整批只检查一次资源目录的修改时间，目录有变化时重新扫描一次（而不是等待后台轮询），
+            之后每个ID都只是一次字典访问，因此列表页的文件系统开销与条目数无关
+        """
+        try:
+            mtime = (self._static_directory / asset_type.value).stat().st_mtime
+            if mtime != self._directory_mtimes.get(asset_type):
+                self._scan_asset_directory(asset_type)
+        except FileNotFoundError:
+            raise FileTypeError(f"资源目录未找到: {self._static_directory / asset_type.value}")
+        
+        paths = {}
+        for asset_id in asset_ids:
+            absolute_path, relative_path = self._resolve_file_paths(asset_type, asset_id, use_default, size, accept)
+            paths[asset_id] = absolute_path if return_absolute else relative_path
+        return paths
+    
+    def save_upload(
+        self,
+        asset_type: AssetType,
+        asset_id: Union[int, str],
+        upload: Any,
+        operations: Sequence[ImageOperation] = ()
+    ) -> Future:
+        """
+        保存上传的图片并提交后台处理
+        
+        参数:
+            asset_type: 资源类型
+            asset_id: 资源ID
+            upload: 图片数据，bytes 或带 save(path) 方法的上传文件（如 request.files 中的 FileStorage）
+            operations: 依次执行的处理操作，如
+                [("crop_to_square", {}), ("fit_within", {"max_width": 512, "max_height": 512})]
+                
+        返回:
+            处理任务的 Future，结果为处理后图片的绝对路径
+            
+        说明:
+            原始文件写入后立即返回，裁剪、缩放、编码及衍生图生成都在后台进程中完成，不占用请求。
+            处理完成前仍解析到原图片；完成后本进程立即切换到新图片，
+            其他进程在下一次轮询时发现。ImageWorkers 配置为0时在请求内同步处理
+
+            头像、封面和小组图标的上传路由（/edit_profile、/add_book、/edit_book、/add_group、
+            /edit_group）仍在旧服务层 service.response 中，于请求内同步解码、裁剪并写入，
+            尚未调用本方法；迁移到处理器架构时应改为调用本方法
+        """
+        absolute_path, _ = self._generate_file_paths(asset_type, asset_id)
+        asset_directory = self._static_directory / asset_type.value
+        file_name = Path(absolute_path).relative_to(asset_directory).as_posix()
+        staging_path = f"{Path(absolute_path).with_suffix('').as_posix()}{VARIANT_SEPARATOR}{UPLOAD_LABEL}"
+        
+        if isinstance(upload, (bytes, bytearray)):
+            Path(staging_path).write_bytes(upload)
+        else:
+            upload.save(staging_path)
+        
+        return self._task_queue.submit(
+            process_upload, staging_path, absolute_path, list(operations),
+            self._variant_outputs(asset_type, file_name), self._thumbnail_quality,
+            callback=lambda future: self._finish_upload(asset_type, str(asset_id), file_name, staging_path, future)
+        )
+    
+    def generate_variants(self, asset_type: AssetType, asset_id: Union[int, str]) -> bool:
+        """
+        立即为资源生成所有尺寸和格式的衍生图
+        
+        参数:
+            asset_type: 资源类型
+            asset_id: 资源ID
+            
+        返回:
+            生成成功返回True；资源不存在或该类型没有衍生图时返回False
+            
+        说明:
+            上传图片并写入 generate_*_path 返回的路径后调用，可避免第一次访问时才生成；
+            不调用时衍生图在第一次按尺寸或格式解析路径时由后台任务生成，完成前解析到原图
+        """
+        absolute_path, _ = self._resolve_file_paths(asset_type, asset_id)
+        if not absolute_path:
+            return False
+        file_name = Path(absolute_path).relative_to(self._static_directory / asset_type.value).as_posix()
+        return self._generate_variants(asset_type, file_name)
+    
+    def backfill_variants(self, asset_type: Optional[AssetType] = None) -> int:
+        """
+        为缺少衍生图的已有资源生成衍生图
+        
+        参数:
+            asset_type: 资源类型，为None时处理所有类型
+            
+        返回:
+            生成了衍生图的原图数
+            
+        说明:
+            在当前进程中逐个同步生成，供命令行调用（如修改 ThumbnailSizes 或 AlternateFormats 之后），
+            避免上线后由页面请求陆续触发大量后台任务
+        """
+        generated = 0
+        for item in [asset_type] if asset_type else AssetType:
+            variants = self._variants.get(item, set())
+            for file_name in list(self._asset_index.get(item, {}).values()):
+                names = [
+                    variant_name for sizes in self._variant_names(item, file_name).values()
+                    for variant_name in sizes.values()
+                ]
+                if names and not all(name in variants for name in names) and self._generate_variants(item, file_name):
+                    generated += 1
+        return generated
+    
+    def get_book_cover_paths(
+        self, book_ids: Iterable[int], return_absolute: bool = False, size: Optional[int] = None,
+        accept: Optional[str] = None
+    ) -> Dict[int, str]:
+        """批量获取图书封面路径，未找到时使用默认封面"""
+        return self.get_asset_paths(AssetType.BOOK_COVER, book_ids, return_absolute, size=size, accept=accept)
+    
+    def get_journal_header_paths(
+        self, journal_ids: Iterable[int], return_absolute: bool = False, accept: Optional[str] = None
+    ) -> Dict[int, str]:
+        """批量获取日志头图路径，未找到时使用默认图片"""
+        return self.get_asset_paths(AssetType.JOURNAL_HEADER, journal_ids, return_absolute, accept=accept)
+    
+    def get_profile_photo_paths(
+        self, user_ids: Iterable[int], return_absolute: bool = False, size: Optional[int] = None,
+        accept: Optional[str] = None
+    ) -> Dict[int, str]:
+        """批量获取用户头像路径，未找到时使用默认头像"""
+        return self.get_asset_paths(AssetType.PROFILE_PHOTO, user_ids, return_absolute, size=size, accept=accept)
+    
+    def get_group_icon_paths(
+        self, group_ids: Iterable[int], return_absolute: bool = False, size: Optional[int] = None,
+        accept: Optional[str] = None
+    ) -> Dict[int, str]:
+        """批量获取群组图标路径，未找到时使用默认图标"""
+        return self.get_asset_paths(AssetType.GROUP_ICON, group_ids, return_absolute, size=size, accept=accept)
+    
     # 图书封面管理
     def get_book_cover_path(
         self, 
         book_id: int, 
         return_absolute: bool = False, 
-        use_default: bool = True
+        use_default: bool = True,
+        size: Optional[int] = None,
+        accept: Optional[str] = None
     ) -> str:
         """
         获取图书封面文件路径
@@ -178,14 +1177,18 @@ class FileSystemManager:
             book_id: 图书ID
             return_absolute: 是否返回绝对路径
             use_default: 是否在未找到时使用默认封面
+            size: 展示边长（像素），指定时返回不小于该边长的最小缩略图
+            accept: 请求的Accept头，指定时返回浏览器支持的衍生格式（WebP/AVIF）
             
         返回:
             文件路径字符串
         """
         absolute_path, relative_path = self._resolve_file_paths(
             AssetType.BOOK_COVER, 
-            f"{book_id}.*", 
-            use_default
+            book_id, 
+            use_default,
+            size,
+            accept
         )
         return absolute_path if return_absolute else relative_path
     
@@ -200,8 +1203,7 @@ class FileSystemManager:
         返回:
             生成的文件路径
         """
-        absolute_path = (self._static_directory / AssetType.BOOK_COVER.value / f"{book_id}.jpg").as_posix()
-        relative_path = absolute_path.replace(self._project_root.as_posix(), "")
+        absolute_path, relative_path = self._generate_file_paths(AssetType.BOOK_COVER, book_id)
         return absolute_path if return_absolute else relative_path
     
     # 日志头图管理
@@ -209,7 +1211,8 @@ class FileSystemManager:
         self, 
         journal_id: int, 
         return_absolute: bool = False, 
-        use_default: bool = True
+        use_default: bool = True,
+        accept: Optional[str] = None
     ) -> str:
         """
         获取日志头图路径
@@ -218,14 +1221,16 @@ class FileSystemManager:
             journal_id: 日志ID
             return_absolute: 是否返回绝对路径
             use_default: 是否在未找到时使用默认图片
+            accept: 请求的Accept头，指定时返回浏览器支持的衍生格式（WebP/AVIF）
             
         返回:
             文件路径字符串
         """
         absolute_path, relative_path = self._resolve_file_paths(
             AssetType.JOURNAL_HEADER, 
-            f"{journal_id}.*", 
-            use_default
+            journal_id, 
+            use_default,
+            accept=accept
         )
         return absolute_path if return_absolute else relative_path
     
@@ -240,8 +1245,7 @@ class FileSystemManager:
         返回:
             生成的文件路径
         """
-        absolute_path = (self._static_directory / AssetType.JOURNAL_HEADER.value / f"{journal_id}.jpg").as_posix()
-        relative_path = absolute_path.replace(self._project_root.as_posix(), "")
+        absolute_path, relative_path = self._generate_file_paths(AssetType.JOURNAL_HEADER, journal_id)
         return absolute_path if return_absolute else relative_path
     
     def delete_journal_header(self, journal_id: int) -> bool:
@@ -254,18 +1258,16 @@ class FileSystemManager:
         返回:
             删除成功返回True，文件不存在返回False
         """
-        absolute_path, _ = self._resolve_file_paths(AssetType.JOURNAL_HEADER, f"{journal_id}.*")
-        if absolute_path and Path(absolute_path).exists():
-            remove(absolute_path)
-            return True
-        return False
+        return self._delete_asset(AssetType.JOURNAL_HEADER, journal_id)
     
     # 用户头像管理
     def get_profile_photo_path(
         self, 
         user_id: int, 
         return_absolute: bool = False, 
-        use_default: bool = True
+        use_default: bool = True,
+        size: Optional[int] = None,
+        accept: Optional[str] = None
     ) -> str:
         """
         获取用户头像路径
@@ -274,66 +1276,64 @@ class FileSystemManager:
             user_id: 用户ID
             return_absolute: 是否返回绝对路径
             use_default: 是否在未找到时使用默认头像
+            size: 展示边长（像素），指定时返回不小于该边长的最小缩略图
+            accept: 请求的Accept头，指定时返回浏览器支持的衍生格式（WebP/AVIF）
             
         返回:
             文件路径字符串
         """
         absolute_path, relative_path = self._resolve_file_paths(
             AssetType.PROFILE_PHOTO, 
-            f"{user_id}.*", 
-            use_default
+            user_id, 
+            use_default,
+            size,
+            accept
         )
         return absolute_path if return_absolute else relative_path
     
     def generate_profile_photo_path(self, user_id: int, return_absolute: bool = False) -> str:
         """Generate path where profile photo should be stored"""
-        absolute_path = (self._static_directory / AssetType.PROFILE_PHOTO.value / f"{user_id}.jpg").as_posix()
-        relative_path = absolute_path.replace(self._project_root.as_posix(), "")
+        absolute_path, relative_path = self._generate_file_paths(AssetType.PROFILE_PHOTO, user_id)
         return absolute_path if return_absolute else relative_path
     
     def delete_profile_photo(self, user_id: int) -> bool:
         """Delete user profile photo"""
-        absolute_path, _ = self._resolve_file_paths(AssetType.PROFILE_PHOTO, f"{user_id}.*")
-        if absolute_path and Path(absolute_path).exists():
-            remove(absolute_path)
-            return True
-        return False
+        return self._delete_asset(AssetType.PROFILE_PHOTO, user_id)
     
     # Group Icon Management
     def get_group_icon_path(
         self, 
         group_id: int, 
         return_absolute: bool = False, 
-        use_default: bool = True
+        use_default: bool = True,
+        size: Optional[int] = None,
+        accept: Optional[str] = None
     ) -> str:
-        """Get group icon path"""
+        """Get group icon path, optionally as a thumbnail (size) in a format the browser accepts (accept)"""
         absolute_path, relative_path = self._resolve_file_paths(
             AssetType.GROUP_ICON, 
-            f"{group_id}.*", 
-            use_default
+            group_id, 
+            use_default,
+            size,
+            accept
         )
         return absolute_path if return_absolute else relative_path
     
     def generate_group_icon_path(self, group_id: int, return_absolute: bool = False) -> str:
         """Generate path where group icon should be stored"""
-        absolute_path = (self._static_directory / AssetType.GROUP_ICON.value / f"{group_id}.jpg").as_posix()
-        relative_path = absolute_path.replace(self._project_root.as_posix(), "")
+        absolute_path, relative_path = self._generate_file_paths(AssetType.GROUP_ICON, group_id)
         return absolute_path if return_absolute else relative_path
     
     def delete_group_icon(self, group_id: int) -> bool:
         """Delete group icon"""
-        absolute_path, _ = self._resolve_file_paths(AssetType.GROUP_ICON, f"{group_id}.*")
-        if absolute_path and Path(absolute_path).exists():
-            remove(absolute_path)
-            return True
-        return False
+        return self._delete_asset(AssetType.GROUP_ICON, group_id)
     
     # Error Image Management
     def get_error_image_path(self, error_code: int, return_absolute: bool = False) -> str:
         """Get error page image path"""
         absolute_path, relative_path = self._resolve_file_paths(
             AssetType.ERROR_IMAGE, 
-            f"{error_code}.*"
+            error_code
         )
         return absolute_path if return_absolute else relative_path
     
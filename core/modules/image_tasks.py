@@ -0,0 +1,215 @@
+"""
+图像后台处理模块
+==============
+
+本模块负责在独立的进程池中执行图像处理任务，避免耗时的解码、裁剪和编码占用Web请求。
+
+主要功能:
+    - 上传图片的后台处理（处理流水线 + 衍生图生成）
+    - 已有图片缺失衍生图的后台生成
+    - 进程池的按进程延迟创建
+    - 任务完成回调
+
+依赖:
+    - concurrent.futures: 进程池
+    - core.modules.image_processor: 图像处理
+"""
+
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .image_processor import ImagePipeline, ImageProcessor, ImageProcessingError
+
+# 可在后台任务中使用的流水线操作
+PIPELINE_OPERATIONS = ("crop", "crop_to_aspect_ratio", "crop_to_square", "resize", "fit_within")
+
+# 流水线操作: (ImagePipeline 方法名, 关键字参数)
+ImageOperation = Tuple[str, Dict[str, Any]]
+
+
+def process_upload(
+    source_path: str,
+    output_path: str,
+    operations: Sequence[ImageOperation],
+    variant_outputs: Dict[Optional[int], Sequence[str]],
+    quality: int = 85
+) -> str:
+    """
+    处理上传的原始图片（在工作进程中执行）
+
+    参数:
+        source_path: 上传的原始图片路径，处理完成后删除
+        output_path: 处理结果的最终路径
+        operations: 依次执行的流水线操作
+        variant_outputs: 衍生图的尺寸 -> 输出路径列表，见 ImageProcessor.generate_variants
+        quality: 编码质量（1-100）
+
+    返回:
+        output_path
+
+    异常:
+        ImageProcessingError: 当操作无效或图像处理失败时
+
+    说明:
+        原图只解码一次。衍生图先于结果文件写入，结果文件最后通过原子替换出现，
+        因此一旦能看到结果文件，它的衍生图也都已就绪
+    """
+    pipeline = ImagePipeline(source_path)
+    for name, arguments in operations:
+        if name not in PIPELINE_OPERATIONS:
+            raise ImageProcessingError(f"不支持的图像操作: {name}")
+        getattr(pipeline, name)(**arguments)
+    image = pipeline.execute()
+
+    root, extension = os.path.splitext(output_path)
+    temp_path = f"{root}@{os.getpid()}.tmp{extension}"
+    try:
+        ImagePipeline(image=image).save(temp_path, quality=quality)
+        if variant_outputs:
+            ImageProcessor.generate_variants(source_path, variant_outputs, quality, image=image)
+        os.replace(temp_path, output_path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+    os.remove(source_path)
+    return output_path
+
+
+def generate_variant_files(
+    source_path: str,
+    variant_outputs: Dict[Optional[int], Sequence[str]],
+    quality: int = 85
+) -> List[str]:
+    """
+    为已有图片生成衍生图（可在工作进程中执行）
+
+    参数:
+        source_path: 原图路径
+        variant_outputs: 衍生图的尺寸 -> 输出路径列表，见 ImageProcessor.generate_variants
+        quality: 编码质量（1-100）
+
+    返回:
+        衍生图路径列表
+
+    异常:
+        ImageProcessingError: 当图像处理失败时
+        OSError: 当文件写入失败时
+
+    说明:
+        所有衍生图都已存在（如已由其他进程生成）时不再解码原图。
+        先写入临时文件再原子替换，其他进程或并发请求不会读到写了一半的文件
+    """
+    paths = [path for paths in variant_outputs.values() for path in paths]
+    if all(os.path.exists(path) for path in paths):
+        return paths
+
+    temp_outputs: Dict[Optional[int], List[str]] = {}
+    targets: Dict[str, str] = {}
+    for size, size_paths in variant_outputs.items():
+        for path in size_paths:
+            root, extension = os.path.splitext(path)
+            temp_path = f"{root}.{os.getpid()}-{threading.get_ident()}.tmp{extension}"
+            targets[temp_path] = path
+            temp_outputs.setdefault(size, []).append(temp_path)
+
+    try:
+        ImageProcessor.generate_variants(source_path, temp_outputs, quality)
+        for temp_path, path in targets.items():
+            os.replace(temp_path, path)
+    finally:
+        for temp_path in targets:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+    return paths
+
+
+class ImageTaskQueue:
+    """
+    图像处理任务队列
+
+    主要职责:
+        1. 管理执行图像任务的进程池
+        2. 提交任务并在完成后回调
+
+    设计特点:
+        - 进程池在第一次提交任务时按进程创建，预fork的每个Web worker各有自己的进程池
+        - 回调在本进程的线程中执行，可以直接更新本进程的资源索引
+        - max_workers 为0时在调用线程中同步执行，便于开发调试及不支持多进程的环境
+    """
+
+    def __init__(self, max_workers: int = 2):
+        """
+        初始化任务队列
+
+        参数:
+            max_workers: 工作进程数，0表示同步执行
+        """
+        self._max_workers = max_workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._executor_pid: Optional[int] = None
+        self._lock = threading.Lock()
+        self._pending = 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """获取本进程的进程池，不存在时创建"""
+        with self._lock:
+            if self._executor is None or self._executor_pid != os.getpid():
+                self._executor = ProcessPoolExecutor(max_workers=self._max_workers)
+                self._executor_pid = os.getpid()
+            return self._executor
+
+    def submit(self, func: Callable[..., Any], *args: Any,
+               callback: Optional[Callable[[Future], None]] = None) -> Future:
+        """
+        提交任务
+
+        参数:
+            func: 任务函数，必须是可以被pickle的模块级函数
+            *args: 任务参数
+            callback: 任务完成（成功或失败）后以 Future 为参数调用
+
+        返回:
+            任务的 Future
+        """
+        if self._max_workers <= 0:
+            future: Future = Future()
+            try:
+                future.set_result(func(*args))
+            except Exception as e:
+                future.set_exception(e)
+            if callback is not None:
+                callback(future)
+            return future
+
+        with self._lock:
+            self._pending += 1
+        future = self._get_executor().submit(func, *args)
+        future.add_done_callback(self._task_done)
+        if callback is not None:
+            future.add_done_callback(callback)
+        return future
+
+    def _task_done(self, future: Future) -> None:
+        """任务完成时更新计数"""
+        with self._lock:
+            self._pending -= 1
+
+    @property
+    def pending(self) -> int:
+        """本进程已提交但尚未完成的任务数"""
+        return self._pending
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        关闭进程池
+
+        参数:
+            wait: 是否等待已提交的任务完成
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None and self._executor_pid == os.getpid():
+            executor.shutdown(wait=wait)
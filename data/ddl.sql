@@ -129,6 +129,7 @@ CREATE TABLE `group` (
   PRIMARY KEY (`id`),
   UNIQUE KEY `group_name_uindex` (`name`),
   KEY `group_user_id_fk` (`founder_id`),
+  KEY `group_establish_time_id_index` (`establish_time`,`id`),
   CONSTRAINT `group_user_id_fk` FOREIGN KEY (`founder_id`) REFERENCES `user` (`id`) ON DELETE CASCADE ON UPDATE CASCADE
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci COMMENT='圈子';
 /*!40101 SET character_set_client = @saved_cs_client */;
@@ -230,6 +231,29 @@ LOCK TABLES `group_user` WRITE;
 /*!40000 ALTER TABLE `group_user` ENABLE KEYS */;
 UNLOCK TABLES;
 
+--
+-- Upgrading an existing `journal` table
+--
+-- The like/comment counters are denormalized columns; add them, then fill them from
+-- journal_like/journal_comment with `flask reconcile-journal-counters`:
+--   ALTER TABLE `journal`
+--     ADD COLUMN `like_num` int NOT NULL DEFAULT '0' COMMENT '点赞数（冗余计数，由journal_like维护）',
+--     ADD COLUMN `comment_num` int NOT NULL DEFAULT '0' COMMENT '评论数（冗余计数，由journal_comment维护）';
+--
+-- Full-text search (Search.JournalFullText) needs the ngram FULLTEXT index:
+--   ALTER TABLE `journal` ADD FULLTEXT KEY `journal_title_content_fulltext` (`title`,`content`) WITH PARSER `ngram`;
+--
+-- With the default InnoDB stopword list the ngram parser skips every token containing a
+-- stopword, so keywords such as "a", "at" or "is" never match. Turn stopwords off in my.cnf
+-- before creating (or recreating) the index:
+--   [mysqld]
+--   innodb_ft_enable_stopword = OFF
+--   ngram_token_size = 2        # keep equal to Search.NgramTokenSize
+-- An index built while stopwords were on must be rebuilt afterwards:
+--   ALTER TABLE `journal` DROP INDEX `journal_title_content_fulltext`,
+--     ADD FULLTEXT KEY `journal_title_content_fulltext` (`title`,`content`) WITH PARSER `ngram`;
+--
+
 --
 -- Table structure for table `journal`
 --
@@ -245,9 +269,13 @@ CREATE TABLE `journal` (
   `publish_time` datetime NOT NULL,
   `author_id` int NOT NULL,
   `book_id` int NOT NULL,
+  `like_num` int NOT NULL DEFAULT '0' COMMENT '点赞数（冗余计数，由journal_like维护）',
+  `comment_num` int NOT NULL DEFAULT '0' COMMENT '评论数（冗余计数，由journal_comment维护）',
   PRIMARY KEY (`id`),
   KEY `journal_user_id_fk` (`author_id`),
   KEY `journal_book_id_fk` (`book_id`),
+  KEY `journal_publish_time_id_index` (`publish_time`,`id`),
+  FULLTEXT KEY `journal_title_content_fulltext` (`title`,`content`) /*!50100 WITH PARSER `ngram` */ ,
   CONSTRAINT `journal_book_id_fk` FOREIGN KEY (`book_id`) REFERENCES `book` (`id`) ON DELETE CASCADE ON UPDATE CASCADE,
   CONSTRAINT `journal_user_id_fk` FOREIGN KEY (`author_id`) REFERENCES `user` (`id`) ON DELETE CASCADE ON UPDATE CASCADE
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci COMMENT='书评';
@@ -129,6 +129,7 @@ CREATE TABLE `group` (
   PRIMARY KEY (`id`),
   UNIQUE KEY `group_name_uindex` (`name`),
   KEY `group_user_id_fk` (`founder_id`),
+  KEY `group_establish_time_id_index` (`establish_time`,`id`),
   CONSTRAINT `group_user_id_fk` FOREIGN KEY (`founder_id`) REFERENCES `user` (`id`) ON DELETE CASCADE ON UPDATE CASCADE
 ) ENGINE=InnoDB AUTO_INCREMENT=1 DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci COMMENT='圈子';
 /*!40101 SET character_set_client = @saved_cs_client */;
@@ -249,9 +250,13 @@ CREATE TABLE `journal` (
   `publish_time` datetime NOT NULL,
   `author_id` int NOT NULL,
   `book_id` int NOT NULL,
+  `like_num` int NOT NULL DEFAULT '0' COMMENT '点赞数（冗余计数，由journal_like维护）',
+  `comment_num` int NOT NULL DEFAULT '0' COMMENT '评论数（冗余计数，由journal_comment维护）',
   PRIMARY KEY (`id`),
   KEY `journal_user_id_fk` (`author_id`),
   KEY `journal_book_id_fk` (`book_id`),
+  KEY `journal_publish_time_id_index` (`publish_time`,`id`),
+  FULLTEXT KEY `journal_title_content_fulltext` (`title`,`content`) /*!50100 WITH PARSER `ngram` */ ,
   CONSTRAINT `journal_book_id_fk` FOREIGN KEY (`book_id`) REFERENCES `book` (`id`) ON DELETE CASCADE ON UPDATE CASCADE,
   CONSTRAINT `journal_user_id_fk` FOREIGN KEY (`author_id`) REFERENCES `user` (`id`) ON DELETE CASCADE ON UPDATE CASCADE
 ) ENGINE=InnoDB AUTO_INCREMENT=1 DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci COMMENT='书评';
@@ -263,7 +268,7 @@ CREATE TABLE `journal` (
 
 LOCK TABLES `journal` WRITE;
 /*!40000 ALTER TABLE `journal` DISABLE KEYS */;
-INSERT INTO `journal` VALUES (1,'人面不知何处去，桃花依旧笑春风','时光荏苒，岁月如梭。转眼间，又是一个春暖花开的季节。在这个美好的时光里，我独自漫步在桃林之中，心中不禁涌起一股莫名的感慨。','时光荏苒，岁月如梭。转眼间，又是一个春暖花开的季节。在这个美好的时光里，我独自漫步在桃林之中，心中不禁涌起一股莫名的感慨。\n桃林里，桃花盛开，一片繁花似锦。春风拂过，花瓣轻轻飘落，如梦如幻。此情此景，让我想起了那句脍炙人口的诗句：“人面不知何处去，桃花依旧笑春风。”\n这句诗，道出了人生的无常和自然的恒常。人世间的悲欢离合，犹如一场梦，而大自然却始终如一，桃花依旧笑春风。在这个瞬息万变的世界里，我们常常感叹人生的无常，无法预知未来。而大自然却始终坚守着它的规律，春暖花开，秋收冬藏，循环往复，永恒不变。\n漫步在桃林中，我看着那一张张熟悉的面孔，不禁想起了那些曾经陪伴我们走过的人和事。他们或许已经离去，或许已经不再联系我们，但他们的影子却永远留在了我们的心中。正如那句诗所说：“人面不知何处去”，他们的离去让我们感到惋惜和无奈，但我们也应该学会坦然面对，珍惜眼前的人和事。\n在这个春暖花开的季节里，让我们抛开烦恼和忧虑，尽情地欣赏大自然的美丽。让我们像桃花一样，笑对春风，笑对人生。无论人生如何变幻莫测，我们都要保持一颗乐观向上的心，珍惜眼前的每一刻，活出自己的精彩。\n人面不知何处去，桃花依旧笑春风。让我们怀揣着这句诗，漫步在人生的道路上，笑对风雨，笑对人生。','2024-04-02 14:22:14',1,2);
+INSERT INTO `journal` VALUES (1,'人面不知何处去，桃花依旧笑春风','时光荏苒，岁月如梭。转眼间，又是一个春暖花开的季节。在这个美好的时光里，我独自漫步在桃林之中，心中不禁涌起一股莫名的感慨。','时光荏苒，岁月如梭。转眼间，又是一个春暖花开的季节。在这个美好的时光里，我独自漫步在桃林之中，心中不禁涌起一股莫名的感慨。\n桃林里，桃花盛开，一片繁花似锦。春风拂过，花瓣轻轻飘落，如梦如幻。此情此景，让我想起了那句脍炙人口的诗句：“人面不知何处去，桃花依旧笑春风。”\n这句诗，道出了人生的无常和自然的恒常。人世间的悲欢离合，犹如一场梦，而大自然却始终如一，桃花依旧笑春风。在这个瞬息万变的世界里，我们常常感叹人生的无常，无法预知未来。而大自然却始终坚守着它的规律，春暖花开，秋收冬藏，循环往复，永恒不变。\n漫步在桃林中，我看着那一张张熟悉的面孔，不禁想起了那些曾经陪伴我们走过的人和事。他们或许已经离去，或许已经不再联系我们，但他们的影子却永远留在了我们的心中。正如那句诗所说：“人面不知何处去”，他们的离去让我们感到惋惜和无奈，但我们也应该学会坦然面对，珍惜眼前的人和事。\n在这个春暖花开的季节里，让我们抛开烦恼和忧虑，尽情地欣赏大自然的美丽。让我们像桃花一样，笑对春风，笑对人生。无论人生如何变幻莫测，我们都要保持一颗乐观向上的心，珍惜眼前的每一刻，活出自己的精彩。\n人面不知何处去，桃花依旧笑春风。让我们怀揣着这句诗，漫步在人生的道路上，笑对风雨，笑对人生。','2024-04-02 14:22:14',1,2,1,2);
 /*!40000 ALTER TABLE `journal` ENABLE KEYS */;
 UNLOCK TABLES;
 